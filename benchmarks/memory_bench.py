@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Measures the memory per node of a captured tree, held as nested dicts (as
+# `pyax tree --json` builds it) and as a CompactTree, on a synthetic tree.
+
+import argparse
+import gc
+import time
+import tracemalloc
+from pyax._cli import _capture_tree
+from pyax._compact import CompactTree
+from pyax._synthetic import build_synthetic_tree
+
+ATTRIBUTES = ["AXRole", "AXSubrole", "AXTitle", "AXValue", "AXFrame", "AXEnabled"]
+
+
+def measure(build):
+    "Returns what build() returns, the bytes it left allocated and its time."
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--fanout", type=int, default=10)
+    args = parser.parse_args()
+
+    root = build_synthetic_tree(args.nodes, args.fanout)
+    dicts, dict_size, dict_time = measure(
+        lambda: _capture_tree(root, ATTRIBUTES, False, False, False)
+    )
+    compact, compact_size, compact_time = measure(
+        lambda: CompactTree.capture(root, ATTRIBUTES)
+    )
+    del dicts
+    n = len(compact)
+    print(f"{'':<10} {'bytes/node':>12} {'total MB':>10} {'capture s':>10}")
+    print(
+        f"{'dicts':<10} {dict_size / n:12.0f} {dict_size / 1e6:10.1f} {dict_time:10.2f}"
+    )
+    print(
+        f"{'compact':<10} {compact_size / n:12.0f} {compact_size / 1e6:10.1f} "
+        f"{compact_time:10.2f}"
+    )
+    print(f"{'columns':<10} {compact.nbytes() / n:12.0f}")
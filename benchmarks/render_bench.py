@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Compares the rich and plain text renderers used by `pyax tree` on a
+# synthetic tree, with all output going to /dev/null.
+
+import argparse
+import os
+import time
+from rich.console import Console
+from pyax._cli import _tree_dump, DEFAULT_ATTRIBUTES
+from pyax._render import RichRenderer, PlainRenderer
+from pyax._synthetic import build_synthetic_tree
+
+
+def run(root, renderer):
+    start = time.perf_counter()
+    _tree_dump(root, DEFAULT_ATTRIBUTES, False, False, False, renderer=renderer)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=100000)
+    parser.add_argument("--fanout", type=int, default=10)
+    args = parser.parse_args()
+
+    root = build_synthetic_tree(args.nodes, args.fanout)
+    with open(os.devnull, "w") as devnull:
+        renderers = [
+            ("rich", RichRenderer(Console(file=devnull, force_terminal=True))),
+            ("plain (color)", PlainRenderer(devnull, color=True)),
+            ("plain", PlainRenderer(devnull, color=False)),
+        ]
+        for name, renderer in renderers:
+            elapsed = run(root, renderer)
+            print(f"{name:<14} {elapsed:8.3f}s {args.nodes / elapsed:12.0f} nodes/sec")
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Benchmarks the hot paths of pyax against a synthetic tree. This runs on any
+# platform; benchmarks that need pyobjc are skipped when it is missing.
+#
+# Record a baseline and compare a later commit against it:
+#   python benchmarks/suite.py -o before.json
+#   python benchmarks/suite.py --compare before.json
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import time
+import pyax
+from pyax._bench import measure_tree
+from pyax._cli import (
+    DEFAULT_ATTRIBUTES,
+    _create_notification_dumper,
+    _element_to_dict,
+    _json_dump_inner,
+)
+from pyax._render import PlainRenderer
+from pyax._synthetic import build_synthetic_tree, SHAPES
+
+
+def _time(func, repeat):
+    "Returns the best wall time of `repeat` runs of func."
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _result(ops, seconds):
+    return {"ops": ops, "seconds": seconds, "ops_per_sec": ops / seconds}
+
+
+def bench_search_for(root, nodes, repeat):
+    # Nothing matches, so the whole tree is visited.
+    return _result(nodes, _time(lambda: root.search_for(lambda e: False), repeat))
+
+
+def bench_element_to_dict(root, nodes, repeat):
+    elements = []
+    stack = [root]
+    while stack:
+        element = stack.pop()
+        elements.append(element)
+        stack.extend(element)
+
+    def run():
+        for element in elements:
+            _element_to_dict(element, DEFAULT_ATTRIBUTES, False, False, True)
+
+    return _result(len(elements), _time(run, repeat))
+
+
+def bench_json_dump_inner(root, nodes, repeat):
+    return _result(
+        nodes,
+        _time(
+            lambda: _json_dump_inner(root, DEFAULT_ATTRIBUTES, False, False, False),
+            repeat,
+        ),
+    )
+
+
+def bench_notification_dispatch(root, nodes, repeat):
+    events = min(nodes, 10000)
+    element = next(iter(root), root)
+    with open(os.devnull, "w") as devnull:
+        dump = _create_notification_dumper(
+            DEFAULT_ATTRIBUTES,
+            False,
+            False,
+            False,
+            False,
+            PlainRenderer(devnull, color=False),
+        )
+
+        def run():
+            for _ in range(events):
+                dump(None, element, "AXValueChanged", None)
+
+        return _result(events, _time(run, repeat))
+
+
+def bench_value_to_dict(root, nodes, repeat):
+    try:
+        from ApplicationServices import AXValueCreate, kAXValueCGRectType
+        from Quartz import CGRectMake
+    except ImportError:
+        return None
+    value = AXValueCreate(kAXValueCGRectType, CGRectMake(1, 2, 3, 4))
+    count = min(nodes, 10000)
+
+    def run():
+        for _ in range(count):
+            value.to_dict()
+
+    return _result(count, _time(run, repeat))
+
+
+def bench_traversal(root, nodes, repeat):
+    stats = measure_tree(root, DEFAULT_ATTRIBUTES)
+    return _result(stats["nodes"], stats["seconds"])
+
+
+BENCHMARKS = [
+    ("search_for", bench_search_for),
+    ("element_to_dict", bench_element_to_dict),
+    ("json_dump_inner", bench_json_dump_inner),
+    ("notification_dispatch", bench_notification_dispatch),
+    ("value_to_dict", bench_value_to_dict),
+    ("traversal", bench_traversal),
+]
+
+
+def _git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.DEVNULL,
+            text=True,
+        ).strip()
+    except Exception:
+        return None
+
+
+def run_suite(nodes, fanout, shape, latency, repeat, only=None, error_rate=0):
+    root = build_synthetic_tree(nodes, fanout, shape)
+    results = {}
+    for name, bench in BENCHMARKS:
+        if only and name not in only:
+            continue
+        if name == "traversal" and (latency or error_rate):
+            # Only the traversal benchmark pays the simulated IPC latency
+            # and errors.
+            root = build_synthetic_tree(
+                nodes, fanout, shape, latency, error_rate=error_rate
+            )
+        try:
+            result = bench(root, nodes, repeat)
+        except RecursionError:
+            # Recursive traversals can't handle very deep trees.
+            result = {"error": "RecursionError"}
+        if result is not None:
+            results[name] = result
+    return {
+        "revision": _git_revision(),
+        "pyax": pyax.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "nodes": nodes,
+            "fanout": fanout,
+            "shape": shape,
+            "latency": latency,
+            "error_rate": error_rate,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+
+
+def print_report(report, baseline=None):
+    for name, result in report["results"].items():
+        if "error" in result:
+            print(f"{name:<24} {result['error']}")
+            continue
+        line = f"{name:<24} {result['ops_per_sec']:14.0f} ops/sec"
+        if baseline and "ops_per_sec" in baseline["results"].get(name, {}):
+            ratio = result["ops_per_sec"] / baseline["results"][name]["ops_per_sec"]
+            line += f"  {ratio:6.2f}x"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--nodes", type=int, default=10000)
+    parser.add_argument("--fanout", type=int, default=8)
+    parser.add_argument("--shape", choices=SHAPES, default="balanced")
+    parser.add_argument(
+        "--latency", type=float, default=0, help="Simulated IPC latency in seconds"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0, help="Fraction of calls that fail"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", action="append", help="Only run named benchmark")
+    parser.add_argument("-o", "--output", help="Write results as JSON to file")
+    parser.add_argument("--compare", help="Compare against results JSON file")
+    args = parser.parse_args()
+
+    report = run_suite(
+        args.nodes,
+        args.fanout,
+        args.shape,
+        args.latency,
+        args.repeat,
+        args.only,
+        args.error_rate,
+    )
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
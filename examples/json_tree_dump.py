@@ -26,12 +26,21 @@ import pyax
 from pprint import pprint
 import json
 
-def element_to_dict(element, indent=0):
+def fetch(element):
     attribute_names = filter(lambda x: x != "AXChildren", element.attribute_names)
     obj = dict([[attr_name, element[attr_name]] for attr_name in attribute_names])
     obj["actions"] = element.actions
-    obj["AXChildren"] = [element_to_dict(child) for child in element]
-    return obj
+    obj["AXChildren"] = []
+    return obj, element
+
+def element_to_dict(element):
+    levels = []
+    for event in pyax.walk(element, fetch, paths=False):
+        del levels[event.depth:]
+        if levels:
+            levels[-1]["AXChildren"].append(event.attributes)
+        levels.append(event.attributes)
+    return levels[0]
 
 if __name__ == "__main__":
     app_name = sys.argv[-1]
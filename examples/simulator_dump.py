@@ -23,97 +23,13 @@
 
 # This script demostrates how to grab an a11y tree from the simulator.
 
+import sys
 import pyax
 
-TRAITS = [
-    # "AXTraitNone",
-    "AXTraitButton",
-    "AXTraitLink",
-    "AXTraitImage",
-    "AXTraitSelected",
-    "AXTraitPlaysSound",
-    "AXTraitKeyboardKey",
-    "AXTraitStaticText",
-    "AXTraitSummaryElement",
-    "AXTraitNotEnabled",
-    "AXTraitUpdatesFrequently",
-    "AXTraitSearchField",
-    "AXTraitStartsMediaSession",
-    "AXTraitAdjustable",
-    "AXTraitAllowsDirectInteraction",
-    "AXTraitCausesPageTurn",
-    "AXTraitTabBar",
-    "AXTraitHeader",
-    "AXTraitWebContent",
-    "AXTraitTextEntry",
-    "AXTraitPickerElement",
-    "AXTraitRadioButton",
-    "AXTraitIsEditing",
-    "AXTraitLaunchIcon",
-    "AXTraitStatusBarElement",
-    "AXTraitSecureTextField",
-    "AXTraitInactive",
-    "AXTraitFooter",
-    "AXTraitBackButton",
-    "AXTraitTabButton",
-    "AXTraitAutoCorrectCandidate",
-    "AXTraitDeleteKey",
-    "AXTraitSelectionDismissesItem",
-    "AXTraitVisited",
-    "AXTraitScrollable",
-    "AXTraitSpacer",
-    "AXTraitTableIndex",
-    "AXTraitMap",
-    "AXTraitTextOperationsAvailable",
-    "AXTraitDraggable",
-    "AXTraitGesturePracticeRegion",
-    "AXTraitPopupButton",
-    "AXTraitAllowsNativeSliding",
-    "AXTraitMathEquation",
-    "AXTraitContainedByTable",
-    "AXTraitContainedByList",
-    "AXTraitTouchContainer",
-    "AXTraitSupportsZoom",
-    "AXTraitTextArea",
-    "AXTraitBookContent",
-    "AXTraitContainedByLandmark",
-    "AXTraitFolderIcon",
-    "AXTraitReadOnly",
-    "AXTraitMenuItem",
-    "AXTraitToggle",
-    "AXTraitIgnoreItemChooser",
-    "AXTraitSupportsTrackingDetail",
-    "AXTraitAlert",
-    "AXTraitContainedByFieldset",
-    "AXTraitAllowsLayoutChangeInStatusBar",
-]
-
-def traits_to_string(traits):
-    if not traits:
-        return "AXTraitNone"
-    trait_strings = []
-    for i in range(len(TRAITS)):
-        if (1 << i) & traits:
-            trait_strings.append(TRAITS[i])
-    return ','.join(trait_strings)
-
-def attr_to_str(elem, attr):
-    value = elem[attr]
-    if not value:
-        return None
-    if attr == "AXTraits":
-        return "%s=[%s]" % (attr, traits_to_string(value))
-    return "%s=%s" % (attr, repr(value))
-
-def tree_dump(element, indent=0):
-    attribs = ["AXDescription", "AXValue", "AXTraits"]
-    entries = filter(lambda x: x is not None, [attr_to_str(element, attr) for attr in attribs])
-    print("%s %s %s" % (indent * " ", element, ', '.join(entries)))
-    for child in element:
-        tree_dump(child, indent + 1)
-
 if __name__ == "__main__":
     app_name = "Simulator"
     acc = pyax.get_application_by_name(app_name)
-    acc = acc.search_for(lambda a: a["AXSubrole"] == "iOSContentGroup")
-    tree_dump(acc)
+    tree = pyax.SimulatorTree.from_application(acc)
+    tree.dump(sys.stdout)
+    disabled = tree.with_traits("AXTraitButton", "AXTraitNotEnabled")
+    print(f"{len(disabled)} of {len(tree)} elements are disabled buttons")
@@ -25,10 +25,12 @@ import sys
 import pyax
 
 
-def tree_subrole_dump(element, indent=0):
-    print("%s%s '%s'" % (indent * " ", element, element["AXMozDebugDescription"]))
-    for child in element:
-        tree_subrole_dump(child, indent + 1)
+def tree_subrole_dump(element):
+    for event in pyax.walk(element):
+        print(
+            "%s%s '%s'"
+            % (event.depth * " ", event.element, event.element["AXMozDebugDescription"])
+        )
 
 
 if __name__ == "__main__":
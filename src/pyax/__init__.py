@@ -27,12 +27,44 @@ __all__ = [
     "get_application_by_name",
     "get_application_from_pid",
     "get_web_root",
+    "get_web_roots",
+    "WebRootLocator",
     "get_element_at_position",
     "start",
     "stop",
     "create_observer",
+    "create_timer",
+    "cancel_timer",
     "AXObserverMixin",
     "EVENTS",
+    "diff_trees",
+    "load_tree",
+    "Profiler",
+    "save_snapshot",
+    "load_snapshot",
+    "select_nodes",
+    "TreeWatcher",
+    "Backend",
+    "PyObjCBackend",
+    "SyntheticBackend",
+    "get_backend",
+    "set_backend",
+    "CompactTree",
+    "FetchPlan",
+    "walk",
+    "attribute_fetcher",
+    "WalkEvent",
+    "audit",
+    "Rule",
+    "SimulatorTree",
+    "find_content_root",
+    "decode_traits",
+    "wait_for",
+    "perform_action_and_wait",
+    "BulkSetter",
+    "set_attribute_values",
+    "find_anywhere",
+    "ResponsivenessMonitor",
 ]
 
 from pyax._uielement import (
@@ -42,9 +74,36 @@ from pyax._uielement import (
     get_element_at_position,
     get_web_root,
 )
-from pyax._observer import start, stop, create_observer, AXObserverMixin
+from pyax._observer import (
+    start,
+    stop,
+    create_observer,
+    create_timer,
+    cancel_timer,
+    AXObserverMixin,
+)
+from pyax._webroot import get_web_roots, WebRootLocator
 from pyax._constants import EVENTS
+from pyax._diff import diff_trees, load_tree
+from pyax._profile import Profiler
+from pyax._snapshot import save_snapshot, load_snapshot, select_nodes
+from pyax._watch import TreeWatcher
+from pyax._backend import Backend, PyObjCBackend, get_backend, set_backend
+from pyax._synthetic import SyntheticBackend
+from pyax._compact import CompactTree
+from pyax._plan import FetchPlan
+from pyax._walk import walk, attribute_fetcher, WalkEvent
+from pyax._audit import audit, Rule
+from pyax._wait import wait_for, perform_action_and_wait
+from pyax._setter import BulkSetter, set_attribute_values
+from pyax._simulator import SimulatorTree, find_content_root, decode_traits
+from pyax._find import find_anywhere
+from pyax._monitor import ResponsivenessMonitor
 
-from pyax._mixin import mix_classes
-
-mix_classes()
+try:
+    from pyax._mixin import mix_classes
+except ImportError:
+    # pyobjc is not available, there is nothing to mix into.
+    pass
+else:
+    mix_classes()
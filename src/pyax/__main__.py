@@ -26,14 +26,23 @@ from typing import List
 from ._cli import tree as cli_tree
 from ._cli import observe as cli_observe
 from ._cli import inspect as cli_inspect
-from ._cli import DEFAULT_ATTRIBUTES
+from ._cli import diff as cli_diff
+from ._cli import bench as cli_bench
+from ._cli import serve as cli_serve
+from ._cli import select as cli_select
+from ._cli import audit as cli_audit
+from ._cli import find as cli_find
+from ._cli import monitor as cli_monitor
+from ._cli import DEFAULT_ATTRIBUTES, DIFF_ATTRIBUTES
 
 app = typer.Typer(add_completion=False)
 
 
 @app.command()
 def tree(
-    app_name: Annotated[str, typer.Argument(help="Application to examine")],
+    app_name: Annotated[
+        str, typer.Argument(help="Application to examine (optional with --load)")
+    ] = None,
     web: Annotated[
         bool, typer.Option("--web", "-w", help="Only output web area subtree")
     ] = False,
@@ -54,6 +63,38 @@ def tree(
         typer.Option(help="List available actions and their description on each node"),
     ] = False,
     json: Annotated[bool, typer.Option(help="Output in JSON format")] = False,
+    ndjson: Annotated[
+        bool,
+        typer.Option(help="Output one JSON record per node (newline delimited JSON)"),
+    ] = False,
+    output: Annotated[
+        str, typer.Option("--output", "-o", help="Write JSON output to file")
+    ] = None,
+    plain: Annotated[
+        bool,
+        typer.Option(help="Fast plain text output (default when not a terminal)"),
+    ] = False,
+    profile: Annotated[
+        bool, typer.Option(help="Profile AX calls and print the top offenders")
+    ] = False,
+    save: Annotated[
+        str, typer.Option(help="Save the tree as a binary snapshot file")
+    ] = None,
+    load: Annotated[
+        str, typer.Option(help="Load the tree from a snapshot or JSON file")
+    ] = None,
+    watch: Annotated[
+        bool, typer.Option(help="Keep the tree on screen and update it as it changes")
+    ] = False,
+    max_rate: Annotated[
+        float, typer.Option(help="Maximum screen updates per second with --watch")
+    ] = 10,
+    plan: Annotated[
+        str,
+        typer.Option(
+            help="Fetch extra attributes per role from a JSON plan file, or 'roles'"
+        ),
+    ] = None,
 ):
     cli_tree(
         app_name,
@@ -64,6 +105,15 @@ def tree(
         list_attributes,
         list_actions,
         json,
+        ndjson,
+        output,
+        plain,
+        profile,
+        save,
+        load,
+        watch,
+        max_rate,
+        plan,
     )
 
 
@@ -89,6 +139,22 @@ def observe(
     print_info: Annotated[
         bool, typer.Option(help="Print bundled notification info")
     ] = False,
+    plain: Annotated[
+        bool,
+        typer.Option(help="Fast plain text output (default when not a terminal)"),
+    ] = False,
+    profile: Annotated[
+        bool, typer.Option(help="Profile AX calls and print the top offenders")
+    ] = False,
+    json: Annotated[
+        bool, typer.Option(help="Output one JSON record per notification")
+    ] = False,
+    flush_count: Annotated[
+        int, typer.Option(help="Flush JSON output after this many records")
+    ] = 256,
+    flush_interval: Annotated[
+        float, typer.Option(help="Flush JSON output after this many seconds")
+    ] = 1.0,
 ):
     cli_observe(
         app_name,
@@ -98,6 +164,11 @@ def observe(
         list_attributes,
         list_actions,
         print_info,
+        plain,
+        profile,
+        json,
+        flush_count,
+        flush_interval,
     )
 
 
@@ -124,6 +195,12 @@ def inspect(
         bool, typer.Option(help="Print the subtree of the inspected element")
     ] = False,
     json: Annotated[bool, typer.Option(help="Output in JSON format")] = False,
+    profile: Annotated[
+        bool, typer.Option(help="Profile AX calls and print the top offenders")
+    ] = False,
+    max_rate: Annotated[
+        float, typer.Option(help="Most hit tests a second while hovering")
+    ] = 30,
 ):
     cli_inspect(
         app_name,
@@ -134,12 +211,181 @@ def inspect(
         list_actions,
         show_subtree,
         json,
+        profile,
+        max_rate,
     )
 
 
+@app.command()
+def diff(
+    before: Annotated[
+        str, typer.Argument(help="JSON tree file, or application to capture")
+    ],
+    after: Annotated[
+        str, typer.Argument(help="JSON tree file, or application to capture")
+    ],
+    web: Annotated[
+        bool, typer.Option("--web", "-w", help="Only capture web area subtree")
+    ] = False,
+    dom_id: Annotated[
+        str, typer.Option(help="Only capture subtree of DOM node ID")
+    ] = None,
+    attributes: Annotated[
+        List[str],
+        typer.Option("--attribute", "-a", help="Capture provided attributes"),
+    ] = DIFF_ATTRIBUTES,
+    key: Annotated[
+        str,
+        typer.Option(help="Match nodes by 'auto' (identifiers, then path) or 'path'"),
+    ] = "auto",
+    json: Annotated[bool, typer.Option(help="Output in JSON format")] = False,
+):
+    cli_diff(before, after, web, dom_id, attributes, key, json)
+
+
+@app.command()
+def select(
+    source: Annotated[
+        str, typer.Argument(help="Application, or snapshot or JSON tree file")
+    ],
+    match: Annotated[
+        List[str],
+        typer.Option("--match", "-m", help="Match ATTRIBUTE=VALUE (VALUE may be JSON)"),
+    ],
+    web: Annotated[
+        bool, typer.Option("--web", "-w", help="Only search web area subtree")
+    ] = False,
+    dom_id: Annotated[
+        str, typer.Option(help="Only search subtree of DOM node ID")
+    ] = None,
+    attributes: Annotated[
+        List[str], typer.Option("--attribute", "-a", help="Show provided attributes")
+    ] = DEFAULT_ATTRIBUTES,
+    limit: Annotated[int, typer.Option(help="Stop after this many matches")] = None,
+    json: Annotated[bool, typer.Option(help="Output in JSON format")] = False,
+):
+    cli_select(source, web, dom_id, match, attributes, limit, json)
+
+
+@app.command()
+def audit(
+    source: Annotated[
+        str, typer.Argument(help="Application, or snapshot or JSON tree file")
+    ],
+    web: Annotated[
+        bool, typer.Option("--web", "-w", help="Only audit web area subtree")
+    ] = False,
+    dom_id: Annotated[
+        str, typer.Option(help="Only audit subtree of DOM node ID")
+    ] = None,
+    rules: Annotated[
+        List[str], typer.Option("--rule", "-r", help="Only run provided rules")
+    ] = None,
+    workers: Annotated[int, typer.Option(help="Number of parallel tree walkers")] = 4,
+    json: Annotated[bool, typer.Option(help="Output in JSON format")] = False,
+):
+    cli_audit(source, web, dom_id, rules, workers, json)
+
+
+@app.command()
+def find(
+    match: Annotated[
+        List[str],
+        typer.Option("--match", "-m", help="Match ATTRIBUTE=VALUE (VALUE may be JSON)"),
+    ],
+    apps: Annotated[
+        List[str], typer.Option("--app", help="Only search provided applications")
+    ] = None,
+    attributes: Annotated[
+        List[str], typer.Option("--attribute", "-a", help="Show provided attributes")
+    ] = DEFAULT_ATTRIBUTES,
+    limit: Annotated[int, typer.Option(help="Stop after this many matches")] = None,
+    timeout: Annotated[
+        float, typer.Option(help="Seconds to search each application for at most")
+    ] = 5.0,
+    workers: Annotated[
+        int, typer.Option(help="Number of applications searched at once")
+    ] = 8,
+    json: Annotated[
+        bool, typer.Option(help="Output a JSON object per line for each match")
+    ] = False,
+):
+    cli_find(match, apps, attributes, limit, timeout, workers, json)
+
+
+@app.command()
+def bench(
+    app_name: Annotated[str, typer.Argument(help="Application to measure")],
+    web: Annotated[
+        bool, typer.Option("--web", "-w", help="Only measure web area subtree")
+    ] = False,
+    dom_id: Annotated[
+        str, typer.Option(help="Only measure subtree of DOM node ID")
+    ] = None,
+    attributes: Annotated[
+        List[str], typer.Option("--attribute", "-a", help="Fetch provided attributes")
+    ] = DEFAULT_ATTRIBUTES,
+    max_nodes: Annotated[
+        int, typer.Option(help="Stop after visiting this many nodes")
+    ] = None,
+    json: Annotated[bool, typer.Option(help="Output in JSON format")] = False,
+):
+    cli_bench(app_name, web, dom_id, attributes, max_nodes, json)
+
+
+@app.command()
+def monitor(
+    apps: Annotated[
+        List[str], typer.Argument(help="Applications to monitor (default: all)")
+    ] = None,
+    interval: Annotated[float, typer.Option(help="Seconds between probes")] = 1.0,
+    timeout: Annotated[
+        float, typer.Option(help="Seconds after which a probe counts as a timeout")
+    ] = 1.0,
+    window: Annotated[
+        int, typer.Option(help="Number of recent probes statistics are kept for")
+    ] = 60,
+    thresholds: Annotated[
+        List[str],
+        typer.Option(
+            "--threshold",
+            "-t",
+            help="Report when STAT=LIMIT is crossed (e.g. p90_ms=100)",
+        ),
+    ] = None,
+    report: Annotated[
+        float, typer.Option(help="Seconds between printed statistics")
+    ] = 5.0,
+    duration: Annotated[
+        float, typer.Option(help="Stop after this many seconds")
+    ] = None,
+    json: Annotated[
+        bool, typer.Option(help="Output a JSON object per line for each report")
+    ] = False,
+):
+    cli_monitor(apps, interval, timeout, window, thresholds, report, duration, json)
+
+
+@app.command()
+def serve(
+    socket: Annotated[
+        str, typer.Option(help="Path of the Unix socket to listen on")
+    ] = None,
+    synthetic: Annotated[
+        int,
+        typer.Option(help="Serve a synthetic tree of this many nodes for any app"),
+    ] = None,
+    max_age: Annotated[
+        float, typer.Option(help="Seconds a cached tree is served for at most")
+    ] = 30,
+):
+    cli_serve(socket, synthetic, max_age)
+
+
 def version_callback(value: bool):
     if value:
         from . import __version__
+
         print(value, __version__)
         raise typer.Exit()
 
@@ -0,0 +1,139 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Action descriptions are localized strings like "press" that are the same
+# for every element of a role in an application, so they are memoized by
+# application, role and action, and kept on disk between runs. The entries
+# of an application are dropped when its version changes.
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+
+__all__ = ["ActionDescriptionCache", "cache_path"]
+
+
+def cache_path():
+    "Returns the path of the cache file, which PYAX_ACTION_CACHE can override."
+    if os.environ.get("PYAX_ACTION_CACHE"):
+        return os.environ["PYAX_ACTION_CACHE"]
+    directory = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(directory, "pyax", "actions.json")
+
+
+class ActionDescriptionCache(object):
+    """Memoizes action descriptions by (application bundle and version, role,
+    action). Applications whose version is unknown are only cached in
+    memory, by pid. Changes are written to path at exit, or by save()."""
+
+    def __init__(self, path=None):
+        self.path = path or cache_path()
+        self._apps = None
+        self._versions = {}
+        self._dirty = False
+        self._registered = False
+        self._lock = threading.Lock()
+
+    def _changed(self):
+        self._dirty = True
+        if not self._registered:
+            self._registered = True
+            atexit.register(self.save)
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                self._apps = json.load(f)
+        except (OSError, ValueError):
+            self._apps = {}
+
+    def _entries(self, element):
+        # Returns the {role: {action: description}} dict of element's app.
+        pid = element.pid
+        with self._lock:
+            if self._apps is None:
+                self._load()
+            key = self._versions.get(pid)
+            if key is None:
+                version = element._backend.application_version(pid)
+                if version is None:
+                    key = self._versions[pid] = (f"pid:{pid}", None)
+                else:
+                    key = self._versions[pid] = version
+                bundle, version = key
+                app = self._apps.get(bundle)
+                if app is None or app.get("version") != version:
+                    self._apps[bundle] = {"version": version, "roles": {}}
+                    if version is not None and app is not None:
+                        self._changed()
+            return key[1] is not None, self._apps[key[0]]["roles"]
+
+    def describe(self, element, role, action):
+        "Returns the description of action, performed on element of role."
+        persistent, roles = self._entries(element)
+        actions = roles.setdefault(role or "", {})
+        if action not in actions:
+            err, description = element._backend.action_description(element, action)
+            if err:
+                return None
+            with self._lock:
+                actions[action] = description
+                if persistent:
+                    self._changed()
+        return actions[action]
+
+    def save(self):
+        "Writes the cached descriptions of applications with a known version."
+        with self._lock:
+            if not self._dirty:
+                return
+            apps = dict(
+                [
+                    [bundle, app]
+                    for bundle, app in self._apps.items()
+                    if app["version"] is not None
+                ]
+            )
+            directory = os.path.dirname(self.path)
+            try:
+                os.makedirs(directory, exist_ok=True)
+                fd, temp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(apps, f)
+                os.replace(temp, self.path)
+            except OSError:
+                # The cache is only an optimization.
+                return
+            self._dirty = False
+
+    def clear(self):
+        "Forgets all cached descriptions, in memory and on disk."
+        with self._lock:
+            self._apps = {}
+            self._versions = {}
+            self._dirty = False
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
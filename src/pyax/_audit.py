@@ -0,0 +1,226 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+# Accessibility audits. Rules declare the attributes they need, and the
+# engine fetches the union of them once per node, in a single traversal that
+# evaluates every rule. Large trees are split into subtrees that are walked
+# by a pool of worker threads, since the time goes into waiting on IPC.
+
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+__all__ = ["Rule", "RULES", "audit"]
+
+_CONTROL_ROLES = [
+    "AXButton",
+    "AXCheckBox",
+    "AXComboBox",
+    "AXMenuButton",
+    "AXPopUpButton",
+    "AXRadioButton",
+    "AXSlider",
+    "AXTextArea",
+    "AXTextField",
+]
+
+_LABEL_ATTRIBUTES = ["AXTitle", "AXDescription", "AXTitleUIElement"]
+
+
+class Rule(object):
+    """An audit rule. check is called with a dict of the node's values for
+    attributes (and AXRole, and AXChildren as a list) and returns a message
+    when the node fails the rule, or None. If roles is given, only nodes
+    with one of those roles are checked."""
+
+    def __init__(self, name, attributes, check, roles=None, severity="error"):
+        self.name = name
+        self.attributes = list(attributes)
+        self.check = check
+        self.roles = set(roles) if roles is not None else None
+        self.severity = severity
+
+    def __repr__(self):
+        return f"Rule({self.name})"
+
+
+def _has_label(values):
+    return any([values.get(a) for a in _LABEL_ATTRIBUTES])
+
+
+def _check_control_label(values):
+    if not _has_label(values):
+        return f"{values.get('AXRole')} has no title or description"
+
+
+def _check_image_description(values):
+    if not _has_label(values):
+        return "image has no description"
+
+
+def _check_link_text(values):
+    if not _has_label(values) and not values.get("AXChildren"):
+        return "link has no text"
+
+
+RULES = dict(
+    [
+        [rule.name, rule]
+        for rule in [
+            Rule(
+                "control-label",
+                _LABEL_ATTRIBUTES,
+                _check_control_label,
+                _CONTROL_ROLES,
+            ),
+            Rule(
+                "image-description",
+                _LABEL_ATTRIBUTES,
+                _check_image_description,
+                ["AXImage"],
+            ),
+            Rule("link-text", _LABEL_ATTRIBUTES, _check_link_text, ["AXLink"]),
+        ]
+    ]
+)
+
+
+# How many times a fetch that fails with an AX error is tried again.
+FETCH_RETRIES = 2
+
+
+def _fetcher(root, attributes):
+    # Returns a function that returns the (err, values) of a node.
+    if isinstance(root, Mapping):
+
+        def fetch(node):
+            values = dict([[a, node.get(a)] for a in attributes])
+            values["AXChildren"] = values["AXChildren"] or []
+            return 0, values
+
+    else:
+
+        def fetch(element):
+            for _ in range(FETCH_RETRIES + 1):
+                err, values = element._backend.multiple_attribute_values(
+                    element, attributes
+                )
+                if not err:
+                    break
+            values["AXChildren"] = values.get("AXChildren") or []
+            return err, values
+
+    return fetch
+
+
+class _Audit(object):
+    def __init__(self, root, rules):
+        self.rules = rules
+        attributes = ["AXRole"]
+        for rule in rules:
+            attributes += [a for a in rule.attributes if a not in attributes]
+        attributes.append("AXChildren")
+        self.fetch = _fetcher(root, attributes)
+        self.findings = []
+        self.nodes = 0
+        self.errors = 0
+        # Paths of the nodes that couldn't be fetched, whose subtrees were
+        # not audited.
+        self.unaudited = []
+        self._lock = threading.Lock()
+
+    def visit(self, item, path):
+        "Evaluates all rules on one node and returns its (child, path) pairs."
+        try:
+            err, values = self.fetch(item)
+        except Exception:
+            err = True
+        if err:
+            with self._lock:
+                self.errors += 1
+                self.unaudited.append(list(path))
+            return []
+        role = values.get("AXRole")
+        findings = []
+        for rule in self.rules:
+            if rule.roles is not None and role not in rule.roles:
+                continue
+            message = rule.check(values)
+            if message:
+                findings.append(
+                    {
+                        "rule": rule.name,
+                        "severity": rule.severity,
+                        "path": list(path),
+                        "role": role,
+                        "message": message,
+                    }
+                )
+        with self._lock:
+            self.nodes += 1
+            self.findings.extend(findings)
+        return [(child, path + (i,)) for i, child in enumerate(values["AXChildren"])]
+
+    def walk(self, item, path):
+        stack = [(item, path)]
+        while stack:
+            item, path = stack.pop()
+            stack.extend(reversed(self.visit(item, path)))
+
+
+def audit(root, rules=None, workers=4, shards_per_worker=4):
+    """Audits the subtree of root, a live element or a tree snapshot, and
+    returns a report dict with the findings in document order, a count of
+    findings per rule, the number of nodes visited and fetch errors, the
+    paths of nodes that couldn't be fetched (their subtrees are unaudited)
+    and the elapsed time. Fetches that fail with an AX error are retried
+    FETCH_RETRIES times. rules defaults to all of RULES. With more than one
+    worker, the top of the tree is expanded until there are
+    shards_per_worker subtrees per worker, which are then walked in
+    parallel."""
+    rules = list(RULES.values()) if rules is None else list(rules)
+    run = _Audit(root, rules)
+    start = time.perf_counter()
+    if workers > 1:
+        frontier = deque([(root, ())])
+        while frontier and len(frontier) < workers * shards_per_worker:
+            frontier.extend(run.visit(*frontier.popleft()))
+        with ThreadPoolExecutor(workers) as executor:
+            for future in [executor.submit(run.walk, *shard) for shard in frontier]:
+                future.result()
+    else:
+        run.walk(root, ())
+    findings = sorted(run.findings, key=lambda finding: finding["path"])
+    summary = {}
+    for finding in findings:
+        summary[finding["rule"]] = summary.get(finding["rule"], 0) + 1
+    return {
+        "nodes": run.nodes,
+        "errors": run.errors,
+        "unaudited": sorted(run.unaudited),
+        "seconds": time.perf_counter() - start,
+        "summary": summary,
+        "findings": findings,
+    }
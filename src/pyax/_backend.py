@@ -0,0 +1,370 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+# The calls pyax makes into the accessibility API, behind one interface. The
+# pyobjc backend talks to real applications on macOS; the synthetic backend in
+# pyax._synthetic serves generated trees anywhere, which is what the benchmark
+# suite and CI use. Every element knows its backend, and module level lookups
+# like get_application_by_name() go to the active backend, which PYAX_BACKEND
+# can select (e.g. PYAX_BACKEND="synthetic:nodes=100000,latency=0.0005").
+
+import os
+import time
+
+try:
+    from ApplicationServices import (
+        AXObserverCreateWithInfoCallback,
+        AXObserverGetRunLoopSource,
+        AXUIElementCopyAttributeNames,
+        AXUIElementCopyAttributeValue,
+        AXUIElementCopyParameterizedAttributeValue,
+        AXUIElementCopyParameterizedAttributeNames,
+        AXUIElementIsAttributeSettable,
+        AXUIElementCopyActionNames,
+        AXUIElementSetAttributeValue,
+        AXUIElementCreateApplication,
+        AXUIElementCopyMultipleAttributeValues,
+        AXUIElementCopyActionDescription,
+        AXUIElementPerformAction,
+        AXUIElementCopyElementAtPosition,
+        AXUIElementSetMessagingTimeout,
+        AXValueCreate,
+        AXValueRef,
+        AXValueGetType,
+        kAXValueAXErrorType,
+        kAXValueCFRangeType,
+    )
+    from objc import callbackFor
+    from Quartz import (
+        CFRunLoopAddSource,
+        CFRunLoopGetCurrent,
+        CFRunLoopRemoveSource,
+        CFRunLoopRunInMode,
+        CGWindowListCopyWindowInfo,
+        kCFRunLoopCommonModes,
+        kCFRunLoopDefaultMode,
+        kCGWindowListExcludeDesktopElements,
+        kCGNullWindowID,
+    )
+    from Foundation import NSBundle, NSKeyedUnarchiver
+    from Cocoa import NSData, NSRunningApplication
+except ImportError:
+    # pyobjc is only available on macOS.
+    NSData = None
+
+try:
+    from ApplicationServices import AXTextMarkerRangeCreate
+except ImportError:
+    # Text markers are only wrapped by recent pyobjc versions.
+    AXTextMarkerRangeCreate = None
+
+__all__ = ["Backend", "PyObjCBackend", "get_backend", "set_backend"]
+
+
+class Backend(object):
+    """The interface between pyax and an accessibility API. Element calls
+    mirror the AXUIElement functions: they return an (err, value) tuple,
+    or just err for calls without a result, where err is an AXError code
+    and 0 is success. Values are already converted to Python objects."""
+
+    def attribute_names(self, element):
+        raise NotImplementedError
+
+    def parameterized_attribute_names(self, element):
+        raise NotImplementedError
+
+    def attribute_value(self, element, attribute):
+        raise NotImplementedError
+
+    def multiple_attribute_values(self, element, attributes):
+        "Returns (err, dict) of the attributes that have a value."
+        raise NotImplementedError
+
+    def parameterized_attribute_value(self, element, attribute, parameter):
+        raise NotImplementedError
+
+    def range_parameter(self, location, length):
+        "Returns the parameter of a range of characters."
+        return (location, length)
+
+    def text_marker_range_parameter(self, start, end):
+        "Returns the parameter of the range between two text markers."
+        return (start, end)
+
+    def is_attribute_settable(self, element, attribute):
+        raise NotImplementedError
+
+    def set_attribute_value(self, element, attribute, value):
+        raise NotImplementedError
+
+    def action_names(self, element):
+        raise NotImplementedError
+
+    def action_description(self, element, action):
+        raise NotImplementedError
+
+    def perform_action(self, element, action):
+        raise NotImplementedError
+
+    def element_at_position(self, app, x, y):
+        raise NotImplementedError
+
+    def set_messaging_timeout(self, element, seconds):
+        """Limits how long calls to element wait for its application to
+        answer before failing with kAXErrorCannotComplete. Zero restores
+        the default."""
+        return 0
+
+    def application(self, pid):
+        "Returns the application element of pid."
+        raise NotImplementedError
+
+    def applications(self):
+        "Returns the application elements of apps with windows."
+        raise NotImplementedError
+
+    def application_by_name(self, name):
+        "Returns the application element of the app named name, or None."
+        raise NotImplementedError
+
+    def application_name(self, pid):
+        """Returns the name of the app with pid, without making an AX call
+        that a hung app could block, or None if it is unknown."""
+        return None
+
+    def application_version(self, pid):
+        """Returns the (bundle identifier, version) of the app with pid, or
+        None if it is unknown."""
+        return None
+
+    def create_observer(self, pid, callback, cfrunloop=None):
+        """Returns an observer for pid that calls
+        callback(observer, element, notification, info)."""
+        raise NotImplementedError
+
+    def remove_observer(self, observer, cfrunloop=None):
+        "Stops delivering notifications to an observer from create_observer()."
+        raise NotImplementedError
+
+    def wait(self, event, timeout, cfrunloop=None):
+        """Lets notifications be delivered until event, a threading.Event,
+        is set or timeout seconds pass. Returns whether event is set."""
+        return event.wait(timeout)
+
+
+def _unarchiveObject(val):
+    if isinstance(val, NSData):
+        try:
+            return NSKeyedUnarchiver.unarchiveObjectWithData_(val)
+        except Exception:
+            return val
+    else:
+        return val
+
+
+class PyObjCBackend(Backend):
+    "Talks to running applications through the ApplicationServices framework."
+
+    def attribute_names(self, element):
+        err, names = AXUIElementCopyAttributeNames(element, None)
+        return err, list(names or [])
+
+    def parameterized_attribute_names(self, element):
+        err, names = AXUIElementCopyParameterizedAttributeNames(element, None)
+        return err, list(names or [])
+
+    def attribute_value(self, element, attribute):
+        err, value = AXUIElementCopyAttributeValue(element, attribute, None)
+        return err, _unarchiveObject(value)
+
+    def multiple_attribute_values(self, element, attributes):
+        err, values = AXUIElementCopyMultipleAttributeValues(
+            element, attributes, 0, None
+        )
+        rv = {}
+        for i, value in enumerate(values or []):
+            if isinstance(value, AXValueRef):
+                if AXValueGetType(value) == kAXValueAXErrorType:
+                    continue
+            rv[attributes[i]] = _unarchiveObject(value)
+        return err, rv
+
+    def parameterized_attribute_value(self, element, attribute, parameter):
+        err, value = AXUIElementCopyParameterizedAttributeValue(
+            element, attribute, parameter, None
+        )
+        return err, _unarchiveObject(value)
+
+    def range_parameter(self, location, length):
+        return AXValueCreate(kAXValueCFRangeType, (location, length))
+
+    def text_marker_range_parameter(self, start, end):
+        if AXTextMarkerRangeCreate is None:
+            raise NotImplementedError("text markers need a newer pyobjc")
+        return AXTextMarkerRangeCreate(None, start, end)
+
+    def is_attribute_settable(self, element, attribute):
+        err, result = AXUIElementIsAttributeSettable(element, attribute, None)
+        return err, bool(result)
+
+    def set_attribute_value(self, element, attribute, value):
+        return AXUIElementSetAttributeValue(element, attribute, value)
+
+    def action_names(self, element):
+        err, names = AXUIElementCopyActionNames(element, None)
+        return err, list(names or [])
+
+    def action_description(self, element, action):
+        return AXUIElementCopyActionDescription(element, action, None)
+
+    def perform_action(self, element, action):
+        return AXUIElementPerformAction(element, action)
+
+    def element_at_position(self, app, x, y):
+        return AXUIElementCopyElementAtPosition(app, x, y, None)
+
+    def set_messaging_timeout(self, element, seconds):
+        return AXUIElementSetMessagingTimeout(element, seconds)
+
+    def application(self, pid):
+        return AXUIElementCreateApplication(pid)
+
+    def applications(self):
+        wl = CGWindowListCopyWindowInfo(
+            kCGWindowListExcludeDesktopElements, kCGNullWindowID
+        )
+        pids = [int((w.valueForKey_("kCGWindowOwnerPID"))) for w in wl]
+        return [AXUIElementCreateApplication(pid) for pid in set(pids)]
+
+    def application_by_name(self, name):
+        wl = CGWindowListCopyWindowInfo(
+            kCGWindowListExcludeDesktopElements, kCGNullWindowID
+        )
+        for w in wl:
+            if name == w.valueForKey_("kCGWindowOwnerName"):
+                return AXUIElementCreateApplication(
+                    int((w.valueForKey_("kCGWindowOwnerPID")))
+                )
+        return None
+
+    def application_name(self, pid):
+        app = NSRunningApplication.runningApplicationWithProcessIdentifier_(pid)
+        if app is None or app.localizedName() is None:
+            return None
+        return str(app.localizedName())
+
+    def application_version(self, pid):
+        app = NSRunningApplication.runningApplicationWithProcessIdentifier_(pid)
+        if app is None or app.bundleURL() is None:
+            return None
+        bundle = NSBundle.bundleWithURL_(app.bundleURL())
+        info = bundle.infoDictionary() if bundle else None
+        if not info:
+            return None
+        version = "%s (%s)" % (
+            info.get("CFBundleShortVersionString"),
+            info.get("CFBundleVersion"),
+        )
+        return str(app.bundleIdentifier() or app.bundleURL().path()), version
+
+    def create_observer(self, pid, callback, cfrunloop=None):
+        def _create_callback(callback):
+            @callbackFor(AXObserverCreateWithInfoCallback)
+            def cb(observer, element, notificationName, info, ptr):
+                callback(observer, element, notificationName, info)
+
+            return cb
+
+        err, observer = AXObserverCreateWithInfoCallback(
+            pid, _create_callback(callback), None
+        )
+        source = AXObserverGetRunLoopSource(observer)
+        CFRunLoopAddSource(
+            cfrunloop or CFRunLoopGetCurrent(), source, kCFRunLoopCommonModes
+        )
+        return observer
+
+    def remove_observer(self, observer, cfrunloop=None):
+        source = AXObserverGetRunLoopSource(observer)
+        CFRunLoopRemoveSource(
+            cfrunloop or CFRunLoopGetCurrent(), source, kCFRunLoopCommonModes
+        )
+
+    def wait(self, event, timeout, cfrunloop=None):
+        if cfrunloop is not None and cfrunloop != CFRunLoopGetCurrent():
+            # Another thread runs the loop that delivers notifications.
+            return event.wait(timeout)
+        deadline = time.monotonic() + timeout
+        while not event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            CFRunLoopRunInMode(kCFRunLoopDefaultMode, remaining, True)
+        return event.is_set()
+
+
+# Elements of the pyobjc backend go through this instance, unless a
+# PyObjCBackend subclass was made active.
+DEFAULT_BACKEND = PyObjCBackend()
+
+_active = None
+
+
+def _backend_from_spec(spec):
+    name, _, options = spec.partition(":")
+    if name == "pyobjc":
+        return DEFAULT_BACKEND
+    if name == "synthetic":
+        from pyax._synthetic import SyntheticBackend
+
+        kwargs = {}
+        for option in filter(None, options.split(",")):
+            key, _, value = option.partition("=")
+            kwargs[key] = value if key == "shape" else float(value)
+        for key in ("nodes", "fanout", "seed"):
+            if key in kwargs:
+                kwargs[key] = int(kwargs[key])
+        return SyntheticBackend(**kwargs)
+    raise ValueError(f"unknown backend '{name}'")
+
+
+def get_backend():
+    "Returns the active backend, selected by PYAX_BACKEND or set_backend()."
+    global _active
+    if _active is None:
+        _active = _backend_from_spec(os.environ.get("PYAX_BACKEND", "pyobjc"))
+    return _active
+
+
+def set_backend(backend):
+    "Makes backend the active backend, and returns the previous one."
+    global _active
+    previous = get_backend()
+    _active = backend
+    return previous
+
+
+def pyobjc_backend():
+    "Returns the backend that elements of the pyobjc backend go through."
+    backend = get_backend()
+    return backend if isinstance(backend, PyObjCBackend) else DEFAULT_BACKEND
@@ -0,0 +1,68 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import time
+from pyax._walk import walk
+
+__all__ = ["percentile", "measure_tree"]
+
+
+def percentile(samples, p):
+    "Returns the p-th percentile (0-100) of a list of samples."
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def measure_tree(element, attributes, max_nodes=None):
+    """Walks the subtree of element, fetching each of the given attributes
+    one call at a time, and returns throughput and per-call latency
+    statistics."""
+    samples = []
+
+    def fetch(elem):
+        for attribute in attributes:
+            t = time.perf_counter()
+            elem[attribute]
+            samples.append(time.perf_counter() - t)
+        t = time.perf_counter()
+        children = elem["AXChildren"] or []
+        samples.append(time.perf_counter() - t)
+        return None, children
+
+    nodes = 0
+    start = time.perf_counter()
+    for event in walk(element, fetch, max_nodes=max_nodes, paths=False):
+        nodes += 1
+    elapsed = time.perf_counter() - start
+    return {
+        "nodes": nodes,
+        "attribute_fetches": len(samples),
+        "seconds": elapsed,
+        "nodes_per_sec": nodes / elapsed if elapsed else 0.0,
+        "fetches_per_sec": len(samples) / elapsed if elapsed else 0.0,
+        "latency_p50_ms": percentile(samples, 50) * 1000,
+        "latency_p99_ms": percentile(samples, 99) * 1000,
+        "latency_max_ms": max(samples) * 1000 if samples else 0.0,
+    }
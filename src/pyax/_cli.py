@@ -22,14 +22,38 @@
 
 from rich.console import Console
 from rich.json import JSON
-from . import get_web_root, get_application_by_name, create_observer, start, EVENTS
+from . import get_web_root, get_application_by_name, get_applications
+from . import create_observer, start, EVENTS
+from . import create_timer, cancel_timer
+from . import diff_trees, load_tree
+from ._snapshot import save_snapshot, load_snapshot, is_snapshot_file, select_nodes
 from .utils import get_element_with_mouse
+from ._stream import stream_json, stream_ndjson, NDJSONWriter, plain_values
+from ._stream import default_json_encoder as _default_json_encoder
+from ._render import RichRenderer, PlainRenderer
+from ._bench import measure_tree
+from ._profile import Profiler
+from ._watch import TreeWatcher, WATCH_EVENTS
+from ._audit import RULES, audit as run_audit
+from ._actions import ActionDescriptionCache
+from ._plan import FetchPlan, ROLE_ATTRIBUTES
+from ._walk import walk
+from ._find import find_anywhere, application_name
+from ._monitor import ResponsivenessMonitor, PROBE_STATS
+from . import _daemon
+import json as _json
+import os
 import sys
+import time
 
 DEFAULT_ATTRIBUTES = ["AXRole", "AXTitle", "AXValue"]
+DIFF_ATTRIBUTES = DEFAULT_ATTRIBUTES + ["AXIdentifier", "AXDOMIdentifier"]
 
 _CONSOLE = Console()
 
+# Action descriptions, memoized on disk across runs.
+_ACTION_DESCRIPTIONS = ActionDescriptionCache()
+
 
 def _print_error_and_exit(s):
     print(f"Error: {s}", file=sys.stderr)
@@ -57,16 +81,7 @@ def _get_target_uielement(app, web, dom_id):
     return element
 
 
-def _default_json_encoder(obj):
-    try:
-        return obj.serializable()
-    except Exception:
-        return repr(obj)
-
-
-def _element_to_dict(
-    element, attributes, all_attributes, list_attributes, list_actions
-):
+def _attributes_to_dict(element, attributes, all_attributes):
     attr_list = sorted(
         element.attribute_names if all_attributes else attributes,
         key=lambda x: [
@@ -74,44 +89,102 @@ def _element_to_dict(
             x,
         ],
     )
-    obj = dict([[attr_name, element[attr_name]] for attr_name in attr_list])
+    return dict([[attr_name, element[attr_name]] for attr_name in attr_list])
+
+
+def _element_to_dict(
+    element, attributes, all_attributes, list_attributes, list_actions
+):
+    if isinstance(attributes, FetchPlan):
+        if all_attributes:
+            obj = _attributes_to_dict(element, attributes.attributes, True)
+        else:
+            obj = attributes.fetch(element)
+    else:
+        obj = _attributes_to_dict(element, attributes, all_attributes)
     if list_attributes:
         obj["attributes"] = sorted(
             element.attribute_names + element.parameterized_attribute_names
         )
     if list_actions:
+        role = _role_of(element, obj)
         obj["actions"] = dict(
             [
-                [action, element.get_action_description(action)]
+                [action, _ACTION_DESCRIPTIONS.describe(element, role, action)]
                 for action in element.actions
             ]
         )
     return obj
 
 
-def _obj_to_pretty_string(element, obj, role_markup="bold red"):
-    attr_string = " ".join(
-        [
-            f"[italic]{k[0]}[/italic]={repr(k[1])}"
-            for k in filter(lambda x: x[0] != "AXRole", obj.items())
-        ]
-    )
-    return f"[{role_markup}]{element['AXRole']}[/{role_markup}] {attr_string}"
+def _load_plan(plan, attributes):
+    """Returns the fetch plan in the JSON file plan, or the built in plan of
+    extra attributes per role if plan is "roles"."""
+    if plan == "roles":
+        return FetchPlan(attributes, ROLE_ATTRIBUTES)
+    try:
+        return FetchPlan.load(plan, attributes)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        _print_error_and_exit(f"can't load fetch plan '{plan}': {e}")
+
+
+def _get_renderer(plain=False):
+    "Returns the plain renderer if requested or if stdout is not a terminal."
+    if plain or not sys.stdout.isatty():
+        return PlainRenderer(sys.stdout)
+    return RichRenderer(_CONSOLE)
+
+
+def _start_profiler(profile):
+    if not profile:
+        return None
+    profiler = Profiler(keep_events=False)
+    profiler.start()
+    return profiler
+
+
+def _print_profile(profiler):
+    if profiler:
+        profiler.stop()
+        print(file=sys.stderr)
+        print(profiler.report(), file=sys.stderr)
+
+
+def _role_of(element, obj):
+    return obj["AXRole"] if "AXRole" in obj else element["AXRole"]
+
+
+def _dict_fetcher(attributes, all_attributes, list_attributes, list_actions):
+    "Returns a fetch function for walk() that converts elements to dicts."
+
+    def fetch(element):
+        obj = _element_to_dict(
+            element, attributes, all_attributes, list_attributes, list_actions
+        )
+        # Reuse the children when they were fetched as an attribute.
+        children = obj.get("AXChildren")
+        return obj, children if isinstance(children, list) else element
+
+    return fetch
 
 
 def _json_dump_inner(
     element, attributes, all_attributes, list_attributes, list_actions
 ):
-    obj = _element_to_dict(
-        element, attributes, all_attributes, list_attributes, list_actions
-    )
-    obj["AXChildren"] = [
-        _json_dump_inner(
-            child, attributes, all_attributes, list_attributes, list_actions
-        )
-        for child in element
-    ]
-    return obj
+    # The dicts of the current node and its ancestors, by depth.
+    levels = []
+    for event in walk(
+        element,
+        _dict_fetcher(attributes, all_attributes, list_attributes, list_actions),
+        paths=False,
+    ):
+        obj = event.attributes
+        obj["AXChildren"] = []
+        del levels[event.depth :]
+        if levels:
+            levels[-1]["AXChildren"].append(obj)
+        levels.append(obj)
+    return levels[0]
 
 
 def _json_dump(
@@ -122,7 +195,7 @@ def _json_dump(
     list_actions,
     show_subtree=True,
 ):
-    attrs = element.attribute_names if all_attributes else attributes[:]
+    attrs = element.attribute_names if all_attributes else attributes
     data = (
         _element_to_dict(element, attrs, all_attributes, list_attributes, list_actions)
         if not show_subtree
@@ -133,50 +206,212 @@ def _json_dump(
     _CONSOLE.print(JSON.from_data(data, default=_default_json_encoder))
 
 
-def _tree_dump(
+def _json_stream_dump(
     element,
     attributes,
     all_attributes,
     list_attributes,
     list_actions,
-    indent=0,
-    show_subtree=True,
+    out,
+    ndjson=False,
 ):
-    obj = _element_to_dict(
+    def to_dict(elem):
+        return _element_to_dict(
+            elem, attributes, all_attributes, list_attributes, list_actions
+        )
+
+    (stream_ndjson if ndjson else stream_json)(element, to_dict, out)
+
+
+def _snapshot_children(node):
+    return iter(node.get("AXChildren") or [])
+
+
+def _snapshot_dump(node, renderer, indent=0):
+    "Renders a tree snapshot, as returned by the daemon, like _tree_dump."
+    for event in walk(node, paths=False):
+        obj = dict([[k, v] for k, v in event.element.items() if k != "AXChildren"])
+        renderer.element(obj.get("AXRole"), obj, indent + event.depth)
+    if indent == 0:
+        renderer.flush()
+
+
+def _capture_tree(element, attributes, all_attributes, list_attributes, list_actions):
+    "Captures the subtree of element as a tree snapshot of plain values."
+    data = _json_dump_inner(
         element, attributes, all_attributes, list_attributes, list_actions
     )
-    if "AXChildren" in obj and show_subtree:
-        obj.pop("AXChildren")
-    to_print = _obj_to_pretty_string(element, obj)
-    _CONSOLE.print(f"{indent * ' '}{to_print}")
-    if not show_subtree:
-        return
+    # Round trip through JSON so live values compare like loaded ones.
+    return _json.loads(_json.dumps(data, default=_default_json_encoder))
 
-    for child in element:
-        _tree_dump(
-            child, attributes, all_attributes, list_attributes, list_actions, indent + 1
+
+def _get_snapshot_target(root, web, dom_id):
+    "Like _get_target_uielement, but for a tree snapshot."
+    node = root
+    if web or dom_id:
+        found = select_nodes(node, {"AXRole": "AXWebArea"}, 1)
+        if not found:
+            _print_error_and_exit("no web area found")
+        node = found[0][1]
+    if dom_id:
+        found = select_nodes(node, {"AXDOMIdentifier": dom_id}, 1)
+        if not found:
+            _print_error_and_exit(f"can't find '{dom_id}' DOM identifier in tree")
+        node = found[0][1]
+    return node
+
+
+def _load_tree_file(path):
+    "Loads a tree snapshot from a binary snapshot, JSON or NDJSON file."
+    if is_snapshot_file(path):
+        return load_snapshot(path)
+    with open(path) as f:
+        return load_tree(f)
+
+
+def _tree_from_daemon(
+    app_name,
+    web,
+    dom_id,
+    attributes,
+    all_attributes,
+    list_attributes,
+    list_actions,
+):
+    try:
+        return _daemon.request(
+            "tree",
+            app=app_name,
+            web=web,
+            dom_id=dom_id,
+            attributes=attributes,
+            all_attributes=all_attributes,
+            list_attributes=list_attributes,
+            list_actions=list_actions,
         )
+    except _daemon.DaemonError as e:
+        _print_error_and_exit(str(e))
+
+
+def _dump_snapshot(data, json, ndjson, output, plain):
+    "Outputs a tree snapshot in the same formats as a live tree."
+    if ndjson or (json and (output or not sys.stdout.isatty())):
+        out = open(output, "w") if output else sys.stdout
+        try:
+            (stream_ndjson if ndjson else stream_json)(
+                data, dict, out, children=_snapshot_children
+            )
+        finally:
+            if output:
+                out.close()
+    elif json:
+        _CONSOLE.print(JSON.from_data(data, default=_default_json_encoder))
+    else:
+        _snapshot_dump(data, _get_renderer(plain))
+
+
+def _tree_dump(
+    element,
+    attributes,
+    all_attributes,
+    list_attributes,
+    list_actions,
+    indent=0,
+    show_subtree=True,
+    renderer=None,
+):
+    renderer = renderer or RichRenderer(_CONSOLE)
+    for event in walk(
+        element,
+        _dict_fetcher(attributes, all_attributes, list_attributes, list_actions),
+        max_depth=None if show_subtree else 0,
+        paths=False,
+    ):
+        obj = event.attributes
+        if show_subtree:
+            obj.pop("AXChildren", None)
+        renderer.element(_role_of(event.element, obj), obj, indent + event.depth)
+    if indent == 0:
+        renderer.flush()
+
+
+def _watch_tree(
+    app, element, attributes, all_attributes, list_attributes, list_actions, max_rate
+):
+    watcher = TreeWatcher(
+        element,
+        lambda e: _element_to_dict(
+            e, attributes, all_attributes, list_attributes, list_actions
+        ),
+        PlainRenderer(sys.stdout),
+        max_rate=max_rate,
+    )
+    observer = create_observer(
+        app.pid, lambda _, elem, name, info: watcher.notify(elem, name)
+    )
+    observer.add_notifications(*WATCH_EVENTS)
+    timer = create_timer(watcher.min_interval, watcher.refresh)
+    watcher.start()
+    try:
+        start()
+    finally:
+        cancel_timer(timer)
+        watcher.close()
 
 
 def _create_notification_dumper(
-    attributes, print_info, all_attributes, list_attributes, list_actions
+    attributes,
+    print_info,
+    all_attributes,
+    list_attributes,
+    list_actions,
+    renderer=None,
 ):
+    renderer = renderer or RichRenderer(_CONSOLE)
+
     def dump_notification(_, element, notificationName, info):
         obj = _element_to_dict(
             element, attributes, all_attributes, list_attributes, list_actions
         )
         if "AXChildren" in obj:
             obj.pop("AXChildren")
-        to_print = _obj_to_pretty_string(element, obj, "red")
-        _CONSOLE.print(f"[bold]{notificationName.ljust(25)}[/bold] {to_print}")
+        renderer.element(
+            _role_of(element, obj),
+            obj,
+            role_style="red",
+            label=notificationName.ljust(25),
+        )
         if print_info:
             if info:
-                _CONSOLE.print(JSON.from_data(info, default=_default_json_encoder))
-            _CONSOLE.print()
+                renderer.json(info)
+            renderer.line()
+        renderer.flush()
 
     return dump_notification
 
 
+def _create_notification_writer(
+    pid, attributes, all_attributes, list_attributes, list_actions, writer
+):
+    def write_notification(_, element, notificationName, info):
+        obj = _element_to_dict(
+            element, attributes, all_attributes, list_attributes, list_actions
+        )
+        obj.pop("AXChildren", None)
+        # Converted here, on the run loop thread, while the element exists.
+        writer.write(
+            {
+                "timestamp": time.time(),
+                "pid": pid,
+                "notification": str(notificationName),
+                "attributes": plain_values(obj),
+                "info": plain_values(info) if info else info,
+            }
+        )
+
+    return write_notification
+
+
 def tree(
     app_name,
     web,
@@ -186,13 +421,98 @@ def tree(
     list_attributes,
     list_actions,
     json,
+    ndjson=False,
+    output=None,
+    plain=False,
+    profile=False,
+    save=None,
+    load=None,
+    watch=False,
+    max_rate=10,
+    plan=None,
 ):
+    if plan:
+        attributes = _load_plan(plan, attributes)
+    if watch:
+        if not app_name or load or save or json or ndjson:
+            _print_error_and_exit("--watch needs an application and text output")
+        if max_rate <= 0:
+            _print_error_and_exit("--max-rate must be positive")
+        app = _get_target_application(app_name)
+        _watch_tree(
+            app,
+            _get_target_uielement(app, web, dom_id),
+            attributes,
+            all_attributes,
+            list_attributes,
+            list_actions,
+            max_rate,
+        )
+        return
+
+    data = None
+    if load:
+        data = _get_snapshot_target(_load_tree_file(load), web, dom_id)
+    elif not app_name:
+        _print_error_and_exit("an application name or a snapshot to load is required")
+    elif not profile and not plan and _daemon.is_running():
+        data = _tree_from_daemon(
+            app_name,
+            web,
+            dom_id,
+            attributes,
+            all_attributes,
+            list_attributes,
+            list_actions,
+        )
+
+    profiler = _start_profiler(profile)
+    if save:
+        if data is None:
+            element = _get_target_uielement(
+                _get_target_application(app_name), web, dom_id
+            )
+            data = _capture_tree(
+                element, attributes, all_attributes, list_attributes, list_actions
+            )
+        with open(save, "wb") as f:
+            save_snapshot(data, f)
+        _print_profile(profiler)
+        return
+
+    if data is not None:
+        _dump_snapshot(data, json, ndjson, output, plain)
+        return
+
     element = _get_target_uielement(_get_target_application(app_name), web, dom_id)
 
-    if json:
+    if ndjson or (json and (output or not sys.stdout.isatty())):
+        out = open(output, "w") if output else sys.stdout
+        try:
+            _json_stream_dump(
+                element,
+                attributes,
+                all_attributes,
+                list_attributes,
+                list_actions,
+                out,
+                ndjson,
+            )
+        finally:
+            if output:
+                out.close()
+    elif json:
         _json_dump(element, attributes, all_attributes, list_attributes, list_actions)
     else:
-        _tree_dump(element, attributes, all_attributes, list_attributes, list_actions)
+        _tree_dump(
+            element,
+            attributes,
+            all_attributes,
+            list_attributes,
+            list_actions,
+            renderer=_get_renderer(plain),
+        )
+    _print_profile(profiler)
 
 
 def observe(
@@ -203,16 +523,42 @@ def observe(
     list_attributes,
     list_actions,
     print_info,
+    plain=False,
+    profile=False,
+    json=False,
+    flush_count=256,
+    flush_interval=1.0,
 ):
+    profiler = _start_profiler(profile)
     app = get_application_by_name(app_name)
-    observer = create_observer(
-        app.pid,
-        _create_notification_dumper(
-            attributes, print_info, all_attributes, list_attributes, list_actions
-        ),
-    )
+    writer = None
+    if json:
+        writer = NDJSONWriter(sys.stdout, flush_count, flush_interval)
+        callback = _create_notification_writer(
+            app.pid,
+            attributes,
+            all_attributes,
+            list_attributes,
+            list_actions,
+            writer,
+        )
+    else:
+        callback = _create_notification_dumper(
+            attributes,
+            print_info,
+            all_attributes,
+            list_attributes,
+            list_actions,
+            _get_renderer(plain),
+        )
+    observer = create_observer(app.pid, callback)
     observer.add_notifications(*(events or EVENTS))
     start()
+    if writer:
+        writer.close()
+        if writer.dropped:
+            print(f"{writer.dropped} notifications dropped", file=sys.stderr)
+    _print_profile(profiler)
 
 
 def inspect(
@@ -224,11 +570,31 @@ def inspect(
     list_actions,
     show_subtree,
     json,
+    profile=False,
+    max_rate=30,
 ):
+    if max_rate <= 0:
+        _print_error_and_exit("--max-rate must be positive")
+    if dom_id and not profile and _daemon.is_running():
+        data = _tree_from_daemon(
+            app_name,
+            False,
+            dom_id,
+            attributes,
+            all_attributes,
+            list_attributes,
+            list_actions,
+        )
+        if not show_subtree:
+            data = dict([[k, v] for k, v in data.items() if k != "AXChildren"])
+        _dump_snapshot(data, json, False, None, False)
+        return
+
+    profiler = _start_profiler(profile)
     app = _get_target_application(app_name)
 
-    def _onhover(element):
-        elem_str = repr(element)[: _CONSOLE.width].ljust(_CONSOLE.width)
+    def _onhover(label):
+        elem_str = label[: _CONSOLE.width].ljust(_CONSOLE.width)
         _CONSOLE.print(elem_str, end="\r")
 
     def _show(element):
@@ -252,11 +618,14 @@ def inspect(
             )
 
     if dom_id:
-        _show(_get_target_uielement(app_name, None, dom_id))
+        _show(_get_target_uielement(app, None, dom_id))
+        _print_profile(profiler)
         return
 
     try:
-        element = get_element_with_mouse(app, _onhover)
+        element = get_element_with_mouse(
+            app, label_callback=_onhover, max_rate=max_rate
+        )
     except NotImplementedError:
         _print_error_and_exit(
             "'highlight' pyax extra is required for inspecting element under mouse"
@@ -264,3 +633,277 @@ def inspect(
 
     print()
     _show(element)
+    _print_profile(profiler)
+
+
+def _load_or_capture_tree(source, web, dom_id, attributes):
+    "Loads a tree snapshot from a file, or captures it from a running app."
+    if os.path.exists(source):
+        return _get_snapshot_target(_load_tree_file(source), web, dom_id)
+    if _daemon.is_running():
+        return _tree_from_daemon(source, web, dom_id, attributes, False, False, False)
+    element = _get_target_uielement(_get_target_application(source), web, dom_id)
+    return _capture_tree(element, attributes, False, False, False)
+
+
+def _print_change(renderer, change):
+    kind = change["type"]
+    if kind == "insert":
+        renderer.line(f"+ {change['path']} {change['node']}")
+    elif kind == "delete":
+        renderer.line(f"- {change['path']} {change['node']}")
+    elif kind == "move":
+        indices = ""
+        if "from_index" in change:
+            indices = f" ({change['from_index']} -> {change['to_index']})"
+        renderer.line(f"> {change['from']} -> {change['to']}{indices}")
+    else:
+        renderer.line(
+            f"~ {change['path']} {change['attribute']}: "
+            f"{repr(change['old'])} -> {repr(change['new'])}"
+        )
+
+
+def diff(before, after, web, dom_id, attributes, key, json):
+    if key not in ("auto", "path"):
+        _print_error_and_exit(f"unknown key '{key}', expected 'auto' or 'path'")
+    old = _load_or_capture_tree(before, web, dom_id, attributes)
+    new = _load_or_capture_tree(after, web, dom_id, attributes)
+    changes = diff_trees(old, new, key)
+    if json:
+        print(_json.dumps(changes, default=_default_json_encoder))
+        return
+    renderer = PlainRenderer(sys.stdout, color=False)
+    for change in changes:
+        _print_change(renderer, change)
+    renderer.flush()
+
+
+def bench(app_name, web, dom_id, attributes, max_nodes, json):
+    element = _get_target_uielement(_get_target_application(app_name), web, dom_id)
+    stats = measure_tree(element, attributes, max_nodes)
+    if json:
+        print(_json.dumps(stats))
+        return
+    print(f"nodes              {stats['nodes']}")
+    print(f"nodes/sec          {stats['nodes_per_sec']:.1f}")
+    print(f"attribute fetches  {stats['attribute_fetches']}")
+    print(f"fetches/sec        {stats['fetches_per_sec']:.1f}")
+    print(f"latency p50        {stats['latency_p50_ms']:.3f} ms")
+    print(f"latency p99        {stats['latency_p99_ms']:.3f} ms")
+    print(f"latency max        {stats['latency_max_ms']:.3f} ms")
+
+
+def serve(path, synthetic, max_age):
+    if synthetic:
+        from ._synthetic import build_synthetic_tree
+
+        root = build_synthetic_tree(synthetic)
+        server = _daemon.Server(path, lambda name: root, False, max_age)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    from Quartz import CFRunLoopGetMain
+    import threading
+
+    # Requests are served on a thread while the main run loop delivers the
+    # notifications that keep the cached trees fresh.
+    server = _daemon.Server(path, max_age=max_age, cfrunloop=CFRunLoopGetMain())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    start()
+    server.shutdown()
+
+
+def _parse_match(match):
+    "Parses ATTRIBUTE=VALUE strings, where VALUE is JSON or a plain string."
+    rv = {}
+    for item in match:
+        name, _, value = item.partition("=")
+        try:
+            rv[name] = _json.loads(value)
+        except ValueError:
+            rv[name] = value
+    return rv
+
+
+def select(source, web, dom_id, match, attributes, limit, json):
+    match = _parse_match(match)
+    if os.path.exists(source):
+        root = _get_snapshot_target(_load_tree_file(source), web, dom_id)
+        found = [
+            {"path": list(path), "node": dict([[a, node.get(a)] for a in attributes])}
+            for path, node in select_nodes(root, match, limit)
+        ]
+    elif _daemon.is_running():
+        try:
+            found = _daemon.request(
+                "select",
+                app=source,
+                web=web,
+                dom_id=dom_id,
+                match=match,
+                attributes=attributes,
+                limit=limit,
+            )
+        except _daemon.DaemonError as e:
+            _print_error_and_exit(str(e))
+    else:
+        element = _get_target_uielement(_get_target_application(source), web, dom_id)
+        wanted = sorted(set(attributes) | set(match))
+        root = _capture_tree(element, wanted, False, False, False)
+        found = [
+            {"path": list(path), "node": dict([[a, node.get(a)] for a in attributes])}
+            for path, node in select_nodes(root, match, limit)
+        ]
+    if json:
+        print(_json.dumps(found, default=_default_json_encoder))
+        return
+    renderer = _get_renderer()
+    for item in found:
+        obj = item["node"]
+        path = "/".join([str(i) for i in item["path"]]) or "."
+        renderer.element(obj.get("AXRole"), obj, label=path)
+    renderer.flush()
+
+
+def audit(source, web, dom_id, rules, workers, json):
+    unknown = [name for name in rules or [] if name not in RULES]
+    if unknown:
+        _print_error_and_exit(
+            f"unknown rule '{unknown[0]}', available rules: {', '.join(RULES)}"
+        )
+    selected = [RULES[name] for name in rules] if rules else list(RULES.values())
+    if os.path.exists(source):
+        root = _get_snapshot_target(_load_tree_file(source), web, dom_id)
+    elif _daemon.is_running():
+        attributes = ["AXRole"]
+        for rule in selected:
+            attributes += [a for a in rule.attributes if a not in attributes]
+        root = _tree_from_daemon(source, web, dom_id, attributes, False, False, False)
+    else:
+        root = _get_target_uielement(_get_target_application(source), web, dom_id)
+    report = run_audit(root, selected, workers)
+    if json:
+        print(_json.dumps(report, default=_default_json_encoder))
+        return
+    renderer = _get_renderer()
+    for finding in report["findings"]:
+        path = "/".join([str(i) for i in finding["path"]]) or "."
+        obj = {"rule": finding["rule"], "message": finding["message"]}
+        renderer.element(finding["role"], obj, label=path)
+    if report["findings"]:
+        renderer.line()
+    summary = ", ".join(
+        [f"{count} {rule}" for rule, count in report["summary"].items()]
+    )
+    renderer.line(
+        f"{len(report['findings'])} findings in {report['nodes']} nodes "
+        f"({report['seconds']:.2f}s){': ' + summary if summary else ''}"
+    )
+    if report["unaudited"]:
+        renderer.line(
+            f"{len(report['unaudited'])} subtrees could not be read and were "
+            "not audited"
+        )
+    renderer.flush()
+
+
+def find(match, apps, attributes, limit, timeout, workers, json):
+    if workers < 1:
+        _print_error_and_exit("--workers must be at least 1")
+    match = _parse_match(match)
+    renderer = _get_renderer()
+
+    def timed_out(app):
+        print(
+            f"Gave up on '{application_name(app)}' after {timeout}s",
+            file=sys.stderr,
+        )
+
+    results = find_anywhere(match, apps or None, limit, timeout, workers, timed_out)
+    try:
+        for app, element in results:
+            obj = _attributes_to_dict(element, attributes, False)
+            title = application_name(app)
+            # Matches are written as they are found.
+            if json:
+                obj = {"application": title, "pid": app.pid, "node": obj}
+                print(_json.dumps(obj, default=_default_json_encoder), flush=True)
+                continue
+            renderer.element(_role_of(element, obj), obj, label=title)
+            renderer.flush()
+    except LookupError as e:
+        _print_error_and_exit(str(e))
+
+
+def _print_stats(stats, json):
+    if json:
+        print(_json.dumps(dict(stats, timestamp=time.time())), flush=True)
+        return
+    print(
+        f"{stats['name'][:24]:<24} {stats['pid']:>7} "
+        f"{stats['p50_ms']:>9.2f} {stats['p90_ms']:>9.2f} {stats['p99_ms']:>9.2f} "
+        f"{stats['max_ms']:>9.2f} {stats['timeouts']:>8} {stats['errors']:>6}",
+        flush=True,
+    )
+
+
+def monitor(apps, interval, timeout, window, thresholds, report, duration, json):
+    if interval <= 0 or timeout <= 0 or report <= 0:
+        _print_error_and_exit("--interval, --timeout and --report must be positive")
+    if window < 1:
+        _print_error_and_exit("--window must be at least 1")
+    limits = _parse_match(thresholds or [])
+    unknown = [stat for stat in limits if stat not in PROBE_STATS]
+    if unknown:
+        _print_error_and_exit(
+            f"unknown statistic '{unknown[0]}', available: {', '.join(PROBE_STATS)}"
+        )
+    for stat, limit in limits.items():
+        if isinstance(limit, bool) or not isinstance(limit, (int, float)):
+            _print_error_and_exit(f"limit of '{stat}' must be a number, not {limit!r}")
+    if apps:
+        targets = [_get_target_application(name) for name in apps]
+    else:
+        targets = get_applications()
+
+    def crossed(pid, stat, value, above):
+        name = responsiveness.stats(pid)["name"]
+        if json:
+            obj = {"timestamp": time.time(), "pid": pid, "name": name}
+            obj.update({"stat": stat, "value": value, "crossed": above})
+            print(_json.dumps(obj), flush=True)
+            return
+        state = "above" if above else "back within"
+        print(
+            f"{name} ({pid}): {stat} {value:g} {state} {limits[stat]}",
+            file=sys.stderr,
+            flush=True,
+        )
+
+    responsiveness = ResponsivenessMonitor(interval, timeout, window)
+    for stat, limit in limits.items():
+        responsiveness.add_threshold(stat, limit, crossed)
+    for app in targets:
+        responsiveness.watch(app)
+    deadline = time.monotonic() + duration if duration else None
+    with responsiveness:
+        try:
+            while deadline is None or time.monotonic() < deadline:
+                wait = report
+                if deadline is not None:
+                    wait = min(wait, max(deadline - time.monotonic(), 0))
+                time.sleep(wait)
+                if not json:
+                    print(
+                        f"{'application':<24} {'pid':>7} {'p50 ms':>9} {'p90 ms':>9} "
+                        f"{'p99 ms':>9} {'max ms':>9} {'timeouts':>8} {'errors':>6}"
+                    )
+                for stats in responsiveness.stats():
+                    _print_stats(stats, json)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,287 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+# A compact in-memory representation of a captured tree. Instead of a dict
+# per node, structure lives in array columns: parent, first child and next
+# sibling links, interned role and subrole ids, and the frame. Every other
+# attribute goes in a side table per attribute name, holding only the nodes
+# that have a value. Node views are created on demand.
+
+import json
+import math
+from array import array
+from collections.abc import Mapping
+from pyax._stream import default_json_encoder
+from pyax._plan import FetchPlan
+from pyax._walk import walk
+
+__all__ = ["CompactTree", "CompactNode"]
+
+_PLAIN = (str, int, float, bool, type(None))
+_FRAME_KEYS = ("x", "y", "w", "h")
+_MISSING = object()
+
+
+def _plain(value):
+    "Converts a live attribute value to what a JSON round trip would give."
+    if isinstance(value, _PLAIN):
+        return value
+    return json.loads(json.dumps(value, default=default_json_encoder))
+
+
+class CompactTree(object):
+    """A captured tree held in columns. Nodes are numbered in document
+    order, with -1 standing for no node in the link columns. Roles and
+    subroles are indices into the strings table, where 0 is None. Frames
+    are NaN when a node has none."""
+
+    def __init__(self):
+        self.parent = array("i")
+        self.first_child = array("i")
+        self.next_sibling = array("i")
+        self.role = array("H")
+        self.subrole = array("H")
+        self.x = array("d")
+        self.y = array("d")
+        self.w = array("d")
+        self.h = array("d")
+        self.strings = [None]
+        self.side_tables = {}
+        self._string_ids = {None: 0}
+
+    def __len__(self):
+        return len(self.parent)
+
+    def intern(self, s):
+        "Returns the id of s in the strings table, adding it if needed."
+        index = self._string_ids.get(s)
+        if index is None:
+            index = self._string_ids[s] = len(self.strings)
+            self.strings.append(s)
+        return index
+
+    def _add(self, parent, last_child, values):
+        index = len(self.parent)
+        self.parent.append(parent)
+        self.first_child.append(-1)
+        self.next_sibling.append(-1)
+        last_child.append(-1)
+        if parent >= 0:
+            if last_child[parent] < 0:
+                self.first_child[parent] = index
+            else:
+                self.next_sibling[last_child[parent]] = index
+            last_child[parent] = index
+        self.role.append(self.intern(values.pop("AXRole", None)))
+        self.subrole.append(self.intern(values.pop("AXSubrole", None)))
+        frame = values.pop("AXFrame", _MISSING)
+        if isinstance(frame, Mapping) and all([k in frame for k in _FRAME_KEYS]):
+            self.x.append(frame["x"])
+            self.y.append(frame["y"])
+            self.w.append(frame["w"])
+            self.h.append(frame["h"])
+        else:
+            for column in (self.x, self.y, self.w, self.h):
+                column.append(math.nan)
+            if frame is not _MISSING:
+                values["AXFrame"] = frame
+        for name, value in values.items():
+            table = self.side_tables.get(name)
+            if table is None:
+                table = self.side_tables[name] = {}
+            table[index] = value
+        return index
+
+    def _build(self, root, fetch, max_nodes=None):
+        last_child = array("i")
+        # The indexes of the current node and its ancestors, by depth.
+        levels = []
+        for event in walk(root, fetch, max_nodes=max_nodes, paths=False):
+            del levels[event.depth :]
+            levels.append(
+                self._add(levels[-1] if levels else -1, last_child, event.attributes)
+            )
+        return self
+
+    @classmethod
+    def capture(cls, element, attributes, max_nodes=None):
+        """Captures the subtree of a live element, fetching AXRole, AXSubrole,
+        AXFrame, the given attributes and the children of each node in one
+        call. attributes may also be a FetchPlan, whose extra attributes for
+        a role are fetched in a second call. Attributes without a value are
+        left out of the side tables."""
+        if isinstance(attributes, FetchPlan):
+            plan = FetchPlan(
+                ["AXSubrole", "AXFrame"] + attributes.attributes,
+                attributes.roles,
+                attributes.rules,
+            )
+
+            def fetch(elem):
+                values = plan.fetch(elem, children=True)
+                children = values.pop("AXChildren", None) or []
+                return (
+                    dict([[k, _plain(v)] for k, v in values.items() if v is not None]),
+                    children,
+                )
+
+            return cls()._build(element, fetch, max_nodes)
+
+        wanted = ["AXRole", "AXSubrole", "AXFrame"]
+        wanted += [a for a in attributes if a not in wanted and a != "AXChildren"]
+        wanted.append("AXChildren")
+
+        def fetch(elem):
+            values = elem.get_multiple_attribute_values(*wanted)
+            children = values.pop("AXChildren", None) or []
+            return dict([[k, _plain(v)] for k, v in values.items()]), children
+
+        return cls()._build(element, fetch, max_nodes)
+
+    @classmethod
+    def from_dict(cls, tree):
+        """Compacts a tree snapshot, such as the nested dicts of `pyax tree
+        --json` or a loaded binary snapshot."""
+
+        def fetch(node):
+            values = dict(node)
+            return values, values.pop("AXChildren", None) or []
+
+        return cls()._build(tree, fetch)
+
+    def node(self, index):
+        return CompactNode(self, index)
+
+    @property
+    def root(self):
+        return CompactNode(self, 0)
+
+    def nbytes(self):
+        "Returns the size of the columns in bytes, not counting side tables."
+        columns = [self.parent, self.first_child, self.next_sibling]
+        columns += [self.role, self.subrole, self.x, self.y, self.w, self.h]
+        return sum([c.itemsize * len(c) for c in columns])
+
+
+class CompactNode(Mapping):
+    """A read-only view of one node in a CompactTree. It behaves like the
+    dicts of a JSON tree dump, including an "AXChildren" list of nodes."""
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def role(self):
+        return self.tree.strings[self.tree.role[self.index]]
+
+    @property
+    def subrole(self):
+        return self.tree.strings[self.tree.subrole[self.index]]
+
+    @property
+    def frame(self):
+        "The frame as a dict, or None."
+        tree = self.tree
+        x = tree.x[self.index]
+        if math.isnan(x):
+            return None
+        return {
+            "x": x,
+            "y": tree.y[self.index],
+            "w": tree.w[self.index],
+            "h": tree.h[self.index],
+        }
+
+    @property
+    def parent(self):
+        parent = self.tree.parent[self.index]
+        return None if parent < 0 else CompactNode(self.tree, parent)
+
+    @property
+    def children(self):
+        tree = self.tree
+        children = []
+        child = tree.first_child[self.index]
+        while child >= 0:
+            children.append(CompactNode(tree, child))
+            child = tree.next_sibling[child]
+        return children
+
+    def attributes(self):
+        "Returns the node's attributes, except for AXRole, as a dict."
+        obj = {}
+        if self.tree.subrole[self.index]:
+            obj["AXSubrole"] = self.subrole
+        frame = self.frame
+        if frame is not None:
+            obj["AXFrame"] = frame
+        for name, table in self.tree.side_tables.items():
+            if self.index in table:
+                obj[name] = table[self.index]
+        return obj
+
+    def __getitem__(self, key):
+        if key == "AXRole":
+            return self.role
+        if key == "AXChildren":
+            return self.children
+        if key == "AXSubrole" and self.tree.subrole[self.index]:
+            return self.subrole
+        if key == "AXFrame" and not math.isnan(self.tree.x[self.index]):
+            return self.frame
+        table = self.tree.side_tables.get(key)
+        if table is None or self.index not in table:
+            raise KeyError(key)
+        return table[self.index]
+
+    def __iter__(self):
+        yield "AXRole"
+        yield from self.attributes()
+        yield "AXChildren"
+
+    def __len__(self):
+        return len(self.attributes()) + 2
+
+    def __eq__(self, other):
+        if isinstance(other, CompactNode):
+            return self.tree is other.tree and self.index == other.index
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self):
+        return f"CompactNode({self.index}: {self.role})"
+
+    def to_dict(self):
+        "Materializes the subtree of this node as nested dicts."
+        obj = {"AXRole": self.role}
+        obj.update(self.attributes())
+        obj["AXChildren"] = [child.to_dict() for child in self.children]
+        return obj
+
+    def serializable(self):
+        return self.to_dict()
@@ -134,3 +134,42 @@ EVENTS = [
     "AXWindowMoved",
     "AXWindowResized",
 ]
+
+# AXError codes.
+kAXErrorSuccess = 0
+kAXErrorFailure = -25200
+kAXErrorIllegalArgument = -25201
+kAXErrorInvalidUIElement = -25202
+kAXErrorInvalidUIElementObserver = -25203
+kAXErrorCannotComplete = -25204
+kAXErrorAttributeUnsupported = -25205
+kAXErrorActionUnsupported = -25206
+kAXErrorNotificationUnsupported = -25207
+kAXErrorNotImplemented = -25208
+kAXErrorNotificationAlreadyRegistered = -25209
+kAXErrorNotificationNotRegistered = -25210
+kAXErrorAPIDisabled = -25211
+kAXErrorNoValue = -25212
+kAXErrorParameterizedAttributeUnsupported = -25213
+kAXErrorNotEnoughPrecision = -25214
+
+AX_ERRORS = {
+    kAXErrorSuccess: "kAXErrorSuccess",
+    kAXErrorFailure: "kAXErrorFailure",
+    kAXErrorIllegalArgument: "kAXErrorIllegalArgument",
+    kAXErrorInvalidUIElement: "kAXErrorInvalidUIElement",
+    kAXErrorInvalidUIElementObserver: "kAXErrorInvalidUIElementObserver",
+    kAXErrorCannotComplete: "kAXErrorCannotComplete",
+    kAXErrorAttributeUnsupported: "kAXErrorAttributeUnsupported",
+    kAXErrorActionUnsupported: "kAXErrorActionUnsupported",
+    kAXErrorNotificationUnsupported: "kAXErrorNotificationUnsupported",
+    kAXErrorNotImplemented: "kAXErrorNotImplemented",
+    kAXErrorNotificationAlreadyRegistered: "kAXErrorNotificationAlreadyRegistered",
+    kAXErrorNotificationNotRegistered: "kAXErrorNotificationNotRegistered",
+    kAXErrorAPIDisabled: "kAXErrorAPIDisabled",
+    kAXErrorNoValue: "kAXErrorNoValue",
+    kAXErrorParameterizedAttributeUnsupported: (
+        "kAXErrorParameterizedAttributeUnsupported"
+    ),
+    kAXErrorNotEnoughPrecision: "kAXErrorNotEnoughPrecision",
+}
@@ -0,0 +1,293 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# A long running daemon that keeps applications, elements and tree snapshots
+# warm, and answers queries over a Unix socket. The protocol is one JSON
+# object per line in each direction: a request {"op": ..., ...} is answered
+# with {"ok": true, "result": ...} or {"ok": false, "error": "..."}.
+
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from pyax import _cli
+from pyax._backend import get_backend
+from pyax._constants import kAXErrorInvalidUIElement
+from pyax._snapshot import select_nodes
+
+__all__ = ["Server", "DaemonError", "request", "is_running", "socket_path"]
+
+# Notifications that invalidate cached trees of an application.
+INVALIDATING_EVENTS = [
+    "AXCreated",
+    "AXUIElementDestroyed",
+    "AXValueChanged",
+    "AXTitleChanged",
+    "AXLayoutChanged",
+    "AXRowCountChanged",
+    "AXSelectedChildrenChanged",
+    "AXExpandedChanged",
+]
+
+
+class DaemonError(Exception):
+    "An error reported by the daemon while handling a request."
+
+
+def socket_path():
+    "Returns the path of the daemon socket, which PYAX_SOCKET can override."
+    if os.environ.get("PYAX_SOCKET"):
+        return os.environ["PYAX_SOCKET"]
+    directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(directory, f"pyax-{os.getuid()}.sock")
+
+
+def _connect(address=None, timeout=None):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address or socket_path())
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def _listening(address):
+    try:
+        _connect(address, 0.5).close()
+    except OSError:
+        return False
+    return True
+
+
+def is_running(address=None):
+    """Returns True if a daemon is listening on the socket, unless
+    PYAX_NO_DAEMON is set."""
+    if os.environ.get("PYAX_NO_DAEMON"):
+        return False
+    return _listening(address)
+
+
+def request(op, address=None, timeout=None, **args):
+    """Sends a request to the daemon listening on address, or the default
+    socket path, and returns its result."""
+    args["op"] = op
+    with _connect(address, timeout) as sock:
+        sock.sendall(json.dumps(args).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            response = json.loads(f.readline())
+    if not response["ok"]:
+        raise DaemonError(response["error"])
+    return response["result"]
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        for line in self.rfile:
+            try:
+                result = self.server.pyax.handle(json.loads(line))
+                response = {"ok": True, "result": result}
+            except (Exception, SystemExit) as e:
+                response = {"ok": False, "error": str(e) or type(e).__name__}
+            self.wfile.write(
+                json.dumps(response, default=_cli._default_json_encoder).encode()
+                + b"\n"
+            )
+            self.wfile.flush()
+
+
+class _ThreadingServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class Server(object):
+    """Serves tree, select and attribute queries over a Unix socket.
+    Applications are looked up with get_application, which defaults to
+    get_application_by_name. Cached snapshots are dropped when an observer
+    reports a change in their application, or after max_age seconds.
+    Each connection is handled on its own thread, so the run loop observers
+    are attached to can be given with cfrunloop. An application that quit
+    is looked up again by name on its next request."""
+
+    def __init__(
+        self, path=None, get_application=None, observe=True, max_age=30, cfrunloop=None
+    ):
+        self.path = path or socket_path()
+        self.get_application = get_application or _cli.get_application_by_name
+        self.observe = observe
+        self.cfrunloop = cfrunloop
+        self.max_age = max_age
+        self._apps = {}
+        self._observers = {}
+        self._elements = {}
+        self._snapshots = {}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _application(self, name):
+        with self._lock:
+            app = self._apps.get(name)
+        if app is not None:
+            err, _ = app._backend.attribute_value(app, "AXRole")
+            if err == kAXErrorInvalidUIElement:
+                # The application quit, and may have been started again with
+                # a new pid.
+                self.forget(app.pid)
+                app = None
+        if app is None:
+            app = self.get_application(name)
+            if not app:
+                raise LookupError(f"application '{name}' not found")
+            with self._lock:
+                self._apps[name] = app
+            if self.observe:
+                self._observe(app)
+        return app
+
+    def _observe(self, app):
+        pid = app.pid
+        with self._lock:
+            if pid in self._observers:
+                return
+            # Claimed here, since requests are handled concurrently.
+            self._observers[pid] = None
+        observer = _cli.create_observer(
+            pid, lambda *args: self.invalidate(pid), self.cfrunloop
+        )
+        observer.add_notifications(*INVALIDATING_EVENTS)
+        with self._lock:
+            self._observers[pid] = observer
+
+    def forget(self, pid):
+        "Drops an application, its observer and everything cached for it."
+        with self._lock:
+            for name, app in list(self._apps.items()):
+                if app.pid == pid:
+                    del self._apps[name]
+            observer = self._observers.pop(pid, None)
+        if observer is not None:
+            # Observers are created by _cli.create_observer() through the
+            # active backend.
+            get_backend().remove_observer(observer, self.cfrunloop)
+        self.invalidate(pid)
+
+    def invalidate(self, pid=None):
+        "Drops cached snapshots and elements, for one application or all."
+        with self._lock:
+            for cache in (self._snapshots, self._elements):
+                for key in list(cache):
+                    if pid is None or key[0] == pid:
+                        del cache[key]
+
+    def _target(self, app, web, dom_id):
+        key = (app.pid, "target", web, dom_id)
+        with self._lock:
+            element = self._elements.get(key)
+        if element is not None:
+            return element
+        element = app
+        if web or dom_id:
+            element = _cli.get_web_root(element)
+            if not element:
+                raise LookupError("no web area found")
+        if dom_id:
+            element = element.search_for(lambda e: e["AXDOMIdentifier"] == dom_id)
+            if not element:
+                raise LookupError(f"can't find '{dom_id}' DOM identifier in tree")
+        with self._lock:
+            self._elements[key] = element
+        return element
+
+    def _tree(self, app, web, dom_id, attributes, flags):
+        key = (app.pid, web, dom_id, tuple(attributes), tuple(flags))
+        with self._lock:
+            cached = self._snapshots.get(key)
+        if cached and time.monotonic() - cached[0] < self.max_age:
+            return cached[1]
+        snapshot = _cli._capture_tree(
+            self._target(app, web, dom_id), attributes, *flags
+        )
+        with self._lock:
+            self._snapshots[key] = (time.monotonic(), snapshot)
+        return snapshot
+
+    def handle(self, request):
+        "Handles a decoded request and returns its result."
+        op = request.get("op")
+        if op == "ping":
+            return "pong"
+        if op == "invalidate":
+            self.invalidate()
+            return None
+        app = self._application(request["app"])
+        web = request.get("web", False)
+        dom_id = request.get("dom_id")
+        attributes = request.get("attributes") or _cli.DEFAULT_ATTRIBUTES
+        if op == "tree":
+            flags = [
+                request.get("all_attributes", False),
+                request.get("list_attributes", False),
+                request.get("list_actions", False),
+            ]
+            return self._tree(app, web, dom_id, attributes, flags)
+        if op == "select":
+            match = request["match"]
+            wanted = sorted(set(attributes) | set(match))
+            tree = self._tree(app, web, dom_id, wanted, [False, False, False])
+            return [
+                {
+                    "path": list(path),
+                    "node": dict(
+                        [[k, v] for k, v in node.items() if k != "AXChildren"]
+                    ),
+                }
+                for path, node in select_nodes(tree, match, request.get("limit"))
+            ]
+        if op == "attribute":
+            element = self._target(app, web, dom_id)
+            for index in request.get("path", []):
+                element = element["AXChildren"][index]
+            return element.get_multiple_attribute_values(*attributes)
+        raise ValueError(f"unknown op '{op}'")
+
+    def serve_forever(self):
+        "Listens on the socket until shutdown() is called."
+        if os.path.exists(self.path):
+            if _listening(self.path):
+                raise RuntimeError(f"a daemon is already listening on {self.path}")
+            os.unlink(self.path)
+        self._server = _ThreadingServer(self.path, _Handler)
+        self._server.pyax = self
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+    def shutdown(self):
+        if self._server:
+            self._server.shutdown()
@@ -0,0 +1,229 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+from bisect import bisect_left
+
+__all__ = ["diff_trees", "load_tree", "node_key"]
+
+# Attributes that are expected to be unique and stable for the lifetime of
+# an element, in order of preference.
+IDENTITY_ATTRIBUTES = ["AXIdentifier", "AXDOMIdentifier"]
+
+
+def node_key(node, parent_key, role_index, use_identity=True):
+    """Returns the matching key of a snapshot node. Nodes with a stable
+    identifier are keyed by it, others by their role and position among
+    siblings of the same role, relative to their parent. parent_key is the
+    interned id of the parent's key, so keys stay flat however deep the
+    node is."""
+    role = node.get("AXRole")
+    if use_identity:
+        for attr in IDENTITY_ATTRIBUTES:
+            if node.get(attr):
+                return (attr, role, node[attr])
+    return (parent_key, role, role_index)
+
+
+def _path_string(index, k):
+    "Returns the role path of the node with key k, built from its ancestors."
+    steps = []
+    while k is not None:
+        entry = index[k]
+        steps.append(entry[2])
+        k = entry[1]
+    steps.reverse()
+    return "/".join([f"{role}[{i}]" for role, i in steps])
+
+
+def _index_tree(root, key, ids):
+    """Flattens a snapshot into a dict of key id to [node, parent key id,
+    (role, role index), child key ids], walking the tree iteratively. Keys
+    are interned to ints in ids, which is shared by the trees being
+    compared, so the same key has the same id in both."""
+    index = {}
+    stack = [(root, None, key(root, None, 0), (root.get("AXRole"), 0))]
+    while stack:
+        node, parent_key, k, step = stack.pop()
+        k = ids.setdefault(k, len(ids))
+        if k in index:
+            # Duplicate identifiers happen, keep them apart by occurrence.
+            n = 1
+            while ids.setdefault((k, n), len(ids)) in index:
+                n += 1
+            k = ids[(k, n)]
+        index[k] = [node, parent_key, step, []]
+        if parent_key is not None:
+            index[parent_key][3].append(k)
+        role_counts = {}
+        children = []
+        for child in node.get("AXChildren") or []:
+            role = child.get("AXRole")
+            role_index = role_counts.get(role, 0)
+            role_counts[role] = role_index + 1
+            children.append((child, k, key(child, k, role_index), (role, role_index)))
+        stack.extend(reversed(children))
+    return index
+
+
+def _attributes(node):
+    return dict([[k, v] for k, v in node.items() if k != "AXChildren"])
+
+
+def _stable_positions(sequence):
+    """Returns the set of items in a sequence of ints that are part of its
+    longest increasing subsequence."""
+    tails = []
+    tails_index = []
+    previous = [None] * len(sequence)
+    for i, value in enumerate(sequence):
+        pos = bisect_left(tails, value)
+        if pos == len(tails):
+            tails.append(value)
+            tails_index.append(i)
+        else:
+            tails[pos] = value
+            tails_index[pos] = i
+        previous[i] = tails_index[pos - 1] if pos else None
+    stable = set()
+    i = tails_index[-1] if tails_index else None
+    while i is not None:
+        stable.add(sequence[i])
+        i = previous[i]
+    return stable
+
+
+def diff_trees(old, new, key="auto"):
+    """Compares two tree snapshots, as produced by `pyax tree --json`, and
+    returns a list of changes. Each change is a dict with a "type" of
+    "insert", "delete", "move" or "change".
+
+    Nodes are matched by key, which may be "auto" (stable identifiers,
+    falling back to role path), "path" (role path only) or a callable
+    taking (node, parent_key, role_index) and returning a hashable key,
+    where parent_key is an int standing for the parent's key.
+    Raises ValueError for any other key."""
+    if key == "auto":
+        key = node_key
+    elif key == "path":
+
+        def key(node, parent_key, role_index):
+            return node_key(node, parent_key, role_index, False)
+
+    elif not callable(key):
+        raise ValueError(f"unknown key '{key}', expected 'auto' or 'path'")
+
+    ids = {}
+    old_index = _index_tree(old, key, ids)
+    new_index = _index_tree(new, key, ids)
+    changes = []
+
+    def old_path(k):
+        return _path_string(old_index, k)
+
+    def new_path(k):
+        return _path_string(new_index, k)
+
+    # Only the root of an inserted or deleted subtree is reported.
+    for k, (node, parent_key, _, _) in new_index.items():
+        if k not in old_index and (parent_key is None or parent_key in old_index):
+            changes.append(
+                {"type": "insert", "path": new_path(k), "node": _attributes(node)}
+            )
+
+    for k, (node, parent_key, _, _) in old_index.items():
+        if k not in new_index and (parent_key is None or parent_key in new_index):
+            changes.append(
+                {"type": "delete", "path": old_path(k), "node": _attributes(node)}
+            )
+
+    for k, (node, parent_key, _, child_keys) in new_index.items():
+        if k not in old_index:
+            continue
+        old_node, old_parent_key, _, old_child_keys = old_index[k]
+        if old_parent_key != parent_key:
+            changes.append({"type": "move", "from": old_path(k), "to": new_path(k)})
+        old_attrs = _attributes(old_node)
+        new_attrs = _attributes(node)
+        for attr in sorted(set(old_attrs) | set(new_attrs)):
+            if old_attrs.get(attr) != new_attrs.get(attr):
+                changes.append(
+                    {
+                        "type": "change",
+                        "path": new_path(k),
+                        "attribute": attr,
+                        "old": old_attrs.get(attr),
+                        "new": new_attrs.get(attr),
+                    }
+                )
+        # Children that stayed under this parent but changed their relative
+        # order. The longest run that kept its order is considered stable.
+        old_order = dict([[ck, i] for i, ck in enumerate(old_child_keys)])
+        kept = [
+            (old_order[ck], i)
+            for i, ck in enumerate(child_keys)
+            if ck in old_order and new_index[ck][1] == k
+        ]
+        stable = _stable_positions([old_i for old_i, _ in kept])
+        for old_i, new_i in kept:
+            if old_i not in stable:
+                ck = old_child_keys[old_i]
+                changes.append(
+                    {
+                        "type": "move",
+                        "from": old_path(ck),
+                        "to": new_path(ck),
+                        "from_index": old_i,
+                        "to_index": new_i,
+                    }
+                )
+
+    return changes
+
+
+def load_tree(fp):
+    """Loads a tree snapshot from a file object containing either a nested
+    JSON tree or NDJSON records with "id" and "parent" fields."""
+    text = fp.read()
+    first = text.lstrip().partition("\n")[0]
+    try:
+        record = json.loads(first)
+    except json.JSONDecodeError:
+        record = None
+    if not (isinstance(record, dict) and "id" in record and "parent" in record):
+        return json.loads(text)
+    nodes = {}
+    root = None
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        node_id = record.pop("id")
+        parent_id = record.pop("parent")
+        record.pop("depth", None)
+        record["AXChildren"] = []
+        nodes[node_id] = record
+        if parent_id is None:
+            root = record
+        else:
+            nodes[parent_id]["AXChildren"].append(record)
+    return root
@@ -0,0 +1,150 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Searching all applications at once. Each application is searched on its
+# own thread with a time budget, so the slowest application doesn't hold up
+# the others, and a hung one is given up on once its budget is spent.
+
+import queue
+import threading
+import time
+from pyax._backend import get_backend
+from pyax._walk import walk, attribute_fetcher
+
+__all__ = ["find_anywhere", "application_name"]
+
+_FINISHED = object()
+_TIMED_OUT = object()
+
+
+def _matcher(match):
+    # Returns the fetch function for walk() and a test of its events.
+    if callable(match):
+        return None, lambda event: match(event.element)
+    items = list(match.items())
+
+    def matches(event):
+        values = event.attributes
+        return all([values.get(k) == v for k, v in items])
+
+    return attribute_fetcher(list(match)), matches
+
+
+def _search(app, fetch, matches, deadline, stop, results):
+    status = _FINISHED
+    try:
+        for event in walk(app, fetch, paths=False):
+            if stop.is_set():
+                break
+            if time.monotonic() > deadline:
+                status = _TIMED_OUT
+                break
+            if matches(event):
+                results.put((app, event.element))
+    finally:
+        results.put((app, status))
+
+
+def application_name(app):
+    """Returns the name of an application element, or its pid as a string,
+    without asking the application, which may be hung."""
+    return app._backend.application_name(app.pid) or str(app.pid)
+
+
+def _applications(apps):
+    if apps is None:
+        return get_backend().applications()
+    rv = []
+    names = [app for app in apps if isinstance(app, str)]
+    if names:
+        found = set()
+        for app in get_backend().applications():
+            name = application_name(app)
+            if name in names:
+                found.add(name)
+                rv.append(app)
+        missing = [name for name in names if name not in found]
+        if missing:
+            raise LookupError(f"application '{missing[0]}' not found")
+    return rv + [app for app in apps if not isinstance(app, str)]
+
+
+def find_anywhere(
+    match, apps=None, limit=None, timeout=5.0, workers=8, on_timeout=None
+):
+    """Searches applications concurrently and yields (application, element)
+    for each element that matches, as they are found. match is a callable
+    given an element, or a dict of attribute values that must all be equal,
+    which are fetched in one call per element. apps is a list of
+    application elements or names, all applications by default; a name
+    that matches no application raises LookupError.
+
+    Up to workers applications are searched at once, each for at most
+    timeout seconds. An application that is still busy after that,
+    possibly hung in an AX call, is left behind and on_timeout(app) is
+    called. Searches stop once limit matches are found."""
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    fetch, matches = _matcher(match)
+    pending = list(_applications(apps))
+    pending.reverse()
+    results = queue.Queue()
+    stop = threading.Event()
+    # Deadlines of the applications being searched.
+    running = {}
+    found = 0
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                app = pending.pop()
+                deadline = time.monotonic() + timeout
+                running[app] = deadline
+                threading.Thread(
+                    target=_search,
+                    args=(app, fetch, matches, deadline, stop, results),
+                    daemon=True,
+                ).start()
+            wait = min(running.values()) - time.monotonic()
+            try:
+                app, element = results.get(timeout=max(wait, 0))
+            except queue.Empty:
+                now = time.monotonic()
+                for app, deadline in list(running.items()):
+                    if deadline <= now:
+                        del running[app]
+                        if on_timeout:
+                            on_timeout(app)
+                continue
+            if app not in running:
+                # Late results of an application that timed out.
+                continue
+            if element is _FINISHED or element is _TIMED_OUT:
+                del running[app]
+                if element is _TIMED_OUT and on_timeout:
+                    on_timeout(app)
+                continue
+            yield app, element
+            found += 1
+            if limit and found >= limit:
+                return
+    finally:
+        stop.set()
@@ -25,8 +25,36 @@ from PyQt6 import QtGui, QtCore
 from PyQt6 import QtWidgets
 from PyQt6.QtWidgets import QMainWindow
 
+# Above this many highlights, clear() repaints the whole overlay instead of
+# invalidating each highlight's bounds.
+_CLEAR_REGION_LIMIT = 64
+
+
+class _Overlay(QtWidgets.QWidget):
+    "Paints the retained highlights that intersect the region being repainted."
+
+    def __init__(self, highlights):
+        QtWidgets.QWidget.__init__(self)
+        self.highlights = highlights
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+
+    def paintEvent(self, event):
+        region = event.region()
+        painter = QtGui.QPainter(self)
+        for bounds, rect, brush, pen in self.highlights.values():
+            if region.intersects(bounds):
+                painter.setBrush(brush)
+                painter.setPen(pen)
+                painter.drawRect(rect)
+        painter.end()
+
 
 class Highlighter(QMainWindow):
+    """A transparent full screen window that highlights screen rectangles.
+    Highlights are retained: add_rect() returns a handle that can be moved
+    or removed later, and each change only repaints the area it touched.
+    Changes made in one pass of the event loop are painted together."""
+
     app = None
 
     def __init__(self, mouse_move_callback=None, click_callback=None):
@@ -56,12 +84,11 @@ class Highlighter(QMainWindow):
             self.setMouseTracking(True)
 
         self.offset = 0
-        self.label = QtWidgets.QLabel()
-        self.label.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents)
-        canvas = QtGui.QPixmap(QtGui.QGuiApplication.primaryScreen().availableSize())
-        canvas.fill(QtCore.Qt.GlobalColor.transparent)
-        self.label.setPixmap(canvas)
-        self.setCentralWidget(self.label)
+        self._highlights = {}
+        self._styles = {}
+        self._next_handle = 0
+        self.overlay = _Overlay(self._highlights)
+        self.setCentralWidget(self.overlay)
         self.showMaximized()
 
     def mouseMoveEvent(self, event):
@@ -74,11 +101,6 @@ class Highlighter(QMainWindow):
             pos = event.globalPosition()
             self.click_callback(pos.x(), pos.y())
 
-    def clear(self):
-        canvas = self.label.pixmap()
-        canvas.fill(QtCore.Qt.GlobalColor.transparent)
-        self.label.setPixmap(canvas)
-
     def _normalize_alpha(self, colorstring):
         if colorstring.startswith("#") and len(colorstring) == 9:
             # QT expects an alpha color hex value in the format of #aarrggbb,
@@ -86,29 +108,83 @@ class Highlighter(QMainWindow):
             return "#" + colorstring[-2:] + colorstring[1:-2]
         return colorstring
 
-    def draw_rect(
-        self, rect, fill="#00000000", stroke="#EB5160", stroke_width=1, flip_y=False
-    ):
-        if not rect:
-            return
-        canvas = self.label.pixmap()
-        # canvas.fill(QtCore.Qt.GlobalColor.transparent)
-        painter = QtGui.QPainter(canvas)
-        brush = QtGui.QBrush()
-        brush.setColor(QtGui.QColor(self._normalize_alpha(fill)))
-        brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
-        painter.setBrush(brush)
-        if not stroke_width:
-            stroke = "#00000000"
-        pen = QtGui.QPen()
-        pen.setWidth(stroke_width)
-        pen.setColor(QtGui.QColor(self._normalize_alpha(stroke)))
-        painter.setPen(pen)
+    def _style(self, fill, stroke, stroke_width):
+        key = (fill, stroke, stroke_width)
+        style = self._styles.get(key)
+        if style is None:
+            brush = QtGui.QBrush()
+            brush.setColor(QtGui.QColor(self._normalize_alpha(fill)))
+            brush.setStyle(QtCore.Qt.BrushStyle.SolidPattern)
+            if not stroke_width:
+                stroke = "#00000000"
+            pen = QtGui.QPen()
+            pen.setWidth(stroke_width)
+            pen.setColor(QtGui.QColor(self._normalize_alpha(stroke)))
+            style = self._styles[key] = (brush, pen)
+        return style
+
+    def _to_local(self, rect, flip_y):
         y = (
             rect["y"] - self.y()
             if not flip_y
             else QtGui.QGuiApplication.primaryScreen().size().height() - rect["y"]
         )
-        painter.drawRect(rect["x"] - self.x(), y, rect["w"], rect["h"])
-        painter.end()
-        self.label.setPixmap(canvas)
+        return QtCore.QRectF(rect["x"] - self.x(), y, rect["w"], rect["h"])
+
+    def _set(self, handle, rect, brush, pen):
+        # The pen straddles the edge of the rectangle, so grow the bounds
+        # by its width to repaint all of it.
+        width = max(pen.width(), 1)
+        bounds = rect.toAlignedRect().adjusted(-width, -width, width, width)
+        self._highlights[handle] = (bounds, rect, brush, pen)
+        self.overlay.update(bounds)
+
+    def add_rect(
+        self, rect, fill="#00000000", stroke="#EB5160", stroke_width=1, flip_y=False
+    ):
+        "Adds a highlight and returns its handle, or None if rect is empty."
+        if not rect:
+            return None
+        handle = self._next_handle
+        self._next_handle += 1
+        self._set(
+            handle,
+            self._to_local(rect, flip_y),
+            *self._style(fill, stroke, stroke_width),
+        )
+        return handle
+
+    def add_rects(
+        self, rects, fill="#00000000", stroke="#EB5160", stroke_width=1, flip_y=False
+    ):
+        "Adds a highlight for each rect, and returns a list of their handles."
+        return [
+            self.add_rect(rect, fill, stroke, stroke_width, flip_y) for rect in rects
+        ]
+
+    def move_rect(self, handle, rect, flip_y=False):
+        "Moves an existing highlight to rect, keeping its style."
+        bounds, _, brush, pen = self._highlights[handle]
+        self.overlay.update(bounds)
+        self._set(handle, self._to_local(rect, flip_y), brush, pen)
+
+    def remove_rect(self, handle):
+        "Removes a highlight."
+        entry = self._highlights.pop(handle, None)
+        if entry:
+            self.overlay.update(entry[0])
+
+    def clear(self):
+        "Removes all highlights."
+        if len(self._highlights) > _CLEAR_REGION_LIMIT:
+            self.overlay.update()
+        else:
+            for bounds, _, _, _ in self._highlights.values():
+                self.overlay.update(bounds)
+        self._highlights.clear()
+
+    def draw_rect(
+        self, rect, fill="#00000000", stroke="#EB5160", stroke_width=1, flip_y=False
+    ):
+        "Adds a highlight, see add_rect()."
+        return self.add_rect(rect, fill, stroke, stroke_width, flip_y)
@@ -0,0 +1,230 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Watches how quickly applications answer accessibility calls. An application
+# answers AX calls on its main thread, so the round trip of a cheap call is a
+# good measure of how janky that thread is. Each application is probed on its
+# own thread, so a hung one doesn't delay the probes of the others.
+
+import collections
+import threading
+import time
+import traceback
+from pyax._bench import percentile
+from pyax._constants import kAXErrorCannotComplete
+from pyax._find import application_name
+
+__all__ = ["ResponsivenessMonitor", "PROBE_STATS"]
+
+# The statistics kept for each application, which thresholds can be set on.
+PROBE_STATS = [
+    "last_ms",
+    "p50_ms",
+    "p90_ms",
+    "p99_ms",
+    "max_ms",
+    "timeouts",
+    "errors",
+]
+
+
+class _Probed(object):
+    def __init__(self, app, name, window):
+        self.app = app
+        self.name = name
+        self.probes = 0
+        self.total_timeouts = 0
+        # (seconds, err, timed out) of the most recent probes.
+        self.samples = collections.deque(maxlen=window)
+        # Whether each threshold is currently crossed.
+        self.crossed = {}
+        self.stop = None
+
+
+class ResponsivenessMonitor(object):
+    """Probes applications every interval seconds with a single AXRole
+    fetch on their application element, and keeps the latency of the last
+    window probes of each. A probe that takes longer than timeout seconds,
+    which is also the messaging timeout of the element, counts as a
+    timeout. The probe is one of the cheapest calls an application can
+    answer, so the default interval of a second costs it next to nothing.
+
+    add_threshold() registers callbacks for when a statistic crosses a
+    limit. They are called from the probing threads.
+
+    >>> monitor = ResponsivenessMonitor(interval=0.5)
+    >>> monitor.add_threshold("p90_ms", 100, lambda *args: print(*args))
+    >>> monitor.watch(pyax.get_application_by_name("Safari"))
+    >>> monitor.start()"""
+
+    def __init__(self, interval=1.0, timeout=1.0, window=60, backend=None):
+        if interval <= 0 or timeout <= 0:
+            raise ValueError("interval and timeout must be positive")
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.interval = interval
+        self.timeout = timeout
+        self.window = window
+        self.backend = backend
+        self._apps = {}
+        self._thresholds = []
+        self._lock = threading.Lock()
+        self._running = False
+
+    def watch(self, app, name=None):
+        "Starts monitoring an application element. Returns its pid."
+        pid = app.pid
+        with self._lock:
+            if pid in self._apps:
+                return pid
+            if name is None:
+                # Not AXTitle, which a hung application wouldn't answer.
+                name = application_name(app)
+            probed = _Probed(app, name, self.window)
+            self._apps[pid] = probed
+            if self._running:
+                self._start(probed)
+        return pid
+
+    def forget(self, pid):
+        "Stops monitoring the application with pid."
+        with self._lock:
+            probed = self._apps.pop(pid, None)
+        if probed and probed.stop:
+            probed.stop.set()
+
+    def add_threshold(self, stat, limit, callback):
+        """Calls callback(pid, stat, value, crossed) when stat, one of
+        PROBE_STATS, of an application rises above limit (crossed is True)
+        and when it falls back to limit or below (crossed is False)."""
+        if stat not in PROBE_STATS:
+            raise ValueError(f"unknown statistic '{stat}'")
+        try:
+            limit = float(limit)
+        except (TypeError, ValueError):
+            raise ValueError(f"limit of '{stat}' must be a number, not {limit!r}")
+        self._thresholds.append((stat, limit, callback))
+
+    def _start(self, probed):
+        # A fresh event, in case the thread of a previous start() is still
+        # waiting on a probe.
+        probed.stop = threading.Event()
+        threading.Thread(
+            target=self._run, args=(probed, probed.stop), daemon=True
+        ).start()
+
+    def _run(self, probed, stop):
+        backend = self.backend or probed.app._backend
+        element = None
+        while not stop.is_set():
+            start = time.monotonic()
+            try:
+                if element is None:
+                    # A separate element, so the messaging timeout doesn't
+                    # change how long other calls to the application wait.
+                    element = backend.application(probed.app.pid) or probed.app
+                    backend.set_messaging_timeout(element, self.timeout)
+                self._probe(probed, backend, element)
+            except Exception:
+                # A failing probe or threshold callback is reported, but
+                # doesn't end the monitoring of the application.
+                traceback.print_exc()
+            stop.wait(max(self.interval - (time.monotonic() - start), 0))
+
+    def _probe(self, probed, backend, element):
+        start = time.perf_counter()
+        err, _ = backend.attribute_value(element, "AXRole")
+        seconds = time.perf_counter() - start
+        timed_out = err == kAXErrorCannotComplete or seconds >= self.timeout
+        with self._lock:
+            probed.probes += 1
+            probed.total_timeouts += timed_out
+            probed.samples.append((seconds, err, timed_out))
+        if self._thresholds:
+            self._check(probed)
+
+    def _check(self, probed):
+        stats = self._stats(probed)
+        for index, (stat, limit, callback) in enumerate(self._thresholds):
+            value = stats[stat]
+            crossed = value > limit
+            if crossed != probed.crossed.get(index, False):
+                probed.crossed[index] = crossed
+                callback(stats["pid"], stat, value, crossed)
+
+    def _stats(self, probed):
+        with self._lock:
+            samples = list(probed.samples)
+            probes = probed.probes
+            total_timeouts = probed.total_timeouts
+        # Probes that failed quickly, e.g. because the application quit,
+        # say nothing about its latency.
+        latencies = [s for s, err, timed_out in samples if timed_out or not err]
+        return {
+            "pid": probed.app.pid,
+            "name": probed.name,
+            "probes": probes,
+            "samples": len(latencies),
+            "last_ms": samples[-1][0] * 1000 if samples else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p90_ms": percentile(latencies, 90) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": max(latencies) * 1000 if latencies else 0.0,
+            "timeouts": len([s for s in samples if s[2]]),
+            "errors": len([s for s in samples if s[1] and not s[2]]),
+            "total_timeouts": total_timeouts,
+        }
+
+    def stats(self, pid=None):
+        """Returns the statistics of the application with pid, or a list of
+        those of all monitored applications. Percentiles, timeouts and errors
+        are over the last window probes."""
+        if pid is not None:
+            return self._stats(self._apps[pid])
+        with self._lock:
+            apps = list(self._apps.values())
+        return [self._stats(probed) for probed in apps]
+
+    def start(self):
+        "Starts probing the monitored applications in the background."
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            for probed in self._apps.values():
+                self._start(probed)
+
+    def stop(self):
+        "Stops probing. Statistics are kept."
+        with self._lock:
+            self._running = False
+            apps = list(self._apps.values())
+        for probed in apps:
+            if probed.stop:
+                probed.stop.set()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
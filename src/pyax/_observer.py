@@ -20,31 +20,38 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-from ApplicationServices import (
-    AXObserverAddNotification,
-    AXObserverCreateWithInfoCallback,
-    AXObserverGetRunLoopSource,
-    AXObserverRemoveNotification,
-    AXObserverRef,
-    AXUIElementCreateApplication,
-)
-from objc import callbackFor
-from Quartz import (
-    CFFileDescriptorCreate,
-    CFFileDescriptorCreateRunLoopSource,
-    CFFileDescriptorEnableCallBacks,
-    CFRunLoopAddSource,
-    CFRunLoopGetCurrent,
-    CFRunLoopRun,
-    CFRunLoopStop,
-    kCFFileDescriptorReadCallBack,
-    kCFRunLoopCommonModes,
-    kCFRunLoopDefaultMode,
-)
+try:
+    from ApplicationServices import (
+        AXObserverAddNotification,
+        AXObserverRemoveNotification,
+        AXObserverRef,
+        AXUIElementCreateApplication,
+    )
+    from Quartz import (
+        CFAbsoluteTimeGetCurrent,
+        CFFileDescriptorCreate,
+        CFFileDescriptorCreateRunLoopSource,
+        CFFileDescriptorEnableCallBacks,
+        CFRunLoopAddSource,
+        CFRunLoopAddTimer,
+        CFRunLoopGetCurrent,
+        CFRunLoopRun,
+        CFRunLoopStop,
+        CFRunLoopTimerCreate,
+        CFRunLoopTimerInvalidate,
+        kCFFileDescriptorReadCallBack,
+        kCFRunLoopCommonModes,
+        kCFRunLoopDefaultMode,
+    )
+except ImportError:
+    # pyobjc is only available on macOS.
+    AXObserverRef = None
+
 import os
 import fcntl
 import re
 import sys
+from pyax._backend import get_backend
 
 try:
     from PyQt6.QtWidgets import QApplication
@@ -53,7 +60,7 @@ except ImportError:
 else:
     app = QApplication(sys.argv)
 
-__all__ = ["start", "stop"]
+__all__ = ["start", "stop", "create_observer", "create_timer", "cancel_timer"]
 
 _SIGNAL_HANDLERS_ATTACHED = False
 
@@ -104,25 +111,27 @@ def start():
 def create_observer(pid, callback, cfrunloop=None):
     """Create an observer for the given PID using the given callback for notifications.
     If a specific CFRunLoop needs to be attached to, it can be provided."""
+    return get_backend().create_observer(pid, callback, cfrunloop)
+
 
-    def _create_callback(callback):
-        @callbackFor(AXObserverCreateWithInfoCallback)
-        def cb(observer, element, notificationName, info, ptr):
-            callback(observer, element, notificationName, info)
+def create_timer(interval, callback, cfrunloop=None):
+    """Create a timer that calls callback every interval seconds while the
+    event loop runs. The returned timer must be kept alive, and can be
+    stopped with cancel_timer()."""
 
-        return cb
+    def cb(timer, info):
+        callback()
 
-    err, observer = AXObserverCreateWithInfoCallback(
-        pid, _create_callback(callback), None
+    timer = CFRunLoopTimerCreate(
+        None, CFAbsoluteTimeGetCurrent() + interval, interval, 0, 0, cb, None
     )
-    source = AXObserverGetRunLoopSource(observer)
+    CFRunLoopAddTimer(cfrunloop or CFRunLoopGetCurrent(), timer, kCFRunLoopCommonModes)
+    return timer
 
-    if cfrunloop:
-        CFRunLoopAddSource(cfrunloop, source, kCFRunLoopCommonModes)
-    else:
-        CFRunLoopAddSource(CFRunLoopGetCurrent(), source, kCFRunLoopCommonModes)
 
-    return observer
+def cancel_timer(timer):
+    "Stop a timer created with create_timer."
+    CFRunLoopTimerInvalidate(timer)
 
 
 class AXObserverMixin(object):
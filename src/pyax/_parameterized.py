@@ -0,0 +1,129 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Batched parameterized attribute queries, like the strings or bounds of many
+# text ranges. Every query is its own IPC call, so batches are split into
+# chunks that a bounded pool of threads runs concurrently.
+
+from concurrent.futures import ThreadPoolExecutor
+from pyax._constants import kAXErrorIllegalArgument
+
+__all__ = [
+    "RANGE_ATTRIBUTES",
+    "TEXT_MARKER_RANGE_ATTRIBUTES",
+    "make_parameter",
+    "parameterized_attribute_values",
+]
+
+# Parameterized attributes that take a character range. Their parameter may
+# be given as a (location, length) tuple.
+RANGE_ATTRIBUTES = set(
+    [
+        "AXAttributedStringForRange",
+        "AXBoundsForRange",
+        "AXRTFForRange",
+        "AXStringForRange",
+    ]
+)
+
+# Parameterized attributes that take a text marker range. Their parameter
+# may be given as a (start, end) tuple of text markers.
+TEXT_MARKER_RANGE_ATTRIBUTES = set(
+    [
+        "AXAttributedStringForTextMarkerRange",
+        "AXBoundsForTextMarkerRange",
+        "AXLengthForTextMarkerRange",
+        "AXStringForTextMarkerRange",
+    ]
+)
+
+_INVALID = object()
+
+
+def make_parameter(backend, attribute, parameter):
+    """Returns the parameter to pass for attribute, building ranges given
+    as tuples."""
+    if type(parameter) is tuple and len(parameter) == 2:
+        if attribute in RANGE_ATTRIBUTES:
+            return backend.range_parameter(*parameter)
+        if attribute in TEXT_MARKER_RANGE_ATTRIBUTES:
+            return backend.text_marker_range_parameter(*parameter)
+    return parameter
+
+
+def _parameters(backend, queries):
+    # Ranges repeat across attributes, like the string and bounds of the
+    # same word, so each one is only built once.
+    built = {}
+    rv = []
+    for attribute, parameter in queries:
+        if type(parameter) is not tuple:
+            rv.append(parameter)
+            continue
+        if attribute in RANGE_ATTRIBUTES:
+            key = (False, parameter)
+        elif attribute in TEXT_MARKER_RANGE_ATTRIBUTES:
+            key = (True, parameter)
+        else:
+            rv.append(parameter)
+            continue
+        try:
+            if key not in built:
+                built[key] = make_parameter(backend, attribute, parameter)
+            rv.append(built[key])
+        except Exception:
+            rv.append(_INVALID)
+    return rv
+
+
+def parameterized_attribute_values(element, queries, workers=4, chunk_size=32):
+    """Returns the values of parameterized attributes of element for a list
+    of (attribute, parameter) queries, in order, as a list of (err, value)
+    tuples where err is an AXError code and 0 is success. A failed query
+    doesn't fail the batch. Queries are run chunk_size at a time by up to
+    workers threads."""
+    queries = list(queries)
+    backend = element._backend
+    parameters = _parameters(backend, queries)
+    results = [None] * len(queries)
+
+    def run(start):
+        for i in range(start, min(start + chunk_size, len(queries))):
+            result = (kAXErrorIllegalArgument, None)
+            if parameters[i] is not _INVALID:
+                try:
+                    result = backend.parameterized_attribute_value(
+                        element, queries[i][0], parameters[i]
+                    )
+                except Exception:
+                    pass
+            results[i] = result
+
+    chunks = range(0, len(queries), chunk_size)
+    if workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(min(workers, len(chunks))) as executor:
+            for future in [executor.submit(run, start) for start in chunks]:
+                future.result()
+    else:
+        for start in chunks:
+            run(start)
+    return results
@@ -0,0 +1,154 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Fetch plans. Different roles need different attributes, like AXURL of links
+# or the indexes of cells, so a plan fetches a base set of attributes with
+# AXRole in one call, and the extra attributes for that role in a second one.
+
+import json
+
+__all__ = ["FetchPlan", "ROLE_ATTRIBUTES"]
+
+# Extra attributes worth fetching for common roles.
+ROLE_ATTRIBUTES = {
+    "AXCell": ["AXRowIndexRange", "AXColumnIndexRange"],
+    "AXCheckBox": ["AXValue"],
+    "AXImage": ["AXDescription", "AXURL"],
+    "AXLink": ["AXURL", "AXVisited"],
+    "AXRow": ["AXIndex", "AXDisclosureLevel", "AXDisclosing"],
+    "AXTextField": ["AXValue", "AXPlaceholderValue"],
+    "AXWebArea": ["AXURL", "AXLoaded", "AXLoadingProgress", "AXElementBusy"],
+}
+
+
+def _attribute_list(attributes):
+    """Returns attributes as a list. A single attribute name becomes a list
+    of one, rather than a list of its characters."""
+    if isinstance(attributes, str):
+        return [attributes]
+    attributes = list(attributes)
+    for attribute in attributes:
+        if not isinstance(attribute, str):
+            raise TypeError(f"attribute names are strings, not {attribute!r}")
+    return attributes
+
+
+class FetchPlan(object):
+    """Maps roles, and rules matching other values, to the attributes to
+    fetch for an element, on top of the base attributes. Rules are
+    (match, attributes) pairs, where match is a dict of attribute values
+    that must all be equal, or a callable given the base values. Attributes
+    matched on are fetched with the base ones.
+
+    >>> plan = FetchPlan(["AXTitle"], {"AXLink": ["AXURL"]})
+    >>> plan.add(lambda values: values.get("AXSubrole") == "AXTabButton", ["AXValue"])
+    """
+
+    def __init__(self, attributes, roles=None, rules=None):
+        self.attributes = list(dict.fromkeys(_attribute_list(attributes)))
+        self.roles = {}
+        for role, extra in (roles or {}).items():
+            self.roles[role] = list(dict.fromkeys(_attribute_list(extra)))
+        self.rules = []
+        for match, extra in rules or []:
+            self.add(match, extra)
+        self._update()
+
+    def _update(self):
+        wanted = ["AXRole"] + self.attributes
+        for match, extra in self.rules:
+            if isinstance(match, dict):
+                wanted += list(match)
+        self._wanted = list(dict.fromkeys(wanted))
+
+    def add(self, match, attributes):
+        """Adds extra attributes for a role name, or for elements matching a
+        dict of values or a callable."""
+        attributes = _attribute_list(attributes)
+        if isinstance(match, str):
+            self.roles.setdefault(match, [])
+            self.roles[match] = list(dict.fromkeys(self.roles[match] + attributes))
+        else:
+            self.rules.append((match, attributes))
+            self._update()
+
+    def extra(self, values):
+        "Returns the extra attributes to fetch for an element's base values."
+        extra = list(self.roles.get(values.get("AXRole"), []))
+        for match, attributes in self.rules:
+            if isinstance(match, dict):
+                matched = all([values.get(k) == v for k, v in match.items()])
+            else:
+                matched = match(values)
+            if matched:
+                extra += attributes
+        return [a for a in dict.fromkeys(extra) if a not in self._wanted]
+
+    def fetch(self, element, children=False):
+        """Returns the values of element's base attributes, AXRole and its
+        extra attributes, fetched in at most two calls. Base attributes
+        without a value are None; extra ones are left out. AXChildren is
+        fetched with the base attributes when children is True."""
+        wanted = (self._wanted + ["AXChildren"]) if children else self._wanted
+        values = element.get_multiple_attribute_values(*wanted) or {}
+        extra = self.extra(values)
+        if extra:
+            values.update(element.get_multiple_attribute_values(*extra) or {})
+        for attribute in wanted:
+            values.setdefault(attribute, None)
+        return values
+
+    def to_dict(self):
+        """Returns the plan in the format of load(). Rules with callables
+        can't be saved and are left out."""
+        return {
+            "attributes": self.attributes,
+            "roles": self.roles,
+            "rules": [
+                {"match": match, "attributes": attributes}
+                for match, attributes in self.rules
+                if isinstance(match, dict)
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data, attributes=None):
+        """Creates a plan from a dict like {"attributes": [...], "roles":
+        {role: [...]}, "rules": [{"match": {...}, "attributes": [...]}]}.
+        attributes is used when the dict has no base attributes. A single
+        attribute name may stand in for a list of one. Raises TypeError if
+        data isn't shaped like that."""
+        if not isinstance(data, dict):
+            raise TypeError(f"a fetch plan is a JSON object, not {type(data).__name__}")
+        if not isinstance(data.get("roles") or {}, dict):
+            raise TypeError("'roles' of a fetch plan must map roles to attributes")
+        return cls(
+            data.get("attributes") or attributes or [],
+            data.get("roles"),
+            [(rule["match"], rule["attributes"]) for rule in data.get("rules", [])],
+        )
+
+    @classmethod
+    def load(cls, path, attributes=None):
+        "Loads a plan from a JSON file, see from_dict()."
+        with open(path) as f:
+            return cls.from_dict(json.load(f), attributes)
@@ -0,0 +1,214 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+import os
+import threading
+import time
+from pyax._backend import get_backend
+from pyax._constants import AX_ERRORS
+
+__all__ = ["Profiler", "PROFILED_CALLS"]
+
+# The backend calls that are counted and timed, and the AX calls they are
+# reported as.
+PROFILED_CALLS = {
+    "attribute_names": "AXUIElementCopyAttributeNames",
+    "attribute_value": "AXUIElementCopyAttributeValue",
+    "multiple_attribute_values": "AXUIElementCopyMultipleAttributeValues",
+    "parameterized_attribute_names": "AXUIElementCopyParameterizedAttributeNames",
+    "parameterized_attribute_value": "AXUIElementCopyParameterizedAttributeValue",
+    "is_attribute_settable": "AXUIElementIsAttributeSettable",
+    "set_attribute_value": "AXUIElementSetAttributeValue",
+    "action_names": "AXUIElementCopyActionNames",
+    "action_description": "AXUIElementCopyActionDescription",
+    "perform_action": "AXUIElementPerformAction",
+    "element_at_position": "AXUIElementCopyElementAtPosition",
+}
+
+_GROUPS = {"call": 0, "attribute": 1, "role": 2, "error": 3}
+
+
+def _error_name(err):
+    return AX_ERRORS.get(err, str(err))
+
+
+class Profiler(object):
+    """Counts and times the AX calls of a backend, the active one by default,
+    while active. Calls are aggregated by call, attribute (or action), role
+    of the element and error code. Individual calls are also kept for export
+    unless keep_events is False. Roles are remembered for up to max_roles
+    elements at a time.
+
+    >>> with Profiler() as profiler:
+    ...     app.search_for(lambda e: e["AXRole"] == "AXWebArea")
+    >>> print(profiler.report())"""
+
+    def __init__(self, keep_events=True, backend=None, max_roles=4096):
+        self.keep_events = keep_events
+        self.backend = backend
+        self.max_roles = max_roles
+        self.stats = {}
+        self.events = []
+        self._roles = {}
+        self._wrapped = None
+        self._lock = threading.Lock()
+
+    def _role_of(self, element):
+        try:
+            return self._roles.get(element, "?")
+        except TypeError:
+            return "?"
+
+    def _remember_roles(self, name, args, result):
+        if not isinstance(result, tuple) or result[0] != 0:
+            return
+        if name == "AXUIElementCopyAttributeValue" and args[1] == "AXRole":
+            role = result[1]
+        elif name == "AXUIElementCopyMultipleAttributeValues":
+            role = result[1].get("AXRole")
+        else:
+            return
+        if not isinstance(role, str):
+            return
+        with self._lock:
+            if len(self._roles) >= self.max_roles:
+                # Elements are only kept for recent calls, so a long session
+                # doesn't hold on to every element it saw.
+                self._roles.clear()
+            try:
+                self._roles[args[0]] = role
+            except TypeError:
+                pass
+
+    def _wrap(self, name, func):
+        def wrapper(*args):
+            start = time.perf_counter_ns()
+            result = func(*args)
+            duration = time.perf_counter_ns() - start
+            err = result[0] if isinstance(result, tuple) else result
+            self._remember_roles(name, args, result)
+            detail = args[1] if len(args) > 1 else None
+            if isinstance(detail, (list, tuple)):
+                detail = ",".join(detail)
+            elif not isinstance(detail, str):
+                detail = None
+            self.record(name, detail, self._role_of(args[0]), err, start, duration)
+            return result
+
+        return wrapper
+
+    def record(self, call, attribute, role, err, start, duration):
+        "Records a single call. Times are in nanoseconds."
+        key = (call, attribute, role, _error_name(err))
+        with self._lock:
+            entry = self.stats.get(key)
+            if entry is None:
+                self.stats[key] = [1, duration, duration]
+            else:
+                entry[0] += 1
+                entry[1] += duration
+                entry[2] = max(entry[2], duration)
+            if self.keep_events:
+                self.events.append((key, start, duration, threading.get_ident()))
+
+    def start(self):
+        "Starts profiling AX calls."
+        if self._wrapped is not None:
+            return
+        self._wrapped = self.backend or get_backend()
+        for method, name in PROFILED_CALLS.items():
+            # Shadow the method on the instance; deleting it restores it.
+            func = getattr(self._wrapped, method)
+            setattr(self._wrapped, method, self._wrap(name, func))
+
+    def stop(self):
+        "Stops profiling and restores the original AX calls."
+        if self._wrapped is None:
+            return
+        for method in PROFILED_CALLS:
+            self._wrapped.__dict__.pop(method, None)
+        self._wrapped = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def top(self, by="attribute", limit=10):
+        """Returns the costliest groups of calls as a list of
+        (group, count, total seconds, max seconds), where by is one of
+        "call", "attribute", "role" or "error"."""
+        index = _GROUPS[by]
+        groups = {}
+        with self._lock:
+            for key, (count, total, longest) in self.stats.items():
+                entry = groups.setdefault(key[index], [0, 0, 0])
+                entry[0] += count
+                entry[1] += total
+                entry[2] = max(entry[2], longest)
+        ordered = sorted(groups.items(), key=lambda x: x[1][1], reverse=True)
+        return [
+            (group, count, total / 1e9, longest / 1e9)
+            for group, (count, total, longest) in ordered[:limit]
+        ]
+
+    def report(self, limit=10):
+        "Returns a human readable summary of the top offenders."
+        total_calls = sum([entry[0] for entry in self.stats.values()])
+        total_time = sum([entry[1] for entry in self.stats.values()]) / 1e9
+        lines = [f"{total_calls} AX calls in {total_time * 1000:.1f} ms"]
+        for by in _GROUPS:
+            lines.append("")
+            header = f"By {by}"
+            lines.append(
+                f"{header:<44} {'calls':>8} {'total ms':>10} "
+                f"{'mean ms':>9} {'max ms':>9}"
+            )
+            for group, count, total, longest in self.top(by, limit):
+                lines.append(
+                    f"{str(group)[:44]:<44} {count:>8} {total * 1000:>10.2f} "
+                    f"{total * 1000 / count:>9.3f} {longest * 1000:>9.3f}"
+                )
+        return "\n".join(lines)
+
+    def export_chrome_trace(self, fp):
+        """Writes the recorded calls in the Chrome trace event format, which
+        can be loaded in Perfetto, chrome://tracing or speedscope."""
+        pid = os.getpid()
+        events = []
+        for (call, attribute, role, err), start, duration, tid in self.events:
+            events.append(
+                {
+                    "name": f"{call}({attribute})" if attribute else call,
+                    "cat": "ax",
+                    "ph": "X",
+                    "ts": start / 1000,
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"attribute": attribute, "role": role, "error": err},
+                }
+            )
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, fp)
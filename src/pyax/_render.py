@@ -0,0 +1,115 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+import sys
+from rich.json import JSON
+from ._stream import default_json_encoder
+
+__all__ = ["RichRenderer", "PlainRenderer"]
+
+_ANSI = {
+    "bold": "\x1b[1m",
+    "italic": "\x1b[3m",
+    "red": "\x1b[31m",
+    "bold red": "\x1b[1;31m",
+}
+_ANSI_RESET = "\x1b[0m"
+
+
+class RichRenderer(object):
+    "Renders lines through a rich console, with markup and highlighting."
+
+    def __init__(self, console):
+        self.console = console
+
+    def element(self, role, obj, indent=0, role_style="bold red", label=None):
+        attr_string = " ".join(
+            [f"[italic]{k}[/italic]={repr(v)}" for k, v in obj.items() if k != "AXRole"]
+        )
+        line = f"{indent * ' '}[{role_style}]{role}[/{role_style}] {attr_string}"
+        if label is not None:
+            line = f"[bold]{label}[/bold] {line}"
+        self.console.print(line)
+
+    def json(self, data):
+        self.console.print(JSON.from_data(data, default=default_json_encoder))
+
+    def line(self, text=""):
+        self.console.print(text)
+
+    def flush(self):
+        pass
+
+
+class PlainRenderer(object):
+    """Renders preformatted lines through a single buffered writer.
+    Styles are emitted as ANSI escapes when color is on (the default when
+    out is a TTY), and skipped entirely otherwise."""
+
+    def __init__(self, out=None, color=None, flush_lines=512):
+        self.out = out or sys.stdout
+        self.color = self.out.isatty() if color is None else color
+        self.flush_lines = flush_lines
+        self._lines = []
+
+    def _style(self, text, style):
+        if not self.color:
+            return text
+        return f"{_ANSI[style]}{text}{_ANSI_RESET}"
+
+    def format_element(self, role, obj, indent=0, role_style="bold red", label=None):
+        "Returns the line element() would render."
+        parts = [indent * " " + self._style(role, role_style)]
+        if self.color:
+            italic = _ANSI["italic"]
+            parts.extend(
+                [
+                    f"{italic}{k}{_ANSI_RESET}={repr(v)}"
+                    for k, v in obj.items()
+                    if k != "AXRole"
+                ]
+            )
+        else:
+            parts.extend([f"{k}={repr(v)}" for k, v in obj.items() if k != "AXRole"])
+        line = " ".join(parts)
+        if label is not None:
+            line = f"{self._style(label, 'bold')} {line}"
+        return line
+
+    def element(self, role, obj, indent=0, role_style="bold red", label=None):
+        self.line(self.format_element(role, obj, indent, role_style, label))
+
+    def json(self, data):
+        self.line(json.dumps(data, indent=2, default=default_json_encoder))
+
+    def line(self, text=""):
+        self._lines.append(text)
+        if len(self._lines) >= self.flush_lines:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self._lines.append("")
+            self.out.write("\n".join(self._lines))
+            self._lines = []
+        self.out.flush()
@@ -0,0 +1,149 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Bulk attribute writes, like filling in a form. Settability is checked once
+# per element and attribute, writes to an application run on a bounded number
+# of threads, and written values can be verified with one read per element.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pyax._constants import AX_ERRORS, kAXErrorAttributeUnsupported
+
+__all__ = ["BulkSetter", "set_attribute_values"]
+
+
+class BulkSetter(object):
+    """Sets many attributes at once. Writes are grouped by element and run
+    on up to workers threads, with no more than per_app of them writing to
+    the same application. Settability is remembered per element and
+    attribute across calls, up to max_cached entries; errors other than
+    kAXErrorAttributeUnsupported are not remembered, since they may be
+    transient."""
+
+    def __init__(self, workers=8, per_app=4, max_cached=65536):
+        self.workers = workers
+        self.per_app = per_app
+        self.max_cached = max_cached
+        self._settable = {}
+        self._lanes = {}
+        self._lock = threading.Lock()
+
+    def _check(self, element, attribute):
+        # Returns the (err, settable) of the attribute.
+        key = (element, attribute)
+        result = self._settable.get(key)
+        if result is None:
+            result = element._backend.is_attribute_settable(element, attribute)
+            if result[0] not in (0, kAXErrorAttributeUnsupported):
+                # Not a definitive answer, e.g. the application timed out.
+                return result
+            with self._lock:
+                if len(self._settable) >= self.max_cached:
+                    self._settable.clear()
+                self._settable[key] = result
+        return result
+
+    def settable(self, element, attribute):
+        "Returns whether attribute of element is settable, from the cache."
+        err, settable = self._check(element, attribute)
+        return not err and settable
+
+    def _lane(self, pid):
+        with self._lock:
+            lane = self._lanes.get(pid)
+            if lane is None:
+                lane = self._lanes[pid] = threading.Semaphore(self.per_app)
+        return lane
+
+    def _write(self, element, entries, verify):
+        with self._lane(element.pid):
+            for entry in entries:
+                err, settable = self._check(element, entry["attribute"])
+                if err or not settable:
+                    # A read-only attribute is not an error.
+                    entry["status"] = "not settable"
+                    entry["error"] = AX_ERRORS.get(err, str(err)) if err else None
+                    continue
+                err = element._backend.set_attribute_value(
+                    element, entry["attribute"], entry["value"]
+                )
+                entry["status"] = "failed" if err else "ok"
+                entry["error"] = AX_ERRORS.get(err, str(err)) if err else None
+            written = [entry for entry in entries if entry["status"] == "ok"]
+            if not verify or not written:
+                return
+            # Only the last write to an attribute can be read back.
+            last = dict([[entry["attribute"], entry] for entry in written])
+            for entry in written:
+                if last[entry["attribute"]] is not entry:
+                    entry["status"] = "superseded"
+            written = list(last.values())
+            attributes = list(last)
+            err, values = element._backend.multiple_attribute_values(
+                element, attributes
+            )
+            for entry in written:
+                entry["actual"] = values.get(entry["attribute"])
+                if err:
+                    entry["status"] = "unverified"
+                    entry["error"] = AX_ERRORS.get(err, str(err))
+                elif entry["actual"] != entry["value"]:
+                    entry["status"] = "mismatch"
+
+    def set(self, writes, verify=False):
+        """Performs (element, attribute, value) writes, in order for each
+        element, and returns a report with a dict per write, in order, with
+        the "element", "attribute", "value", its "status" ("ok",
+        "not settable", "failed", or with verify "mismatch", "unverified"
+        or "superseded" when a later write set the same attribute), the
+        AXError name as "error" (None for a read-only attribute), and with
+        verify the value read back as "actual"."""
+        report = []
+        groups = {}
+        for element, attribute, value in writes:
+            entry = {
+                "element": element,
+                "attribute": attribute,
+                "value": value,
+                "status": None,
+                "error": None,
+            }
+            report.append(entry)
+            groups.setdefault(element, []).append(entry)
+        if self.workers > 1 and len(groups) > 1:
+            with ThreadPoolExecutor(min(self.workers, len(groups))) as executor:
+                futures = [
+                    executor.submit(self._write, element, entries, verify)
+                    for element, entries in groups.items()
+                ]
+                for future in futures:
+                    future.result()
+        else:
+            for element, entries in groups.items():
+                self._write(element, entries, verify)
+        return report
+
+
+def set_attribute_values(writes, verify=False, workers=8, per_app=4):
+    """Performs many (element, attribute, value) writes and returns a report
+    with a status per write, see BulkSetter.set()."""
+    return BulkSetter(workers, per_app).set(writes, verify)
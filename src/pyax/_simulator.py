@@ -0,0 +1,296 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+# Support for the iOS Simulator, whose app content is exposed under a group
+# with the iOSContentGroup subrole, and whose elements carry an AXTraits
+# bitmask instead of roles.
+
+from collections import deque
+from pyax._walk import walk
+from pyax._uielement import describe_element
+
+__all__ = [
+    "TRAITS",
+    "decode_traits",
+    "encode_traits",
+    "find_content_root",
+    "SimulatorNode",
+    "SimulatorTree",
+]
+
+# Trait names by bit, AXTraitNone being no bits set.
+TRAITS = [
+    # "AXTraitNone",
+    "AXTraitButton",
+    "AXTraitLink",
+    "AXTraitImage",
+    "AXTraitSelected",
+    "AXTraitPlaysSound",
+    "AXTraitKeyboardKey",
+    "AXTraitStaticText",
+    "AXTraitSummaryElement",
+    "AXTraitNotEnabled",
+    "AXTraitUpdatesFrequently",
+    "AXTraitSearchField",
+    "AXTraitStartsMediaSession",
+    "AXTraitAdjustable",
+    "AXTraitAllowsDirectInteraction",
+    "AXTraitCausesPageTurn",
+    "AXTraitTabBar",
+    "AXTraitHeader",
+    "AXTraitWebContent",
+    "AXTraitTextEntry",
+    "AXTraitPickerElement",
+    "AXTraitRadioButton",
+    "AXTraitIsEditing",
+    "AXTraitLaunchIcon",
+    "AXTraitStatusBarElement",
+    "AXTraitSecureTextField",
+    "AXTraitInactive",
+    "AXTraitFooter",
+    "AXTraitBackButton",
+    "AXTraitTabButton",
+    "AXTraitAutoCorrectCandidate",
+    "AXTraitDeleteKey",
+    "AXTraitSelectionDismissesItem",
+    "AXTraitVisited",
+    "AXTraitScrollable",
+    "AXTraitSpacer",
+    "AXTraitTableIndex",
+    "AXTraitMap",
+    "AXTraitTextOperationsAvailable",
+    "AXTraitDraggable",
+    "AXTraitGesturePracticeRegion",
+    "AXTraitPopupButton",
+    "AXTraitAllowsNativeSliding",
+    "AXTraitMathEquation",
+    "AXTraitContainedByTable",
+    "AXTraitContainedByList",
+    "AXTraitTouchContainer",
+    "AXTraitSupportsZoom",
+    "AXTraitTextArea",
+    "AXTraitBookContent",
+    "AXTraitContainedByLandmark",
+    "AXTraitFolderIcon",
+    "AXTraitReadOnly",
+    "AXTraitMenuItem",
+    "AXTraitToggle",
+    "AXTraitIgnoreItemChooser",
+    "AXTraitSupportsTrackingDetail",
+    "AXTraitAlert",
+    "AXTraitContainedByFieldset",
+    "AXTraitAllowsLayoutChangeInStatusBar",
+]
+
+TRAIT_BITS = dict([[name, 1 << i] for i, name in enumerate(TRAITS)])
+
+# For each byte of a trait mask, the trait names of every possible value of
+# that byte, so a mask decodes in a handful of lookups.
+_BYTE_TABLES = [
+    [
+        tuple(
+            [
+                TRAITS[k * 8 + b]
+                for b in range(8)
+                if v & (1 << b) and k * 8 + b < len(TRAITS)
+            ]
+        )
+        for v in range(256)
+    ]
+    for k in range((len(TRAITS) + 7) // 8)
+]
+
+_decoded = {}
+
+# Attributes fetched together for every simulator element.
+NODE_ATTRIBUTES = [
+    "AXRole",
+    "AXTitle",
+    "AXDescription",
+    "AXValue",
+    "AXTraits",
+    "AXChildren",
+]
+
+
+def decode_traits(traits):
+    "Returns the tuple of trait names set in a trait mask."
+    names = _decoded.get(traits)
+    if names is None:
+        names = ()
+        mask = traits or 0
+        for table in _BYTE_TABLES:
+            if not mask:
+                break
+            names += table[mask & 0xFF]
+            mask >>= 8
+        if len(_decoded) < 65536:
+            _decoded[traits] = names
+    return names
+
+
+def encode_traits(*names):
+    "Returns the trait mask with the named traits set."
+    mask = 0
+    for name in names:
+        mask |= TRAIT_BITS[name]
+    return mask
+
+
+def find_content_root(app, max_depth=8):
+    """Returns the iOSContentGroup element of a Simulator application, or
+    None. The content group sits a few levels down in a window, so the tree
+    is searched breadth first, skipping the menu bar, with one call per
+    element for its subrole and children."""
+    pending = deque([(app, 0)])
+    while pending:
+        element, depth = pending.popleft()
+        values = element.get_multiple_attribute_values(
+            "AXRole", "AXSubrole", "AXChildren"
+        )
+        if values.get("AXSubrole") == "iOSContentGroup":
+            return element
+        if depth < max_depth and values.get("AXRole") != "AXMenuBar":
+            pending.extend(
+                [(child, depth + 1) for child in values.get("AXChildren") or []]
+            )
+    return None
+
+
+def _fetch(element):
+    values = element.get_multiple_attribute_values(*NODE_ATTRIBUTES) or {}
+    return values, values.get("AXChildren") or []
+
+
+class SimulatorNode(object):
+    "A captured simulator element."
+
+    __slots__ = (
+        "element",
+        "depth",
+        "parent",
+        "role",
+        "title",
+        "description",
+        "value",
+        "traits",
+    )
+
+    def __init__(self, element, depth, parent, role, title, description, value, traits):
+        self.element = element
+        self.depth = depth
+        self.parent = parent
+        self.role = role
+        self.title = title
+        self.description = description
+        self.value = value
+        self.traits = traits or 0
+
+    @property
+    def trait_names(self):
+        return decode_traits(self.traits)
+
+    def __repr__(self):
+        return f"SimulatorNode({self.description!r}: {','.join(self.trait_names) or 'AXTraitNone'})"
+
+
+class SimulatorTree(object):
+    """Captures the content of a Simulator in one walk, fetching role, title,
+    description, value, traits and children of each element in a single
+    call, and indexes the nodes by trait so queries need no further AX
+    calls."""
+
+    def __init__(self, root):
+        self.root = root
+        self.nodes = []
+        self.index = dict([[name, []] for name in TRAITS])
+        # The positions of the current node and its ancestors, by depth.
+        levels = []
+        for event in walk(root, _fetch, paths=False):
+            values = event.attributes
+            del levels[event.depth :]
+            node = SimulatorNode(
+                event.element,
+                event.depth,
+                levels[-1] if levels else -1,
+                values.get("AXRole"),
+                values.get("AXTitle"),
+                values.get("AXDescription"),
+                values.get("AXValue"),
+                values.get("AXTraits"),
+            )
+            position = len(self.nodes)
+            self.nodes.append(node)
+            levels.append(position)
+            for name in node.trait_names:
+                self.index[name].append(position)
+
+    @classmethod
+    def from_application(cls, app):
+        "Captures the content of a Simulator application."
+        root = find_content_root(app)
+        if root is None:
+            raise LookupError("no iOSContentGroup found")
+        return cls(root)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def with_traits(self, *traits, without=()):
+        """Returns the nodes, in document order, that have all of traits and
+        none of the traits in without. For example all disabled buttons:
+        tree.with_traits("AXTraitButton", "AXTraitNotEnabled")"""
+        has = encode_traits(*traits)
+        lacks = encode_traits(*without)
+        if traits:
+            candidates = min([self.index[name] for name in traits], key=len)
+        else:
+            candidates = range(len(self.nodes))
+        nodes = self.nodes
+        return [
+            nodes[i]
+            for i in candidates
+            if nodes[i].traits & has == has and not nodes[i].traits & lacks
+        ]
+
+    def dump(self, out):
+        """Writes an indented text dump of the tree to out, a line per node
+        with the element as repr() shows it and its description, value and
+        traits."""
+        for node in self.nodes:
+            entries = []
+            if node.description:
+                entries.append(f"AXDescription={node.description!r}")
+            if node.value:
+                entries.append(f"AXValue={node.value!r}")
+            if node.traits:
+                entries.append(f"AXTraits=[{','.join(node.trait_names)}]")
+            element = describe_element(
+                {
+                    "AXRole": node.role,
+                    "AXTitle": node.title,
+                    "AXDescription": node.description,
+                    "AXValue": node.value,
+                }
+            )
+            out.write(f"{node.depth * ' '} {element} {', '.join(entries)}\n")
@@ -0,0 +1,412 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# A compact binary snapshot format for accessibility trees.
+#
+# All integers are little-endian and every section starts on an 8 byte
+# boundary, so each can be viewed in place from an mmap:
+#
+#   header     MAGIC, version and the section sizes (see _HEADER)
+#   strings    u32 offsets[string_count + 1], then the UTF-8 blob. Roles,
+#              attribute names and string values are interned here.
+#   nodes      six columns of node_count u32/i32 values: parent (-1 for
+#              the root), first child, child count, role string, first
+#              value and value count. Nodes are stored breadth first, so the
+#              children of a node are contiguous.
+#   values     value_count records of (name u32, type u32, payload 8 bytes).
+#              The payload is an int, a float, a string index or an offset
+#              into the geometry table, depending on the type.
+#   geometry   f64 values for frames, points, sizes and ranges.
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from pyax._walk import walk
+
+__all__ = [
+    "MAGIC",
+    "Snapshot",
+    "SnapshotNode",
+    "save_snapshot",
+    "load_snapshot",
+    "is_snapshot_file",
+    "select_nodes",
+]
+
+MAGIC = b"PYAXSNP1"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sIIIIII")
+_INT_RECORD = struct.Struct("<IIq")
+_FLOAT_RECORD = struct.Struct("<IId")
+
+_NO_STRING = 0xFFFFFFFF
+
+_NONE, _BOOL, _INT, _FLOAT, _STRING, _RECT, _POINT, _SIZE, _RANGE, _JSON = range(10)
+
+# Keys of the dicts AXValue types serialize to, with their value type.
+_GEOMETRY = {
+    ("h", "w", "x", "y"): (_RECT, ("x", "y", "w", "h")),
+    ("x", "y"): (_POINT, ("x", "y")),
+    ("h", "w"): (_SIZE, ("w", "h")),
+    ("length", "location"): (_RANGE, ("location", "length")),
+}
+_GEOMETRY_KEYS = dict([[v[0], v[1]] for v in _GEOMETRY.values()])
+
+_NODE_COLUMNS = ["parent", "first_child", "child_count", "role", "first_value"]
+
+
+def _pad(n):
+    return (8 - n % 8) % 8
+
+
+def _little_endian(arr):
+    if sys.byteorder == "big":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+class _Writer(object):
+    def __init__(self):
+        self.strings = {}
+        self.string_list = []
+        self.records = bytearray()
+        self.value_count = 0
+        self.geometry = array("d")
+
+    def intern(self, s):
+        index = self.strings.get(s)
+        if index is None:
+            index = self.strings[s] = len(self.string_list)
+            self.string_list.append(s)
+        return index
+
+    def add_value(self, name, value):
+        name = self.intern(name)
+        self.value_count += 1
+        kind = _JSON
+        payload = 0
+        if value is None:
+            kind = _NONE
+        elif isinstance(value, bool):
+            kind, payload = _BOOL, int(value)
+        elif isinstance(value, int) and -(2**63) <= value < 2**63:
+            kind, payload = _INT, value
+        elif isinstance(value, float):
+            self.records += _FLOAT_RECORD.pack(name, _FLOAT, value)
+            return
+        elif isinstance(value, str):
+            kind, payload = _STRING, self.intern(value)
+        elif isinstance(value, dict) and tuple(sorted(value)) in _GEOMETRY:
+            kind, keys = _GEOMETRY[tuple(sorted(value))]
+            payload = len(self.geometry)
+            self.geometry.extend([float(value[k]) for k in keys])
+        if kind == _JSON:
+            payload = self.intern(json.dumps(value, default=repr))
+        self.records += _INT_RECORD.pack(name, kind, payload)
+
+
+def save_snapshot(tree, fp):
+    """Writes a tree snapshot, a nested dict as produced by `pyax tree
+    --json`, to a binary file object."""
+    writer = _Writer()
+    columns = dict([[name, array("I")] for name in _NODE_COLUMNS])
+    columns["parent"] = array("i")
+    value_counts = array("I")
+    order = [tree]
+    columns["parent"].append(-1)
+    i = 0
+    while i < len(order):
+        node = order[i]
+        children = node.get("AXChildren") or []
+        columns["first_child"].append(len(order))
+        columns["child_count"].append(len(children))
+        role = node.get("AXRole")
+        columns["role"].append(_NO_STRING if role is None else writer.intern(role))
+        columns["first_value"].append(writer.value_count)
+        count = 0
+        for name, value in node.items():
+            if name not in ("AXRole", "AXChildren"):
+                writer.add_value(name, value)
+                count += 1
+        value_counts.append(count)
+        for child in children:
+            order.append(child)
+            columns["parent"].append(i)
+        i += 1
+
+    encoded = [s.encode() for s in writer.string_list]
+    offsets = array("I", [0])
+    for s in encoded:
+        offsets.append(offsets[-1] + len(s))
+    blob = b"".join(encoded)
+
+    fp.write(
+        _HEADER.pack(
+            MAGIC,
+            VERSION,
+            len(order),
+            len(encoded),
+            len(blob),
+            writer.value_count,
+            len(writer.geometry),
+        )
+    )
+    sections = [_little_endian(offsets), blob]
+    sections += [_little_endian(columns[name]) for name in _NODE_COLUMNS]
+    sections += [_little_endian(value_counts), bytes(writer.records)]
+    sections += [_little_endian(writer.geometry)]
+    fp.write(b"\0" * _pad(_HEADER.size))
+    for section in sections:
+        fp.write(section)
+        fp.write(b"\0" * _pad(len(section)))
+
+
+class Snapshot(object):
+    """A tree snapshot read lazily from a buffer, typically an mmap of a
+    snapshot file. Columns are memoryviews into the buffer, nothing is
+    decoded until a node's attributes are accessed."""
+
+    def __init__(self, buffer, close=None):
+        self._buffer = buffer
+        self._close = close
+        (
+            magic,
+            version,
+            self.node_count,
+            string_count,
+            blob_size,
+            value_count,
+            geometry_count,
+        ) = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a pyax snapshot")
+        view = memoryview(buffer)
+        self._views = [view]
+        position = _HEADER.size + _pad(_HEADER.size)
+
+        def section(size, typecode=None):
+            nonlocal position
+            data = view[position : position + size]
+            position += size + _pad(size)
+            self._views.append(data)
+            if typecode is None:
+                return data
+            return _column(data, typecode)
+
+        def _column(data, typecode):
+            if sys.byteorder == "big":
+                arr = array(typecode, bytes(data))
+                arr.byteswap()
+                return arr
+            column = data.cast(typecode)
+            self._views.append(column)
+            return column
+
+        n = self.node_count
+        self._string_offsets = section((string_count + 1) * 4, "I")
+        self._blob = section(blob_size)
+        self.parent = section(n * 4, "i")
+        self.first_child = section(n * 4, "I")
+        self.child_count = section(n * 4, "I")
+        self.roles = section(n * 4, "I")
+        self.first_value = section(n * 4, "I")
+        self.value_count = section(n * 4, "I")
+        # Each 16 byte value record is viewed as 4 u32s for its name and
+        # type, and as 2 int64s or float64s for its payload.
+        records = section(value_count * 16)
+        self._names_types = _column(records, "I")
+        self._int_payloads = _column(records, "q")
+        self._float_payloads = _column(records, "d")
+        self._geometry = section(geometry_count * 8, "d")
+        self._strings = {}
+
+    @classmethod
+    def open(cls, path):
+        "Maps a snapshot file into memory."
+        f = open(path, "rb")
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        f.close()
+        return cls(mapped, mapped.close)
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._close:
+            self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self.node_count
+
+    def string(self, index):
+        "Returns an interned string by its index."
+        s = self._strings.get(index)
+        if s is None:
+            start = self._string_offsets[index]
+            end = self._string_offsets[index + 1]
+            s = self._strings[index] = str(self._blob[start:end], "utf-8")
+        return s
+
+    def role(self, index):
+        role = self.roles[index]
+        return None if role == _NO_STRING else self.string(role)
+
+    def value(self, record):
+        "Decodes the value record at the given index as (name, value)."
+        name = self.string(self._names_types[record * 4])
+        kind = self._names_types[record * 4 + 1]
+        if kind == _NONE:
+            return name, None
+        if kind == _BOOL:
+            return name, bool(self._int_payloads[record * 2 + 1])
+        if kind == _INT:
+            return name, self._int_payloads[record * 2 + 1]
+        if kind == _FLOAT:
+            return name, self._float_payloads[record * 2 + 1]
+        payload = self._int_payloads[record * 2 + 1]
+        if kind == _STRING:
+            return name, self.string(payload)
+        if kind == _JSON:
+            return name, json.loads(self.string(payload))
+        keys = _GEOMETRY_KEYS[kind]
+        values = self._geometry[payload : payload + len(keys)]
+        if kind == _RANGE:
+            values = [int(v) for v in values]
+        return name, dict(zip(keys, values))
+
+    def node(self, index):
+        return SnapshotNode(self, index)
+
+    @property
+    def root(self):
+        return SnapshotNode(self, 0)
+
+
+class SnapshotNode(Mapping):
+    """A read-only view of one node in a snapshot. It behaves like the dicts
+    of a JSON tree dump, including an "AXChildren" list of child nodes."""
+
+    __slots__ = ("snapshot", "index")
+
+    def __init__(self, snapshot, index):
+        self.snapshot = snapshot
+        self.index = index
+
+    @property
+    def role(self):
+        return self.snapshot.role(self.index)
+
+    @property
+    def parent(self):
+        parent = self.snapshot.parent[self.index]
+        return None if parent < 0 else SnapshotNode(self.snapshot, parent)
+
+    @property
+    def children(self):
+        first = self.snapshot.first_child[self.index]
+        count = self.snapshot.child_count[self.index]
+        return [SnapshotNode(self.snapshot, i) for i in range(first, first + count)]
+
+    def attributes(self):
+        "Returns the node's attributes, except for AXRole, as a dict."
+        first = self.snapshot.first_value[self.index]
+        count = self.snapshot.value_count[self.index]
+        return dict([self.snapshot.value(i) for i in range(first, first + count)])
+
+    def __getitem__(self, key):
+        if key == "AXRole":
+            return self.role
+        if key == "AXChildren":
+            return self.children
+        snapshot = self.snapshot
+        first = snapshot.first_value[self.index]
+        for i in range(first, first + snapshot.value_count[self.index]):
+            if snapshot.string(snapshot._names_types[i * 4]) == key:
+                return snapshot.value(i)[1]
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield "AXRole"
+        yield from self.attributes()
+        yield "AXChildren"
+
+    def __len__(self):
+        return self.snapshot.value_count[self.index] + 2
+
+    def __eq__(self, other):
+        if isinstance(other, SnapshotNode):
+            return self.snapshot is other.snapshot and self.index == other.index
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self):
+        return hash((id(self.snapshot), self.index))
+
+    def __repr__(self):
+        return f"SnapshotNode({self.index}: {self.role})"
+
+    def to_dict(self):
+        "Materializes the subtree of this node as nested dicts."
+        obj = {"AXRole": self.role}
+        obj.update(self.attributes())
+        obj["AXChildren"] = [child.to_dict() for child in self.children]
+        return obj
+
+    def serializable(self):
+        return self.to_dict()
+
+
+def load_snapshot(path):
+    "Opens a snapshot file and returns its root node."
+    return Snapshot.open(path).root
+
+
+def is_snapshot_file(path):
+    "Returns True if the file at path starts with the snapshot magic."
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def select_nodes(node, match, limit=None):
+    """Returns (path, node) pairs for the nodes in a tree snapshot whose
+    attributes equal those in match, in document order. The path is the
+    tuple of child indices from the given node."""
+    found = []
+    for event in walk(node):
+        if all([event.attributes.get(k) == v for k, v in match.items()]):
+            found.append((event.path, event.element))
+            if limit and len(found) >= limit:
+                break
+    return found
@@ -0,0 +1,210 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import json
+import queue
+import threading
+import time
+from pyax._walk import walk, EXIT
+
+__all__ = [
+    "default_json_encoder",
+    "plain_values",
+    "stream_json",
+    "stream_ndjson",
+    "NDJSONWriter",
+]
+
+# How many nodes to write between explicit flushes of the output stream.
+FLUSH_INTERVAL = 256
+
+
+def default_json_encoder(obj):
+    try:
+        return obj.serializable()
+    except Exception:
+        return repr(obj)
+
+
+_PLAIN_TYPES = (str, int, float, bool, type(None))
+
+
+def plain_values(obj):
+    """Returns obj with everything JSON can't encode converted the way
+    default_json_encoder() does it, so that encoding it later makes no AX
+    calls, which may be on another thread or after the element is gone."""
+    if isinstance(obj, _PLAIN_TYPES):
+        return obj
+    if isinstance(obj, dict):
+        return dict([[str(k), plain_values(v)] for k, v in obj.items()])
+    if isinstance(obj, (list, tuple)):
+        return [plain_values(v) for v in obj]
+    value = default_json_encoder(obj)
+    if isinstance(value, _PLAIN_TYPES):
+        return value
+    return plain_values(value)
+
+
+def _dumps(obj):
+    return json.dumps(obj, default=default_json_encoder)
+
+
+def _node_dict(element, element_to_dict):
+    obj = element_to_dict(element)
+    obj.pop("AXChildren", None)
+    return obj
+
+
+def _walk_nodes(element, element_to_dict, children, exits=False):
+    def fetch(elem):
+        return _node_dict(elem, element_to_dict), children(elem)
+
+    return walk(element, fetch, exits=exits, paths=False)
+
+
+def stream_json(
+    element, element_to_dict, out, flush_interval=FLUSH_INTERVAL, children=iter
+):
+    """Write the subtree of element as one nested JSON document.
+    Nodes are encoded and written as the tree is walked, so memory use is
+    bound by the depth of the tree and not its size. Children of a node are
+    found with the children callable, which iterates over an element."""
+    count = 0
+    last = None
+    for event in _walk_nodes(element, element_to_dict, children, exits=True):
+        if event.kind == EXIT:
+            out.write("]}")
+        else:
+            if last == EXIT:
+                # A sibling was closed before this node.
+                out.write(", ")
+            body = _dumps(event.attributes)
+            out.write(body[:-1])
+            out.write(', "AXChildren": [' if body != "{}" else '"AXChildren": [')
+            count += 1
+            if count % flush_interval == 0:
+                out.flush()
+        last = event.kind
+    out.write("\n")
+    out.flush()
+
+
+def stream_ndjson(
+    element, element_to_dict, out, flush_interval=FLUSH_INTERVAL, children=iter
+):
+    """Write the subtree of element as newline delimited JSON, one record per
+    node in document order. Each record carries an "id", the "parent" id
+    (None for the root) and its "depth" in addition to the node's attributes."""
+    count = 0
+    # The ids of the ancestors of the current node, by depth.
+    ids = []
+    for event in _walk_nodes(element, element_to_dict, children):
+        depth = event.depth
+        del ids[depth:]
+        record = {"id": count, "parent": ids[-1] if ids else None, "depth": depth}
+        record.update(event.attributes)
+        out.write(_dumps(record))
+        out.write("\n")
+        ids.append(count)
+        count += 1
+        if count % flush_interval == 0:
+            out.flush()
+    out.flush()
+
+
+_CLOSE = object()
+
+
+class NDJSONWriter(object):
+    """Writes records to out as newline delimited JSON from a background
+    thread, so that callers never wait on a slow reader. Output is flushed
+    every flush_count records or flush_interval seconds, whichever comes
+    first. When more than max_pending records are waiting, new records are
+    dropped and a {"dropped": n} record is written in their place once the
+    writer catches up."""
+
+    def __init__(
+        self, out, flush_count=FLUSH_INTERVAL, flush_interval=1.0, max_pending=65536
+    ):
+        self.out = out
+        self.flush_count = flush_count
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self._unreported = 0
+        self._queue = queue.Queue(max_pending)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, record):
+        "Queues record for writing. Returns False if it was dropped."
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._unreported += 1
+            return False
+        return True
+
+    def _report_drops(self):
+        with self._lock:
+            dropped, self._unreported = self._unreported, 0
+        if dropped:
+            self.out.write(_dumps({"timestamp": time.time(), "dropped": dropped}))
+            self.out.write("\n")
+
+    def _run(self):
+        pending = 0
+        deadline = None
+        while True:
+            timeout = None
+            if deadline is not None:
+                timeout = max(deadline - time.monotonic(), 0)
+            try:
+                record = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                record = None
+            if record is _CLOSE:
+                self._report_drops()
+                self.out.flush()
+                return
+            if record is not None:
+                self._report_drops()
+                self.out.write(_dumps(record))
+                self.out.write("\n")
+                self.written += 1
+                pending += 1
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if pending >= self.flush_count or (
+                deadline is not None and time.monotonic() >= deadline
+            ):
+                self.out.flush()
+                pending = 0
+                deadline = None
+
+    def close(self):
+        "Writes out everything queued and stops the writer thread."
+        self._queue.put(_CLOSE)
+        self._thread.join()
@@ -0,0 +1,491 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+import random
+import threading
+import time
+from array import array
+from pyax._backend import Backend
+from pyax._constants import (
+    kAXErrorActionUnsupported,
+    kAXErrorCannotComplete,
+    kAXErrorIllegalArgument,
+    kAXErrorNoValue,
+    kAXErrorSuccess,
+)
+from pyax._uielement import AXUIElementMixin
+
+__all__ = [
+    "SyntheticBackend",
+    "SyntheticElement",
+    "SyntheticObserver",
+    "build_synthetic_tree",
+    "SHAPES",
+]
+
+SHAPES = ["balanced", "deep", "random"]
+
+_ROLES = [
+    "AXGroup",
+    "AXStaticText",
+    "AXButton",
+    "AXLink",
+    "AXImage",
+    "AXTextField",
+    "AXCheckBox",
+    "AXHeading",
+]
+
+_GENERATED_ATTRIBUTES = [
+    "AXChildren",
+    "AXDescription",
+    "AXEnabled",
+    "AXFrame",
+    "AXParent",
+    "AXRole",
+    "AXTitle",
+    "AXValue",
+]
+
+# Notifications posted when an attribute is set.
+_CHANGE_NOTIFICATIONS = {
+    "AXValue": "AXValueChanged",
+    "AXTitle": "AXTitleChanged",
+    "AXDescription": "AXDescriptionChanged",
+}
+
+# Parameterized attributes of nodes with text, taking (location, length).
+_TEXT_ATTRIBUTES = ["AXBoundsForRange", "AXStringForRange"]
+
+
+class SyntheticElement(AXUIElementMixin):
+    """A handle to a node of a SyntheticBackend, with the same interface as
+    a mixed AXUIElement. Handles are created on demand and compare equal
+    when they point at the same node."""
+
+    __slots__ = ("_backend", "index", "_timeout")
+
+    def __init__(self, backend, index):
+        self._backend = backend
+        self.index = index
+        # Messaging timeout of this handle, 0 for none.
+        self._timeout = 0
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, SyntheticElement)
+            and other._backend is self._backend
+            and other.index == self.index
+        )
+
+    def __hash__(self):
+        return hash((id(self._backend), self.index))
+
+    def append_child(self, child):
+        "Moves child, another element of the same backend, under this one."
+        self._backend.append_child(self, child)
+        return child
+
+    def remove(self):
+        "Detaches this element from its parent."
+        self._backend.remove(self)
+
+    @property
+    def pid(self):
+        return self._backend.pid
+
+
+class SyntheticObserver(object):
+    "An observer of a SyntheticBackend, see SyntheticBackend.post_notification."
+
+    def __init__(self, backend, pid, callback):
+        self.backend = backend
+        self.pid = pid
+        self.callback = callback
+        self._registered = set()
+
+    def add_notifications_for_element(self, element, *notification_names):
+        for name in notification_names:
+            self._registered.add((element.index, name))
+
+    def add_notifications(self, *notification_names):
+        self.add_notifications_for_element(self.backend.root, *notification_names)
+
+    def remove_notifications_for_element(self, element, *notification_names):
+        for name in notification_names:
+            self._registered.discard((element.index, name))
+
+    def remove_notifications(self, *notification_names):
+        self.remove_notifications_for_element(self.backend.root, *notification_names)
+
+    def _wants(self, element, name):
+        # Registering on the application covers all of its elements.
+        registered = self._registered
+        return (element.index, name) in registered or (0, name) in registered
+
+
+class SyntheticBackend(Backend):
+    """A pure Python backend serving one generated application tree.
+    The tree structure is kept in arrays and attributes are derived from
+    each node's index, so trees of millions of nodes stay cheap; elements
+    are only created when a call returns them. Every call sleeps for
+    `latency` seconds to simulate the IPC round trip, and fails with
+    kAXErrorCannotComplete with probability error_rate, or always with the
+    codes given for an attribute or action name in errors. A call whose
+    latency exceeds the messaging timeout of the element handle it is made
+    with gives up after the timeout with kAXErrorCannotComplete, like a call
+    to a hung application. Other handles of the same node keep waiting.
+
+    A "balanced" tree fills each level before the next, a "deep" tree only
+    expands the first child of each node, and a "random" tree gives each
+    node between 0 and twice the fan-out children."""
+
+    def __init__(
+        self,
+        nodes=1000,
+        fanout=10,
+        shape="balanced",
+        latency=0,
+        error_rate=0,
+        errors=None,
+        seed=0,
+        name="Synthetic",
+        pid=0,
+    ):
+        if shape not in SHAPES:
+            raise ValueError(f"unknown tree shape '{shape}'")
+        self.latency = latency
+        self.error_rate = error_rate
+        self.errors = dict(errors or {})
+        self.name = name
+        self.pid = pid
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._observers = []
+        # Attributes set on, or given to, individual nodes.
+        self._attributes = {}
+        # Children of nodes whose children changed since generation.
+        self._child_lists = {}
+        self._generate(nodes, fanout, shape, random.Random(seed))
+        self._generated = len(self._parent)
+        self._attributes[0] = {"AXRole": "AXApplication", "AXTitle": name}
+
+    def _generate(self, nodes, fanout, shape, rng):
+        # Nodes are numbered breadth first, so the children of a node are
+        # always a contiguous range of indexes.
+        self._parent = array("q", [-1])
+        self._first_child = array("q")
+        self._child_count = array("q")
+        total = 1
+        index = 0
+        while index < total:
+            n = 0
+            if total < nodes:
+                if shape == "random":
+                    n = rng.randint(0, fanout * 2)
+                    if index == total - 1:
+                        # Never let a random tree die out before it is big enough.
+                        n = max(n, 1)
+                elif shape == "deep":
+                    parent = self._parent[index]
+                    if parent < 0 or self._first_child[parent] == index:
+                        n = fanout
+                else:
+                    n = fanout
+                n = min(n, nodes - total)
+            self._first_child.append(total)
+            self._child_count.append(n)
+            self._parent.extend([index] * n)
+            total += n
+            index += 1
+
+    @property
+    def root(self):
+        "The application element."
+        return SyntheticElement(self, 0)
+
+    @property
+    def node_count(self):
+        "The number of nodes, including detached ones."
+        return len(self._parent)
+
+    # Simulated IPC.
+
+    def _call(self, element, name=None):
+        timeout = element._timeout
+        if timeout and self.latency > timeout:
+            time.sleep(timeout)
+            return kAXErrorCannotComplete
+        if self.latency:
+            time.sleep(self.latency)
+        if name in self.errors:
+            return self.errors[name]
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return kAXErrorCannotComplete
+        return kAXErrorSuccess
+
+    # Node storage.
+
+    def _children(self, index):
+        children = self._child_lists.get(index)
+        if children is not None:
+            return children
+        if index >= self._generated:
+            return []
+        first = self._first_child[index]
+        return range(first, first + self._child_count[index])
+
+    def _generated_attribute(self, index, attribute):
+        role = _ROLES[index % len(_ROLES)]
+        if attribute == "AXRole":
+            return role
+        if attribute == "AXTitle":
+            return f"{role[2:]} {index}"
+        position = index - self._first_child[self._parent[index]]
+        if attribute == "AXValue":
+            return position
+        if attribute == "AXDescription":
+            return ""
+        if attribute == "AXEnabled":
+            return True
+        if attribute == "AXFrame":
+            return {"x": position * 10.0, "y": index * 1.0, "w": 10.0, "h": 10.0}
+        return None
+
+    def _get(self, index, attribute):
+        if attribute == "AXChildren":
+            return [SyntheticElement(self, i) for i in self._children(index)]
+        if attribute == "AXParent":
+            parent = self._parent[index]
+            return SyntheticElement(self, parent) if parent >= 0 else None
+        attributes = self._attributes.get(index)
+        if attributes is not None and attribute in attributes:
+            return attributes[attribute]
+        if index == 0 or index >= self._generated:
+            return None
+        return self._generated_attribute(index, attribute)
+
+    def _names(self, index):
+        names = set(self._attributes.get(index, ()))
+        names.update(["AXChildren", "AXParent"])
+        if 0 < index < self._generated:
+            names.update(_GENERATED_ATTRIBUTES)
+        return sorted(names)
+
+    # Backend calls.
+
+    def attribute_names(self, element):
+        err = self._call(element)
+        return err, self._names(element.index) if err == 0 else []
+
+    def _text(self, index):
+        value = self._get(index, "AXValue")
+        if not isinstance(value, str):
+            value = self._get(index, "AXTitle")
+        return value if isinstance(value, str) else None
+
+    def parameterized_attribute_names(self, element):
+        err = self._call(element)
+        if err or self._text(element.index) is None:
+            return err, []
+        return err, list(_TEXT_ATTRIBUTES)
+
+    def attribute_value(self, element, attribute):
+        err = self._call(element, attribute)
+        if err:
+            return err, None
+        value = self._get(element.index, attribute)
+        return (kAXErrorNoValue if value is None else 0), value
+
+    def multiple_attribute_values(self, element, attributes):
+        err = self._call(element)
+        rv = {}
+        if err:
+            return err, rv
+        for attribute in attributes:
+            if attribute in self.errors:
+                continue
+            value = self._get(element.index, attribute)
+            if value is not None:
+                rv[attribute] = value
+        return err, rv
+
+    def parameterized_attribute_value(self, element, attribute, parameter):
+        err = self._call(element, attribute)
+        text = self._text(element.index)
+        if err or attribute not in _TEXT_ATTRIBUTES or text is None:
+            return (err or kAXErrorNoValue), None
+        try:
+            location, length = parameter
+        except (TypeError, ValueError):
+            return kAXErrorIllegalArgument, None
+        if location < 0 or length < 0 or location + length > len(text):
+            return kAXErrorIllegalArgument, None
+        if attribute == "AXStringForRange":
+            return err, text[location : location + length]
+        # Characters are laid out in a single line across the frame.
+        frame = self._get(element.index, "AXFrame") or {}
+        width = frame.get("w", 0) / max(len(text), 1)
+        return err, {
+            "x": frame.get("x", 0) + location * width,
+            "y": frame.get("y", 0),
+            "w": length * width,
+            "h": frame.get("h", 0),
+        }
+
+    def is_attribute_settable(self, element, attribute):
+        err = self._call(element, attribute)
+        return err, not err and attribute in _CHANGE_NOTIFICATIONS
+
+    def set_attribute_value(self, element, attribute, value):
+        err = self._call(element, attribute)
+        if err:
+            return err
+        with self._lock:
+            self._attributes.setdefault(element.index, {})[attribute] = value
+        if attribute in _CHANGE_NOTIFICATIONS:
+            self.post_notification(element, _CHANGE_NOTIFICATIONS[attribute])
+        return err
+
+    def _actions(self, element):
+        return ["AXPress"] if self._get(element.index, "AXRole") == "AXButton" else []
+
+    def action_names(self, element):
+        err = self._call(element)
+        return err, self._actions(element) if err == 0 else []
+
+    def action_description(self, element, action):
+        err = self._call(element, action)
+        if not err and action not in self._actions(element):
+            err = kAXErrorActionUnsupported
+        return err, None if err else "press"
+
+    def perform_action(self, element, action):
+        err = self._call(element, action)
+        if not err and action not in self._actions(element):
+            err = kAXErrorActionUnsupported
+        return err
+
+    def element_at_position(self, app, x, y):
+        """Descends from app into the last child whose frame contains the
+        point, and returns the deepest element found."""
+        err = self._call(app)
+        if err:
+            return err, None
+        index = app.index
+        while True:
+            for child in reversed(self._children(index)):
+                frame = self._get(child, "AXFrame")
+                if (
+                    frame
+                    and frame["x"] <= x < frame["x"] + frame["w"]
+                    and frame["y"] <= y < frame["y"] + frame["h"]
+                ):
+                    index = child
+                    break
+            else:
+                return err, SyntheticElement(self, index)
+
+    def set_messaging_timeout(self, element, seconds):
+        # Like a separate AXUIElementRef, a handle made by application() has
+        # its own timeout, and the handles that calls return have none.
+        element._timeout = seconds
+        return kAXErrorSuccess
+
+    def application(self, pid):
+        return self.root if pid == self.pid else None
+
+    def applications(self):
+        return [self.root]
+
+    def application_by_name(self, name):
+        return self.root if name == self.name else None
+
+    def application_name(self, pid):
+        return self.name if pid == self.pid else None
+
+    def create_observer(self, pid, callback, cfrunloop=None):
+        observer = SyntheticObserver(self, pid, callback)
+        with self._lock:
+            self._observers.append(observer)
+        return observer
+
+    def remove_observer(self, observer, cfrunloop=None):
+        with self._lock:
+            if observer in self._observers:
+                self._observers.remove(observer)
+
+    # Changing the tree.
+
+    def create_element(self, role, attributes=None, parent=None):
+        """Adds a node with the given role and attributes, under parent if
+        one is given, and returns its element."""
+        with self._lock:
+            index = len(self._parent)
+            self._parent.append(-1)
+            self._attributes[index] = dict(attributes or {}, AXRole=role)
+        element = SyntheticElement(self, index)
+        if parent is not None:
+            self.append_child(parent, element)
+        return element
+
+    def append_child(self, parent, child):
+        "Moves child to the end of parent's children."
+        with self._lock:
+            self._detach(child.index)
+            children = list(self._children(parent.index))
+            children.append(child.index)
+            self._child_lists[parent.index] = children
+            self._parent[child.index] = parent.index
+        self.post_notification(child, "AXCreated")
+
+    def _detach(self, index):
+        parent = self._parent[index]
+        if parent >= 0:
+            children = list(self._children(parent))
+            children.remove(index)
+            self._child_lists[parent] = children
+            self._parent[index] = -1
+
+    def remove(self, element):
+        "Detaches element from its parent."
+        self.post_notification(element, "AXUIElementDestroyed")
+        with self._lock:
+            self._detach(element.index)
+
+    def post_notification(self, element, name, info=None):
+        """Calls the observers registered for name on element or on the
+        application, right away."""
+        for observer in list(self._observers):
+            if observer._wants(element, name):
+                observer.callback(observer, element, name, info)
+
+
+def build_synthetic_tree(
+    nodes=1000, fanout=10, shape="balanced", latency=0, seed=0, error_rate=0
+):
+    """Builds a synthetic tree with the given node count, and returns its
+    application element. See SyntheticBackend for the options."""
+    backend = SyntheticBackend(
+        nodes, fanout, shape, latency=latency, error_rate=error_rate, seed=seed
+    )
+    return backend.root
@@ -21,31 +21,18 @@
 # THE SOFTWARE.
 
 import re
-from ApplicationServices import (
-    AXUIElementRef,
-    AXUIElementCopyAttributeNames,
-    AXUIElementCopyAttributeValue,
-    AXUIElementCopyParameterizedAttributeValue,
-    AXUIElementCopyParameterizedAttributeNames,
-    AXUIElementIsAttributeSettable,
-    AXUIElementCopyActionNames,
-    AXUIElementSetAttributeValue,
-    AXUIElementCreateApplication,
-    AXUIElementCopyMultipleAttributeValues,
-    AXUIElementCopyActionDescription,
-    AXUIElementPerformAction,
-    AXUIElementCopyElementAtPosition,
-    AXValueRef,
-    AXValueGetType,
-    kAXValueAXErrorType,
-)
-from Quartz import (
-    CGWindowListCopyWindowInfo,
-    kCGWindowListExcludeDesktopElements,
-    kCGNullWindowID,
-)
-from Foundation import NSKeyedUnarchiver
-from Cocoa import NSData
+
+from pyax._backend import get_backend, pyobjc_backend
+from pyax._walk import walk
+from pyax._webroot import get_web_root
+from pyax._parameterized import make_parameter, parameterized_attribute_values
+
+try:
+    from ApplicationServices import AXUIElementRef
+except ImportError:
+    # pyobjc is only available on macOS. Without it the pure Python parts of
+    # pyax, like serialization, diffing and synthetic trees, still work.
+    AXUIElementRef = None
 
 __all__ = [
     "AXUIElementMixin",
@@ -53,86 +40,95 @@ __all__ = [
     "get_application_by_name",
     "get_web_root",
     "get_element_at_position",
+    "describe_element",
 ]
 
 
-def _unarchiveObject(val):
-    if isinstance(val, NSData):
-        try:
-            return NSKeyedUnarchiver.unarchiveObjectWithData_(val)
-        except Exception:
-            return val
-    else:
-        return val
-
-
 def get_applications():
-    wl = CGWindowListCopyWindowInfo(
-        kCGWindowListExcludeDesktopElements, kCGNullWindowID
-    )
-    pids = [int((w.valueForKey_("kCGWindowOwnerPID"))) for w in wl]
-    return [AXUIElementCreateApplication(pid) for pid in set(pids)]
+    return get_backend().applications()
 
 
 def get_application_by_name(name):
-    wl = CGWindowListCopyWindowInfo(
-        kCGWindowListExcludeDesktopElements, kCGNullWindowID
-    )
-    for w in wl:
-        if name == w.valueForKey_("kCGWindowOwnerName"):
-            return AXUIElementCreateApplication(
-                int((w.valueForKey_("kCGWindowOwnerPID")))
-            )
+    return get_backend().application_by_name(name)
 
 
 def get_application_from_pid(pid):
-    return AXUIElementCreateApplication(pid)
-
-
-def get_web_root(acc):
-    return acc.search_for(lambda e: e["AXRole"] == "AXWebArea")
+    return get_backend().application(pid)
 
 
 def get_element_at_position(app, x, y):
-    err, element = AXUIElementCopyElementAtPosition(app, x, y, None)
+    err, element = app._backend.element_at_position(app, x, y)
     return element
 
 
+# Attributes shown by repr() of an element, fetched in one call.
+REPR_ATTRIBUTES = ["AXRole", "AXTitle", "AXDescription", "AXValue"]
+
+
+def describe_element(values):
+    "Formats attribute values of an element the way repr() of an element does."
+    attrs = {}
+    for attr in REPR_ATTRIBUTES[1:]:
+        val = values.get(attr)
+        if val:
+            attrs[attr] = val
+    return "AXUIElement(%s: %s)" % (
+        values.get("AXRole"),
+        " ".join([f"{k}={repr(attrs[k])}" for k in attrs]),
+    )
+
+
 class AXUIElementMixin(object):
     _mix_into = AXUIElementRef
 
+    # Lets pure Python elements, like synthetic ones, be slotted.
+    __slots__ = ()
+
     # This hides all the useless attributes from AXUIElement.
     def __dir__(self):
         return dir(AXUIElementMixin)
 
+    @property
+    def _backend(self):
+        "The backend this element's calls go through."
+        return pyobjc_backend()
+
     @property
     def attribute_names(self):
         "Returns a list of all the attributes supported by the specified accessibility object."
-        err, attr = AXUIElementCopyAttributeNames(self, None)
-        return sorted(list(attr))
+        err, attr = self._backend.attribute_names(self)
+        return sorted(attr)
 
     @property
     def parameterized_attribute_names(self):
         "Returns a list of all the parameterized attributes supported by the specified accessibility object."
-        err, attr = AXUIElementCopyParameterizedAttributeNames(self, None)
-        return sorted(list(attr))
+        err, attr = self._backend.parameterized_attribute_names(self)
+        return sorted(attr)
 
     def is_attribute_settable(self, attribute):
         "Returns whether the specified accessibility object's attribute can be modified."
-        err, result = AXUIElementIsAttributeSettable(self, attribute, None)
-        return bool(result)
+        err, result = self._backend.is_attribute_settable(self, attribute)
+        return result
 
     def get_attribute_value(self, attribute):
         "Returns the value of an accessibility object's attribute."
-        err, value = AXUIElementCopyAttributeValue(self, attribute, None)
-        return _unarchiveObject(value)
+        err, value = self._backend.attribute_value(self, attribute)
+        return value
 
     def get_attribute_parameterized_value(self, attribute, parameter):
-        "Returns the value of an accessibility object's parameterized attribute."
-        err, value = AXUIElementCopyParameterizedAttributeValue(
-            self, attribute, parameter, None
+        """Returns the value of an accessibility object's parameterized attribute.
+        Range parameters may be given as (location, length) tuples."""
+        parameter = make_parameter(self._backend, attribute, parameter)
+        err, value = self._backend.parameterized_attribute_value(
+            self, attribute, parameter
         )
-        return _unarchiveObject(value)
+        return value
+
+    def get_multiple_parameterized_attribute_values(self, queries, workers=4):
+        """Returns the values of many (attribute, parameter) queries as a list
+        of (err, value) tuples, in order, running the queries concurrently.
+        Range parameters may be given as (location, length) tuples."""
+        return parameterized_attribute_values(self, queries, workers)
 
     def __getitem__(self, key):
         """Returns the value of an accessibility object's attribute.
@@ -144,33 +140,27 @@ class AXUIElementMixin(object):
 
     def __setitem__(self, key, value):
         "Sets the accessibility object's attribute to the specified value."
-        AXUIElementSetAttributeValue(self, key, value)
+        self._backend.set_attribute_value(self, key, value)
 
     def get_multiple_attribute_values(self, *attributes):
         "Returns the values of multiple attributes in the accessibility object."
-        err, values = AXUIElementCopyMultipleAttributeValues(self, attributes, 0, None)
-        rv = {}
-        for i, value in enumerate(values or []):
-            if isinstance(value, AXValueRef):
-                if AXValueGetType(value) == kAXValueAXErrorType:
-                    continue
-            rv[attributes[i]] = _unarchiveObject(value)
-        return rv
+        err, values = self._backend.multiple_attribute_values(self, attributes)
+        return values
 
     @property
     def actions(self):
         "Returns a list of all the actions the specified accessibility object can perform."
-        err, result = AXUIElementCopyActionNames(self, None)
-        return sorted(list(result) if result else [])
+        err, result = self._backend.action_names(self)
+        return sorted(result)
 
     def get_action_description(self, action_name):
         "Returns a localized description of the specified accessibility object's action."
-        err, result = AXUIElementCopyActionDescription(self, action_name, None)
+        err, result = self._backend.action_description(self, action_name)
         return result
 
     def perform_action(self, action_name):
         "Performs the specified action on the accessibility object."
-        result = AXUIElementPerformAction(self, action_name)
+        result = self._backend.perform_action(self, action_name)
         return result
 
     def __len__(self):
@@ -188,28 +178,16 @@ class AXUIElementMixin(object):
         return self["AXParent"]
 
     def __repr__(self):
-        attrs = {}
-        for attr in ["AXTitle", "AXDescription", "AXValue"]:
-            val = self[attr]
-            if val:
-                attrs[attr] = val
-        return "AXUIElement(%s: %s)" % (
-            self["AXRole"],
-            " ".join([f"{k}={repr(attrs[k])}" for k in attrs]),
-        )
+        return describe_element(self.get_multiple_attribute_values(*REPR_ATTRIBUTES))
 
     def __bool__(self):
         return True
 
     def search_for(self, match_func):
-        "Recursively search in element's subtree for descendant that matches prerequisite"
-        if match_func(self):
-            return self
-        for child in self:
-            match = child.search_for(match_func)
-            if match:
-                return match
-
+        "Search in element's subtree, in document order, for descendant that matches prerequisite"
+        for event in walk(self, paths=False):
+            if match_func(event.element):
+                return event.element
         return None
 
     @property
@@ -0,0 +1,136 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Waiting for the UI to reach a state. Instead of polling, a temporary
+# observer is registered on the element and the predicate is only evaluated
+# again when one of the notifications arrives.
+
+import threading
+import time
+from collections import deque
+from pyax._constants import AX_ERRORS
+from pyax._watch import WATCH_EVENTS
+
+__all__ = ["WAIT_EVENTS", "wait_for", "perform_action_and_wait"]
+
+# Notifications that wait_for re-evaluates its predicate after by default.
+WAIT_EVENTS = WATCH_EVENTS + [
+    "AXDescriptionChanged",
+    "AXSelectedChildrenChanged",
+    "AXWindowCreated",
+    "AXFocusedWindowChanged",
+]
+
+
+class _Subscription(object):
+    "Temporary notifications on an element, unregistered on exit."
+
+    def __init__(self, element, notifications, cfrunloop=None):
+        self.element = element
+        self.notifications = list(notifications)
+        self.cfrunloop = cfrunloop
+        self.backend = element._backend
+        self.received = deque()
+        self.event = threading.Event()
+        self.observer = None
+
+    def _callback(self, observer, element, notification, info):
+        self.received.append((element, notification))
+        self.event.set()
+
+    def __enter__(self):
+        self.observer = self.backend.create_observer(
+            self.element.pid, self._callback, self.cfrunloop
+        )
+        self.observer.add_notifications_for_element(self.element, *self.notifications)
+        return self
+
+    def __exit__(self, *args):
+        self.observer.remove_notifications_for_element(
+            self.element, *self.notifications
+        )
+        self.backend.remove_observer(self.observer, self.cfrunloop)
+        self.observer = None
+
+    def wait(self, deadline):
+        "Waits for a notification until deadline. Returns False on timeout."
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        return self.backend.wait(self.event, remaining, self.cfrunloop)
+
+
+def wait_for(
+    element, predicate, notifications=WAIT_EVENTS, timeout=5.0, cfrunloop=None
+):
+    """Waits until predicate(element) returns a true value, and returns it.
+    The predicate is evaluated once, then again each time one of
+    notifications is posted for element, or for any of its elements if it is
+    an application. Raises TimeoutError after timeout seconds.
+
+    >>> wait_for(field, lambda e: e["AXValue"] == "done")"""
+    deadline = time.monotonic() + timeout
+    with _Subscription(element, notifications, cfrunloop) as subscription:
+        while True:
+            # Clear first, so a change while evaluating is not missed.
+            subscription.event.clear()
+            value = predicate(element)
+            if value:
+                return value
+            if not subscription.wait(deadline):
+                raise TimeoutError(f"timed out waiting for {element!r}")
+
+
+def perform_action_and_wait(
+    element,
+    action,
+    notifications,
+    predicate=None,
+    target=None,
+    timeout=5.0,
+    cfrunloop=None,
+):
+    """Performs action on element and waits for one of notifications to be
+    posted for target, element by default, and for predicate(target) to be
+    true if one is given. Returns the (element, notification) that was
+    posted last. The observer is registered before the action is performed,
+    so a notification can't be missed. Raises TimeoutError after timeout
+    seconds, and RuntimeError if the action fails.
+
+    >>> perform_action_and_wait(button, "AXPress", ["AXWindowCreated"], target=app)"""
+    target = element if target is None else target
+    deadline = time.monotonic() + timeout
+    with _Subscription(target, notifications, cfrunloop) as subscription:
+        err = element._backend.perform_action(element, action)
+        if err:
+            raise RuntimeError(
+                f"{action} failed on {element!r}: {AX_ERRORS.get(err, err)}"
+            )
+        while True:
+            subscription.event.clear()
+            posted = None
+            while subscription.received:
+                posted = subscription.received.popleft()
+            if posted is not None and (predicate is None or predicate(target)):
+                return posted
+            if not subscription.wait(deadline):
+                raise TimeoutError(f"timed out waiting for {action} on {element!r}")
@@ -0,0 +1,135 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# The tree walker that dumpers, searchers and exporters are built on. It is
+# iterative, so memory use is bound by the depth of the tree and not the
+# Python stack, and it is a generator, so consumers can stop at any point.
+
+import sys
+from collections import namedtuple
+from collections.abc import Mapping
+
+__all__ = ["walk", "attribute_fetcher", "WalkEvent", "ENTER", "EXIT"]
+
+ENTER = "enter"
+EXIT = "exit"
+
+WalkEvent = namedtuple("WalkEvent", ["kind", "depth", "path", "element", "attributes"])
+WalkEvent.__doc__ = """A node entered or exited during a walk. path is the
+tuple of child indexes from the root, and attributes are what the fetch
+function returned for the node."""
+
+_DONE = object()
+
+
+def _fetch_element(element):
+    # Children of live elements are only fetched if they are descended into.
+    return None, element
+
+
+def _fetch_node(node):
+    return node, node.get("AXChildren") or []
+
+
+def attribute_fetcher(attributes):
+    """Returns a fetch function for walk() that gets the given attributes,
+    or those of a FetchPlan, and the children of each element in one call.
+    Attributes without a value are None."""
+    if hasattr(attributes, "fetch"):
+
+        def fetch(element):
+            values = attributes.fetch(element, children=True)
+            return values, values.pop("AXChildren") or []
+
+        return fetch
+
+    wanted = list(dict.fromkeys(list(attributes) + ["AXChildren"]))
+    requested = "AXChildren" in attributes
+
+    def fetch(element):
+        values = element.get_multiple_attribute_values(*wanted) or {}
+        children = (
+            values.get("AXChildren") if requested else values.pop("AXChildren", None)
+        )
+        for attribute in attributes:
+            values.setdefault(attribute, None)
+        return values, children or []
+
+    return fetch
+
+
+def walk(
+    root,
+    fetch=None,
+    max_depth=None,
+    max_nodes=None,
+    prune=None,
+    exits=False,
+    paths=True,
+):
+    """Walks the tree under root depth first, in document order, and yields a
+    WalkEvent as each node is entered, and as it is exited if exits is True.
+
+    fetch(node) returns the (attributes, children) of a node. By default,
+    attributes are None for live elements and the node itself for tree
+    snapshots (mappings), see attribute_fetcher() to fetch attributes
+    together with the children. Children of nodes deeper than max_depth,
+    where the root is at depth 0, or for which prune(event) returns True,
+    are skipped. The walk ends after max_nodes nodes, exiting the nodes
+    that are still open. Paths take memory quadratic in the depth of the
+    tree, so with paths False they are left as None."""
+    if fetch is None:
+        fetch = _fetch_node if isinstance(root, Mapping) else _fetch_element
+    if max_nodes is not None and max_nodes <= 0:
+        return
+    new = tuple.__new__
+    limit = sys.maxsize if max_nodes is None else max_nodes
+    deepest = -1 if max_depth is None else max_depth
+    values, children = fetch(root)
+    event = new(WalkEvent, (ENTER, 0, () if paths else None, root, values))
+    yield event
+    count = 1
+    if deepest == 0 or (prune and prune(event)):
+        children = ()
+    # Each frame is [event, iterator over children, next child index].
+    stack = [[event, iter(children), 0]]
+    while stack:
+        frame = stack[-1]
+        child = next(frame[1], _DONE) if count < limit else _DONE
+        if child is _DONE:
+            stack.pop()
+            if exits:
+                yield frame[0]._replace(kind=EXIT)
+            continue
+        parent = frame[0]
+        depth = parent[1] + 1
+        path = None
+        if paths:
+            path = parent[2] + (frame[2],)
+            frame[2] += 1
+        values, children = fetch(child)
+        event = new(WalkEvent, (ENTER, depth, path, child, values))
+        yield event
+        count += 1
+        if depth == deepest or (prune and prune(event)):
+            children = ()
+        stack.append([event, iter(children), 0])
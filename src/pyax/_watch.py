@@ -0,0 +1,250 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+# Keeps a rendered accessibility tree up to date from notifications. The tree
+# is crawled once; notifications only mark nodes dirty, and refresh() (called
+# from a timer at a bounded rate) re-fetches the dirty nodes and rewrites the
+# terminal lines that changed.
+
+import shutil
+import sys
+import time
+
+__all__ = ["TreeWatcher", "WATCH_EVENTS"]
+
+# Notifications after which the children of a node are fetched again.
+STRUCTURE_EVENTS = [
+    "AXCreated",
+    "AXUIElementDestroyed",
+    "AXChildrenChanged",
+    "AXLayoutChanged",
+    "AXRowCountChanged",
+    "AXExpandedChanged",
+]
+
+# Notifications after which only the attributes of a node are fetched again.
+VALUE_EVENTS = [
+    "AXValueChanged",
+    "AXTitleChanged",
+    "AXSelectedTextChanged",
+    "AXFocusedUIElementChanged",
+]
+
+WATCH_EVENTS = STRUCTURE_EVENTS + VALUE_EVENTS
+
+# How many AXParent hops to take looking for a known ancestor of a new element.
+_MAX_ANCESTOR_HOPS = 64
+
+
+class _Node(object):
+    __slots__ = ("element", "parent", "children", "depth", "line")
+
+    def __init__(self, element, parent, depth):
+        self.element = element
+        self.parent = parent
+        self.depth = depth
+        self.children = []
+        self.line = ""
+
+
+class TreeWatcher(object):
+    """Renders the subtree of element to out and keeps it current.
+    Lines are produced by renderer.format_element() from the dicts returned
+    by element_to_dict. Feed notifications to notify() and call refresh()
+    periodically; the screen is redrawn at most max_rate times a second no
+    matter how many notifications arrive in between. When out is a terminal
+    the tree is drawn on the alternate screen and only changed lines are
+    rewritten, otherwise the whole tree is written after each change."""
+
+    def __init__(self, element, element_to_dict, renderer, out=None, max_rate=10):
+        self.element_to_dict = element_to_dict
+        self.renderer = renderer
+        self.out = out or sys.stdout
+        if max_rate <= 0:
+            raise ValueError("max_rate must be positive")
+        self.min_interval = 1.0 / max_rate
+        self.tty = self.out.isatty()
+        self.updates = 0
+        self._nodes = {}
+        self._dirty = {}
+        self._screen = []
+        self._size = None
+        self._last_refresh = 0
+        self.root = self._crawl(element, None, 0)
+
+    def _render_line(self, node):
+        try:
+            obj = self.element_to_dict(node.element)
+        except Exception as e:
+            node.line = f"{node.depth * ' '}<{type(e).__name__}>"
+            return
+        obj.pop("AXChildren", None)
+        role = obj["AXRole"] if "AXRole" in obj else node.element["AXRole"]
+        node.line = self.renderer.format_element(role, obj, node.depth)
+
+    def _children_of(self, element):
+        try:
+            return list(element)
+        except Exception:
+            return []
+
+    def _crawl(self, element, parent, depth):
+        root = _Node(element, parent, depth)
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            self._nodes[node.element] = node
+            self._render_line(node)
+            node.children = [
+                _Node(child, node, node.depth + 1)
+                for child in self._children_of(node.element)
+            ]
+            stack.extend(reversed(node.children))
+        return root
+
+    def _forget(self, node):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if self._nodes.get(node.element) is node:
+                del self._nodes[node.element]
+            self._dirty.pop(node, None)
+            stack.extend(node.children)
+
+    def _refetch_children(self, node):
+        children = []
+        for element in self._children_of(node.element):
+            known = self._nodes.get(element)
+            if known is not None and known.parent is node:
+                children.append(known)
+            else:
+                children.append(self._crawl(element, node, node.depth + 1))
+        kept = set(map(id, children))
+        for child in node.children:
+            if id(child) not in kept:
+                self._forget(child)
+        node.children = children
+
+    def _known_ancestor(self, element):
+        for _ in range(_MAX_ANCESTOR_HOPS):
+            try:
+                element = element["AXParent"]
+            except Exception:
+                return None
+            if element is None:
+                return None
+            node = self._nodes.get(element)
+            if node is not None:
+                return node
+        return None
+
+    def notify(self, element, notification):
+        """Marks the node of element dirty. Structural notifications mark
+        the node whose children need to be fetched again."""
+        node = self._nodes.get(element)
+        if notification in STRUCTURE_EVENTS:
+            if notification == "AXUIElementDestroyed":
+                node = node.parent if node else None
+            elif notification == "AXCreated" or node is None:
+                node = self._known_ancestor(element)
+            if node is not None:
+                self._dirty[node] = True
+        elif node is not None:
+            self._dirty.setdefault(node, False)
+
+    def lines(self):
+        "Returns the current lines of the tree in document order."
+        lines = []
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            lines.append(node.line)
+            stack.extend(reversed(node.children))
+        return lines
+
+    def refresh(self, force=False):
+        """Re-fetches dirty nodes and redraws the lines that changed, unless
+        the last refresh was less than 1 / max_rate seconds ago. Returns the
+        number of lines rewritten."""
+        now = time.monotonic()
+        if not force and (
+            not self._dirty or now - self._last_refresh < self.min_interval
+        ):
+            return 0
+        self._last_refresh = now
+        dirty = sorted(self._dirty.items(), key=lambda item: item[0].depth)
+        self._dirty = {}
+        for node, structural in dirty:
+            if self._nodes.get(node.element) is not node:
+                # Dropped with an ancestor that was refreshed first.
+                continue
+            self._render_line(node)
+            if structural:
+                self._refetch_children(node)
+        self.updates += 1
+        return self._draw(self.lines())
+
+    def _draw(self, lines):
+        if not self.tty:
+            self.out.write("\n".join(lines + ["", ""]))
+            self.out.flush()
+            return len(lines)
+        size = shutil.get_terminal_size()
+        buf = []
+        if size != self._size:
+            # Everything moved, start over on a clean screen.
+            self._size = size
+            self._screen = []
+            buf.append("\x1b[2J")
+        rows = max(size.lines - 1, 1)
+        visible = lines[:rows]
+        written = 0
+        for row in range(max(len(visible), len(self._screen))):
+            line = visible[row] if row < len(visible) else ""
+            if row < len(self._screen) and self._screen[row] == line:
+                continue
+            buf.append(f"\x1b[{row + 1};1H{line}\x1b[K")
+            written += 1
+        status = f"{len(lines)} nodes, {self.updates} updates"
+        if len(lines) > rows:
+            status += f", {len(lines) - rows} lines below"
+        buf.append(f"\x1b[{rows + 1};1H\x1b[7m{status}\x1b[0m\x1b[K")
+        self._screen = visible
+        self.out.write("".join(buf))
+        self.out.flush()
+        return written
+
+    def start(self):
+        "Draws the whole tree, on the alternate screen if out is a terminal."
+        if self.tty:
+            # Alternate screen, hidden cursor and no line wrapping, so that
+            # each node takes exactly one row.
+            self.out.write("\x1b[?1049h\x1b[?25l\x1b[?7l")
+        self._last_refresh = time.monotonic()
+        self._draw(self.lines())
+
+    def close(self):
+        "Restores the terminal."
+        if self.tty:
+            self.out.write("\x1b[?7h\x1b[?25h\x1b[?1049l")
+            self.out.flush()
@@ -0,0 +1,159 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+# Locates web areas in browsers. Browser windows hold toolbars, tab bars and
+# sidebars next to the web content, so searching the whole application for
+# every lookup is costly. The locator searches the focused window first,
+# skipping chrome that can't hold web content, and remembers the child index
+# path from each window to its web area so later lookups only walk that path.
+
+from pyax._walk import walk
+
+__all__ = ["WebRootLocator", "get_web_root", "get_web_roots"]
+
+# Roles whose subtrees never hold web content.
+PRUNED_ROLES = set(
+    [
+        "AXButton",
+        "AXCheckBox",
+        "AXImage",
+        "AXMenuBar",
+        "AXMenuButton",
+        "AXPopUpButton",
+        "AXRadioButton",
+        "AXSlider",
+        "AXStaticText",
+        "AXTextField",
+        "AXToolbar",
+    ]
+)
+
+_NODE_ATTRIBUTES = ["AXRole", "AXChildren"]
+
+
+def _node(element):
+    values = element.get_multiple_attribute_values(*_NODE_ATTRIBUTES) or {}
+    return values.get("AXRole"), values.get("AXChildren") or []
+
+
+def _web_areas(element, pruned=PRUNED_ROLES, frames=False, first=False):
+    """Yields (path, web area) for the web areas under element in document
+    order, with paths as child indexes from element. Web areas are not
+    searched for nested frames unless frames is True."""
+
+    def prune(event):
+        if event.attributes == "AXWebArea":
+            return first or not frames
+        # The element searched in is never pruned.
+        return event.depth > 0 and event.attributes in pruned
+
+    for event in walk(element, _node, prune=prune):
+        if event.attributes == "AXWebArea":
+            yield event.path, event.element
+
+
+class WebRootLocator(object):
+    """Finds the web area of an application, trying the focused window first.
+    The path to each window's web area is cached, up to max_windows windows,
+    and revalidated with one call per level when it is reused. A full search
+    of the application only happens when no window has a web area in its
+    content."""
+
+    def __init__(self, max_windows=64):
+        self.max_windows = max_windows
+        self._paths = {}
+
+    def _windows(self, element):
+        values = (
+            element.get_multiple_attribute_values(
+                "AXRole", "AXFocusedWindow", "AXWindows", "AXChildren"
+            )
+            or {}
+        )
+        if values.get("AXRole") != "AXApplication":
+            return [element]
+        windows = []
+        for window in [values.get("AXFocusedWindow")] + list(
+            values.get("AXWindows") or values.get("AXChildren") or []
+        ):
+            if window is not None and window not in windows:
+                windows.append(window)
+        return windows
+
+    def _follow(self, window, path):
+        element = window
+        for index in path:
+            role, children = _node(element)
+            if index >= len(children):
+                return None
+            element = children[index]
+        role, children = _node(element)
+        return element if role == "AXWebArea" else None
+
+    def _remember(self, window, path):
+        if window not in self._paths and len(self._paths) >= self.max_windows:
+            self._paths.pop(next(iter(self._paths)))
+        self._paths[window] = path
+
+    def locate(self, element):
+        "Returns the first web area of an application or window, or None."
+        windows = self._windows(element)
+        for window in windows:
+            path = self._paths.get(window)
+            if path is not None:
+                web_area = self._follow(window, path)
+                if web_area is not None:
+                    return web_area
+                del self._paths[window]
+            for path, web_area in _web_areas(window, first=True):
+                self._remember(window, path)
+                return web_area
+        for path, web_area in _web_areas(element, pruned=(), first=True):
+            return web_area
+        return None
+
+    def locate_all(self, element, frames=True):
+        """Returns all web areas of an application or window, one per tab,
+        and one per frame unless frames is False."""
+        return [
+            web_area
+            for window in self._windows(element)
+            for path, web_area in _web_areas(window, frames=frames)
+        ]
+
+    def clear(self):
+        "Forgets all cached paths."
+        self._paths.clear()
+
+
+_locator = WebRootLocator()
+
+
+def get_web_root(element):
+    "Returns the first web area of an application or window, or None."
+    return _locator.locate(element)
+
+
+def get_web_roots(element, frames=True):
+    """Returns all web areas of an application or window, one per tab, and
+    one per frame unless frames is False."""
+    return _locator.locate_all(element, frames)
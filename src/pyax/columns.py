@@ -0,0 +1,199 @@
+# The MIT License(MIT)
+#
+# Copyright(c) 2025 Eitan Isaacson
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files(the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and / or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+
+# Columnar NumPy views of a captured tree, for questions about geometry and
+# state over a whole tree at once, like which elements are offscreen, which
+# overlap, or which are too small to hit.
+
+from collections.abc import Mapping
+from pyax._compact import CompactTree, CompactNode
+
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
+__all__ = ["TreeColumns", "STATE_ATTRIBUTES"]
+
+# Boolean attributes exported as columns, by column name.
+STATE_ATTRIBUTES = {
+    "enabled": "AXEnabled",
+    "focused": "AXFocused",
+    "hidden": "AXHidden",
+}
+
+
+def _rect(viewport):
+    if isinstance(viewport, Mapping):
+        return viewport["x"], viewport["y"], viewport["w"], viewport["h"]
+    return viewport
+
+
+class TreeColumns(object):
+    """One NumPy array per column, with an entry per node in document order:
+    x, y, w and h (NaN without a frame), depth, parent (-1 for the root),
+    end (the index after the node's last descendant), role codes indexing
+    roles, and the enabled, focused and hidden states. Queries return
+    boolean masks or arrays of node indices, which node() turns back into
+    tree nodes."""
+
+    def __init__(self, tree):
+        if np is None:
+            raise NotImplementedError("'numpy' pyax extra is required for columns")
+        if isinstance(tree, CompactNode):
+            tree = tree.tree
+        elif not isinstance(tree, CompactTree):
+            tree = CompactTree.from_dict(tree)
+        self.tree = tree
+        n = len(tree)
+        self.x = np.frombuffer(tree.x, dtype=np.float64, count=n)
+        self.y = np.frombuffer(tree.y, dtype=np.float64, count=n)
+        self.w = np.frombuffer(tree.w, dtype=np.float64, count=n)
+        self.h = np.frombuffer(tree.h, dtype=np.float64, count=n)
+        self.parent = np.frombuffer(tree.parent, dtype=np.int32, count=n)
+        self.role = np.frombuffer(tree.role, dtype=np.uint16, count=n)
+        self.roles = list(tree.strings)
+        # Parents come before their children in document order, so depth
+        # and subtree ends each take a single pass.
+        parent = tree.parent.tolist()
+        depth = [0] * n
+        for i in range(1, n):
+            depth[i] = depth[parent[i]] + 1
+        end = list(range(1, n + 1))
+        for i in range(n - 1, 0, -1):
+            if end[i] > end[parent[i]]:
+                end[parent[i]] = end[i]
+        self.depth = np.array(depth, dtype=np.int32)
+        self.end = np.array(end, dtype=np.int32)
+        for column, attribute in STATE_ATTRIBUTES.items():
+            setattr(self, column, self._state(attribute, n))
+
+    def _state(self, attribute, n):
+        state = np.zeros(n, dtype=bool)
+        table = self.tree.side_tables.get(attribute)
+        if table:
+            indices = np.fromiter(table.keys(), dtype=np.int64, count=len(table))
+            values = np.fromiter(
+                [bool(v) for v in table.values()], dtype=bool, count=len(table)
+            )
+            state[indices] = values
+        return state
+
+    def __len__(self):
+        return len(self.x)
+
+    def node(self, index):
+        "Returns the tree node at index."
+        return self.tree.node(int(index))
+
+    def nodes(self, selection):
+        "Returns the tree nodes of a boolean mask or array of indices."
+        if getattr(selection, "dtype", None) == bool:
+            selection = np.flatnonzero(selection)
+        return [self.tree.node(int(i)) for i in selection]
+
+    @property
+    def has_frame(self):
+        return ~np.isnan(self.x)
+
+    def role_mask(self, *roles):
+        "Returns a mask of the nodes with any of the given roles."
+        codes = [i for i, role in enumerate(self.roles) if role in roles]
+        return np.isin(self.role, codes)
+
+    def in_viewport(self, viewport, partial=True):
+        """Returns a mask of nodes whose frame intersects viewport, an
+        {x, y, w, h} dict or (x, y, w, h) tuple, or lies wholly inside it
+        when partial is False."""
+        vx, vy, vw, vh = _rect(viewport)
+        if partial:
+            return (
+                (self.x < vx + vw)
+                & (self.x + self.w > vx)
+                & (self.y < vy + vh)
+                & (self.y + self.h > vy)
+            )
+        return (
+            (self.x >= vx)
+            & (self.x + self.w <= vx + vw)
+            & (self.y >= vy)
+            & (self.y + self.h <= vy + vh)
+        )
+
+    def offscreen(self, viewport):
+        "Returns a mask of nodes with a frame entirely outside viewport."
+        return self.has_frame & ~self.in_viewport(viewport)
+
+    def clip(self, viewport):
+        """Returns x, y, w and h arrays of frames clipped to viewport. Nodes
+        outside it get an empty size."""
+        vx, vy, vw, vh = _rect(viewport)
+        x0 = np.clip(self.x, vx, vx + vw)
+        y0 = np.clip(self.y, vy, vy + vh)
+        x1 = np.clip(self.x + self.w, vx, vx + vw)
+        y1 = np.clip(self.y + self.h, vy, vy + vh)
+        return x0, y0, x1 - x0, y1 - y0
+
+    def smaller_than(self, width, height=None):
+        """Returns a mask of nodes with a frame narrower than width or
+        shorter than height, which defaults to width."""
+        height = width if height is None else height
+        return self.has_frame & ((self.w < width) | (self.h < height))
+
+    def overlaps(self, mask=None, exclude_nested=True, max_pairs=10000000):
+        """Returns an (n, 2) array of index pairs, lowest index first, of
+        nodes in mask whose frames overlap with a positive area. Pairs of a
+        node and one of its descendants are left out unless exclude_nested
+        is False. Candidates are found by sorting on one axis and sweeping,
+        and ValueError is raised if there are more than max_pairs of them."""
+        selected = self.has_frame & (self.w > 0) & (self.h > 0)
+        if mask is not None:
+            selected &= mask
+        indices = np.flatnonzero(selected)
+        # Sweep along the axis that yields fewer candidates: sorted by start,
+        # the nodes overlapping node k on that axis are those after k that
+        # start before k ends.
+        sweeps = []
+        for start, size in ((self.x, self.w), (self.y, self.h)):
+            order = indices[np.argsort(start[indices], kind="stable")]
+            lo = start[order]
+            hi = np.searchsorted(lo, lo + size[order], side="left")
+            counts = np.maximum(hi - np.arange(len(order)) - 1, 0)
+            sweeps.append((int(counts.sum()), order, counts))
+        total, order, counts = min(sweeps, key=lambda sweep: sweep[0])
+        if total > max_pairs:
+            raise ValueError(f"{total} candidate pairs, more than {max_pairs}")
+        left = np.repeat(np.arange(len(order)), counts)
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        right = left + 1 + (np.arange(total) - starts)
+        a = order[left]
+        b = order[right]
+        keep = (self.x[a] < self.x[b] + self.w[b]) & (self.x[b] < self.x[a] + self.w[a])
+        keep &= (self.y[a] < self.y[b] + self.h[b]) & (
+            self.y[b] < self.y[a] + self.h[a]
+        )
+        first = np.minimum(a, b)
+        second = np.maximum(a, b)
+        if exclude_nested:
+            keep &= second >= self.end[first]
+        return np.stack([first[keep], second[keep]], axis=1)
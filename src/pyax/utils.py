@@ -20,42 +20,94 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
+import time
 from . import get_application_by_name, get_element_at_position, start, stop
+from ._uielement import REPR_ATTRIBUTES, describe_element
 
 try:
     from ._highlighter import Highlighter
+    from PyQt6.QtCore import QTimer
 except ModuleNotFoundError:
     Highlighter = None
 
+# Attributes fetched in a single call for each element under the mouse.
+HOVER_ATTRIBUTES = REPR_ATTRIBUTES + ["AXFrame"]
 
-def get_element_with_mouse(app, hover_callback=None):
+
+def get_element_with_mouse(app, hover_callback=None, label_callback=None, max_rate=30):
+    """Highlights the element under the mouse pointer until one is clicked,
+    and returns it. Mouse moves are coalesced to the latest position, with at
+    most max_rate hit tests a second. Attributes are only fetched when the hit
+    test finds a different element than the one last hovered. hover_callback
+    is called with each hovered element, and label_callback with its repr(),
+    built from the same batched call that fetches its frame."""
     if not Highlighter:
         raise NotImplementedError(
             "'highlight' pyax extra is required for `get_element_with_mouse`"
         )
+    if max_rate <= 0:
+        raise ValueError("max_rate must be positive")
     app_element = get_application_by_name(app) if type(app) is str else app
     element = None
+    hovered = None
+    position = None
+    last_hit = 0.0
+    highlight = None
 
-    def _mm(x, y):
-        nonlocal element
-        if element:
+    def _hit_test():
+        nonlocal hovered, last_hit, highlight
+        if element or position is None:
             return
+        x, y = position
+        last_hit = time.monotonic()
         elem = get_element_at_position(app_element, x, y)
-        if not elem:
+        if not elem or elem == hovered:
+            # Still over the element that is highlighted.
             return
-        highlighter.clear()
-        highlighter.draw_rect(
-            elem["AXFrame"], fill="#1982C455", stroke="#1982C4", stroke_width=1
-        )
+        hovered = elem
+        values = elem.get_multiple_attribute_values(*HOVER_ATTRIBUTES)
+        frame = values.get("AXFrame")
+        if hasattr(frame, "to_dict"):
+            frame = frame.to_dict()
+        if not frame:
+            if highlight is not None:
+                highlighter.remove_rect(highlight)
+                highlight = None
+        elif highlight is None:
+            highlight = highlighter.add_rect(
+                frame, fill="#1982C455", stroke="#1982C4", stroke_width=1
+            )
+        else:
+            highlighter.move_rect(highlight, frame)
         if hover_callback:
             hover_callback(elem)
+        if label_callback:
+            label_callback(describe_element(values))
+
+    timer = QTimer()
+    timer.setSingleShot(True)
+    timer.timeout.connect(_hit_test)
+
+    def _mm(x, y):
+        nonlocal position
+        position = (x, y)
+        if element or timer.isActive():
+            return
+        wait = last_hit + 1.0 / max_rate - time.monotonic()
+        if wait <= 0:
+            _hit_test()
+        else:
+            # The latest position is hit tested when the timer fires.
+            timer.start(int(wait * 1000) + 1)
 
     def _click(x, y):
-        nonlocal element
+        nonlocal element, hovered
         if element:
             element = None
+            hovered = None
             _mm(x, y)
             return
+        timer.stop()
         element = get_element_at_position(app_element, x, y)
         stop()
 
@@ -0,0 +1,6 @@
+import os
+
+# The highlighter and inspector use Qt, which needs no display this way.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Keep command line code from talking to a daemon of the user.
+os.environ.setdefault("PYAX_NO_DAEMON", "1")
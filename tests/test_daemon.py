@@ -0,0 +1,104 @@
+import os
+import socket
+import tempfile
+import threading
+import time
+import pytest
+from pyax import _daemon
+from pyax._synthetic import SyntheticBackend
+
+
+@pytest.fixture
+def backend():
+    return SyntheticBackend(nodes=200, fanout=5)
+
+
+@pytest.fixture
+def server(backend):
+    # Unix socket paths are short, so not pytest's tmp_path.
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "pyax.sock")
+        apps = {backend.name: backend.root}
+        server = _daemon.Server(path, apps.get, observe=False)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 5
+        while not os.path.exists(path):
+            assert time.monotonic() < deadline, "daemon didn't start"
+            time.sleep(0.01)
+        yield server
+        server.shutdown()
+        thread.join(5)
+
+
+def request(server, op, **args):
+    return _daemon.request(op, server.path, timeout=5, **args)
+
+
+def test_ping(server):
+    assert request(server, "ping") == "pong"
+
+
+def test_tree(server, backend):
+    tree = request(server, "tree", app="Synthetic", attributes=["AXRole", "AXTitle"])
+    assert tree["AXRole"] == "AXApplication"
+    assert tree["AXTitle"] == "Synthetic"
+    assert len(tree["AXChildren"]) == 5
+    assert tree["AXChildren"][0]["AXTitle"] == "StaticText 1"
+
+    def count(node):
+        return 1 + sum([count(child) for child in node["AXChildren"]])
+
+    assert count(tree) == backend.node_count
+
+
+def test_select(server):
+    found = request(
+        server,
+        "select",
+        app="Synthetic",
+        match={"AXRole": "AXHeading"},
+        attributes=["AXRole", "AXTitle"],
+        limit=2,
+    )
+    assert len(found) == 2
+    for item in found:
+        assert item["node"]["AXRole"] == "AXHeading"
+        assert item["path"]
+        assert "AXChildren" not in item["node"]
+
+
+def test_attribute(server):
+    values = request(
+        server, "attribute", app="Synthetic", path=[1], attributes=["AXRole"]
+    )
+    assert values == {"AXRole": "AXButton"}
+
+
+def test_invalidate(server, backend):
+    attributes = ["AXRole", "AXTitle"]
+    before = request(server, "tree", app="Synthetic", attributes=attributes)
+    child = backend.root["AXChildren"][0]
+    backend.set_attribute_value(child, "AXTitle", "Renamed")
+    cached = request(server, "tree", app="Synthetic", attributes=attributes)
+    assert cached == before
+    assert request(server, "invalidate") is None
+    after = request(server, "tree", app="Synthetic", attributes=attributes)
+    assert after["AXChildren"][0]["AXTitle"] == "Renamed"
+
+
+def test_errors(server):
+    with pytest.raises(_daemon.DaemonError, match="not found"):
+        request(server, "tree", app="Nothing")
+    with pytest.raises(_daemon.DaemonError, match="unknown op"):
+        request(server, "frobnicate", app="Synthetic")
+
+
+def test_concurrent_connections(server):
+    # An idle client doesn't hold up the others.
+    idle = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    idle.connect(server.path)
+    try:
+        assert request(server, "ping") == "pong"
+    finally:
+        idle.close()
@@ -0,0 +1,70 @@
+import io
+import json
+import pyax
+
+
+def test_load_single_record_ndjson():
+    record = {"id": 0, "parent": None, "depth": 0, "AXRole": "AXApplication"}
+    tree = pyax.load_tree(io.StringIO(json.dumps(record) + "\n"))
+    assert tree == {"AXRole": "AXApplication", "AXChildren": []}
+
+
+def test_load_ndjson_matches_json():
+    tree = {
+        "AXRole": "AXApplication",
+        "AXChildren": [
+            {"AXRole": "AXButton", "AXChildren": []},
+            {
+                "AXRole": "AXGroup",
+                "AXChildren": [{"AXRole": "AXLink", "AXChildren": []}],
+            },
+        ],
+    }
+    records = [
+        {"id": 0, "parent": None, "depth": 0, "AXRole": "AXApplication"},
+        {"id": 1, "parent": 0, "depth": 1, "AXRole": "AXButton"},
+        {"id": 2, "parent": 0, "depth": 1, "AXRole": "AXGroup"},
+        {"id": 3, "parent": 2, "depth": 2, "AXRole": "AXLink"},
+    ]
+    ndjson = "".join([json.dumps(record) + "\n" for record in records])
+    assert pyax.load_tree(io.StringIO(ndjson)) == tree
+    assert pyax.load_tree(io.StringIO(json.dumps(tree, indent=2))) == tree
+    assert pyax.diff_trees(tree, pyax.load_tree(io.StringIO(ndjson))) == []
+
+
+def _chain(depth, title):
+    root = node = {"AXRole": "AXGroup", "AXChildren": []}
+    for _ in range(depth):
+        child = {"AXRole": "AXGroup", "AXChildren": []}
+        node["AXChildren"].append(child)
+        node = child
+    node["AXTitle"] = title
+    return root
+
+
+def test_diff_deep_tree():
+    changes = pyax.diff_trees(_chain(20000, "a"), _chain(20000, "b"))
+    assert len(changes) == 1
+    assert changes[0]["type"] == "change"
+    assert changes[0]["path"].count("/") == 20000
+    assert (changes[0]["old"], changes[0]["new"]) == ("a", "b")
+
+
+def test_diff_moves_and_inserts():
+    old = {
+        "AXRole": "AXList",
+        "AXChildren": [
+            {"AXRole": "AXCell", "AXIdentifier": "a", "AXChildren": []},
+            {"AXRole": "AXCell", "AXIdentifier": "b", "AXChildren": []},
+        ],
+    }
+    new = {
+        "AXRole": "AXList",
+        "AXChildren": [
+            {"AXRole": "AXCell", "AXIdentifier": "b", "AXChildren": []},
+            {"AXRole": "AXCell", "AXIdentifier": "a", "AXChildren": []},
+            {"AXRole": "AXCell", "AXIdentifier": "c", "AXChildren": []},
+        ],
+    }
+    types = sorted([change["type"] for change in pyax.diff_trees(old, new)])
+    assert types == ["insert", "move"]
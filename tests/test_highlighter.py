@@ -0,0 +1,120 @@
+import pytest
+
+QtWidgets = pytest.importorskip("PyQt6.QtWidgets")
+
+from PyQt6 import QtCore  # noqa: E402
+from pyax import _highlighter  # noqa: E402
+from pyax._highlighter import Highlighter  # noqa: E402
+
+
+@pytest.fixture
+def highlighter():
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    highlighter = Highlighter()
+    app.processEvents()
+    updates = []
+    # Record the regions repaints are requested for.
+    highlighter.overlay.update = lambda *args: updates.append(args)
+    highlighter.updates = updates
+    yield highlighter
+    highlighter.close()
+
+
+def _rect(x, y, w=10, h=10):
+    return {"x": x, "y": y, "w": w, "h": h}
+
+
+def _local(highlighter, rect, width=1):
+    return QtCore.QRect(
+        rect["x"] - highlighter.x() - width,
+        rect["y"] - highlighter.y() - width,
+        rect["w"] + 2 * width,
+        rect["h"] + 2 * width,
+    )
+
+
+def test_add_rects(highlighter):
+    rects = [_rect(10, 10), None, _rect(100, 50, 20, 5)]
+    handles = highlighter.add_rects(rects, stroke_width=2)
+    assert handles[1] is None
+    assert handles[0] != handles[2]
+    assert sorted(highlighter._highlights) == sorted([handles[0], handles[2]])
+    bounds = [highlighter._highlights[h][0] for h in (handles[0], handles[2])]
+    assert bounds == [
+        _local(highlighter, rects[0], 2),
+        _local(highlighter, rects[2], 2),
+    ]
+    assert highlighter.updates == [(b,) for b in bounds]
+    # Rectangles of the same style share their brush and pen.
+    assert (
+        highlighter._highlights[handles[0]][2:]
+        == highlighter._highlights[handles[2]][2:]
+    )
+
+
+def test_move_rect(highlighter):
+    handle = highlighter.add_rect(_rect(10, 10))
+    old = highlighter._highlights[handle][0]
+    del highlighter.updates[:]
+    highlighter.move_rect(handle, _rect(200, 200))
+    new = highlighter._highlights[handle][0]
+    assert new == _local(highlighter, _rect(200, 200))
+    # Only where the highlight was and where it is now are repainted.
+    assert highlighter.updates == [(old,), (new,)]
+
+
+def test_remove_rect(highlighter):
+    first, second = highlighter.add_rects([_rect(10, 10), _rect(50, 50)])
+    bounds = highlighter._highlights[first][0]
+    del highlighter.updates[:]
+    highlighter.remove_rect(first)
+    assert list(highlighter._highlights) == [second]
+    assert highlighter.updates == [(bounds,)]
+    # Removing it again is harmless and repaints nothing.
+    highlighter.remove_rect(first)
+    assert highlighter.updates == [(bounds,)]
+
+
+def test_clear(highlighter):
+    highlighter.add_rects([_rect(10, 10), _rect(50, 50)])
+    bounds = [entry[0] for entry in highlighter._highlights.values()]
+    del highlighter.updates[:]
+    highlighter.clear()
+    assert highlighter._highlights == {}
+    assert highlighter.updates == [(b,) for b in bounds]
+
+
+def test_clear_many(highlighter):
+    count = _highlighter._CLEAR_REGION_LIMIT + 1
+    highlighter.add_rects([_rect(i, i) for i in range(count)])
+    del highlighter.updates[:]
+    highlighter.clear()
+    assert highlighter._highlights == {}
+    # One repaint of the whole overlay instead of one per highlight.
+    assert highlighter.updates == [()]
+
+
+def test_repaint_region(monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    painted = []
+    paint = _highlighter._Overlay.paintEvent
+
+    def record(self, event):
+        painted.append(event.region())
+        paint(self, event)
+
+    monkeypatch.setattr(_highlighter._Overlay, "paintEvent", record)
+    highlighter = Highlighter()
+    try:
+        app.processEvents()
+        if not painted:
+            pytest.skip("the platform doesn't paint hidden windows")
+        del painted[:]
+        handle = highlighter.add_rect(_rect(30, 40))
+        app.processEvents()
+        bounds = highlighter._highlights[handle][0]
+        assert painted
+        for region in painted:
+            assert bounds.contains(region.boundingRect())
+    finally:
+        highlighter.close()
@@ -0,0 +1,21 @@
+import time
+from pyax._monitor import ResponsivenessMonitor
+from pyax._synthetic import SyntheticBackend
+
+
+def test_probe_timeout_leaves_other_calls_alone():
+    backend = SyntheticBackend(nodes=10, latency=0.05)
+    monitor = ResponsivenessMonitor(interval=0.01, timeout=0.01, backend=backend)
+    pid = monitor.watch(backend.root)
+    with monitor:
+        deadline = time.monotonic() + 5
+        while monitor.stats(pid)["timeouts"] < 2 and time.monotonic() < deadline:
+            # Calls made while probing still wait out the latency.
+            assert backend.attribute_value(backend.root, "AXRole") == (
+                0,
+                "AXApplication",
+            )
+    stats = monitor.stats(pid)
+    assert stats["timeouts"] >= 2
+    assert stats["max_ms"] < 50
+    assert backend.attribute_value(backend.root, "AXRole")[0] == 0
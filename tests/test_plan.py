@@ -0,0 +1,24 @@
+import pytest
+from pyax._plan import FetchPlan
+
+
+def test_single_attribute_strings():
+    plan = FetchPlan.from_dict(
+        {
+            "attributes": "AXTitle",
+            "roles": {"AXLink": "AXURL"},
+            "rules": [{"match": {"AXSubrole": "AXTabButton"}, "attributes": "AXValue"}],
+        }
+    )
+    assert plan.attributes == ["AXTitle"]
+    assert plan.extra({"AXRole": "AXLink"}) == ["AXURL"]
+    assert plan.extra({"AXRole": "AXButton", "AXSubrole": "AXTabButton"}) == ["AXValue"]
+    plan.add("AXLink", "AXVisited")
+    assert plan.roles["AXLink"] == ["AXURL", "AXVisited"]
+
+
+def test_rejects_bad_attributes():
+    with pytest.raises(TypeError):
+        FetchPlan.from_dict({"roles": {"AXLink": [1]}})
+    with pytest.raises(TypeError):
+        FetchPlan(["AXTitle"], {"AXLink": 5})
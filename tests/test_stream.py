@@ -0,0 +1,38 @@
+import io
+import json
+from pyax._stream import NDJSONWriter, plain_values
+from pyax._synthetic import SyntheticBackend
+
+
+class _Value(object):
+    def __init__(self, values):
+        self.values = values
+        self.calls = 0
+
+    def serializable(self):
+        self.calls += 1
+        return self.values
+
+
+def test_plain_values():
+    element = SyntheticBackend(nodes=10).root
+    value = _Value({"frame": (1, 2), "element": element})
+    obj = plain_values({"AXValue": value, "AXChildren": [element], "n": 1})
+    assert value.calls == 1
+    assert obj == {
+        "AXValue": {"frame": [1, 2], "element": repr(element)},
+        "AXChildren": [repr(element)],
+        "n": 1,
+    }
+    # Encoding the converted values needs nothing from the originals.
+    assert json.loads(json.dumps(obj)) == obj
+
+
+def test_writer_writes_converted_records():
+    out = io.StringIO()
+    writer = NDJSONWriter(out)
+    value = _Value({"label": "x"})
+    writer.write({"info": plain_values({"AXValue": value})})
+    writer.close()
+    assert value.calls == 1
+    assert json.loads(out.getvalue()) == {"info": {"AXValue": {"label": "x"}}}